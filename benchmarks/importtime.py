@@ -0,0 +1,109 @@
+"""Cold import cost of each platform of the integration.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/importtime.py [--runs N]
+
+Each platform is imported in a fresh interpreter with ``python -X importtime``
+after the parts of Home Assistant that are always loaded by the time an
+integration is set up.  The cumulative time of the integration and platform
+modules is reported along with the Home Assistant entity components pulled in.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.njspc_ha"
+PLATFORMS = (
+    "sensor",
+    "binary_sensor",
+    "switch",
+    "climate",
+    "number",
+    "light",
+    "button",
+)
+# Loaded by Home Assistant before any integration.
+PRELOADED = (
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.restore_state",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+)
+COMPONENTS = {
+    "binary_sensor",
+    "button",
+    "climate",
+    "light",
+    "number",
+    "sensor",
+    "switch",
+}
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_platform(platform: str) -> tuple[int, set[str]]:
+    """Cumulative microseconds to import a platform and the components it loaded"""
+    module = f"{PACKAGE}.{platform}"
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {', '.join(PRELOADED)}; import {module}",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = 0
+    components = set()
+    for line in result.stderr.splitlines():
+        if (match := LINE.match(line)) is None:
+            continue
+        name = match.group(4)
+        if name in (PACKAGE, module):
+            cumulative += int(match.group(2))
+        parts = name.split(".")
+        if (
+            len(parts) == 3
+            and parts[:2] == ["homeassistant", "components"]
+            and parts[2] in COMPONENTS
+        ):
+            components.add(parts[2])
+    return cumulative, components
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    print(f"{'platform':<15}{'median ms':>10}  components imported")
+    for platform in PLATFORMS:
+        times = []
+        components: set[str] = set()
+        for _ in range(args.runs):
+            cumulative, components = import_platform(platform)
+            times.append(cumulative)
+        print(
+            f"{platform:<15}{statistics.median(times) / 1000:>10.1f}  "
+            f"{', '.join(sorted(components))}"
+        )
+
+
+if __name__ == "__main__":
+    main()
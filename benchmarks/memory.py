@@ -0,0 +1,220 @@
+"""Memory held per controller before and after the initial state is released.
+
+The sensor and binary sensor entities are created first, as they are during
+setup, so what they keep of the document is counted as still held.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/memory.py [state.json] [--controllers N]
+
+Without a state/all dump a synthetic one for a large install is used.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+from pathlib import Path
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.njspc_ha import NjsPCHAapi, NjsPCHAdata  # noqa: E402
+from custom_components.njspc_ha import binary_sensor, sensor  # noqa: E402
+from custom_components.njspc_ha.const import DOMAIN  # noqa: E402
+
+
+def value_map(val: int, name: str) -> dict:
+    """An njsPC value map"""
+    return {"val": val, "name": name, "desc": name.title()}
+
+
+def chemical(chem_type: str, level: float) -> dict:
+    """The pH or ORP of an njsPC chem controller"""
+    return {
+        "chemType": chem_type,
+        "type": chem_type,
+        "enabled": True,
+        "level": level,
+        "setpoint": level,
+        "demand": 0,
+        "dosingStatus": value_map(2, "monitoring"),
+        "mixTimeRemaining": 0,
+        "dosingTimeRemaining": 0,
+        "doseTime": 0,
+        "doseVolume": 0,
+        "dosingVolumeRemaining": 0,
+        "dailyVolumeDosed": 0,
+        "doserType": value_map(1, "extrelay"),
+        "probe": {"level": level},
+        "tank": {"level": 4, "capacity": 6, "units": value_map(0, "gal")},
+    }
+
+
+def synthetic_state() -> dict:
+    """A state/all document for a large install"""
+    return {
+        "model": "IntelliCenter i10PS",
+        "clockMode": value_map(12, "12 Hour"),
+        "appVersionState": {
+            "installed": "8.0.0",
+            "gitLocalBranch": "master",
+            "gitLocalCommit": "0123456789abcdef",
+        },
+        "temps": {
+            "units": value_map(0, "F"),
+            "air": 72,
+            "solar": 80,
+            "bodies": [
+                {
+                    "id": body_id,
+                    "name": f"Body {body_id}",
+                    "temp": 80,
+                    "setPoint": 84,
+                    "coolSetpoint": 90,
+                    "isOn": True,
+                    "heatMode": value_map(1, "heater"),
+                    "heatStatus": value_map(0, "off"),
+                    "type": value_map(body_id - 1, "pool"),
+                    "circuit": body_id,
+                }
+                for body_id in (1, 2)
+            ],
+        },
+        "pumps": [
+            {
+                "id": pump_id,
+                "name": f"Pump {pump_id}",
+                "rpm": 2000,
+                "watts": 500,
+                "flow": 40,
+                "type": value_map(128, "vs"),
+                "status": value_map(0, "ok"),
+                "circuits": [
+                    {"id": i, "circuit": i, "speed": 2000, "units": value_map(0, "rpm")}
+                    for i in range(1, 9)
+                ],
+            }
+            for pump_id in range(1, 9)
+        ],
+        "circuits": [
+            {
+                "id": circuit_id,
+                "name": f"Aux {circuit_id}",
+                "isOn": False,
+                "type": value_map(0, "generic"),
+                "lightingTheme": value_map(0, "off"),
+                "showInFeatures": True,
+            }
+            for circuit_id in range(1, 41)
+        ],
+        "features": [
+            {"id": feature_id, "name": f"Feature {feature_id}", "isOn": False}
+            for feature_id in range(129, 161)
+        ],
+        "chlorinators": [
+            {
+                "id": 1,
+                "name": "Chlor",
+                "poolSetpoint": 50,
+                "spaSetpoint": 10,
+                "body": value_map(32, "poolspa"),
+                "status": value_map(0, "ok"),
+            }
+        ],
+        "chemControllers": [
+            {
+                "id": 1,
+                "name": "Chem",
+                "type": value_map(2, "intellichem"),
+                "ph": chemical("ph", 7.4),
+                "orp": chemical("orp", 700),
+                "lsi": 0.1,
+                "csi": 0.2,
+                "alkalinity": 80,
+                "cyanuricAcid": 40,
+                "calciumHardness": 300,
+                "borates": 0,
+                "alarms": {"flow": value_map(0, "ok")},
+            }
+        ],
+        "schedules": [
+            {
+                "id": schedule_id,
+                "circuit": {
+                    "id": schedule_id % 40 + 1,
+                    "name": f"Aux {schedule_id % 40 + 1}",
+                    "equipmentType": "circuit",
+                    "type": {"isLight": False},
+                },
+                "startTime": 480,
+                "endTime": 1020,
+                "scheduleDays": {"val": 127},
+                "isActive": True,
+            }
+            for schedule_id in range(1, 51)
+        ],
+        "filters": [{"id": 1, "name": "Filter", "pressure": 12, "cleanPercentage": 90}],
+        "lightGroups": [],
+        "circuitGroups": [],
+        "heaters": [],
+        "virtualCircuits": [],
+    }
+
+
+def current() -> int:
+    """Traced bytes after a collection"""
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+async def measure(document: str, controllers: int) -> None:
+    """Report the memory held per controller"""
+    hass = HomeAssistant()
+    coordinators = []
+    entities: list = []
+    tracemalloc.start()
+    baseline = current()
+    for index in range(controllers):
+        api = NjsPCHAapi(hass, {"host": f"10.0.0.{index}", "port": 4200})
+        api.config = json.loads(document)
+        entry = type("Entry", (), {"entry_id": str(index), "options": {}})()
+        coordinator = NjsPCHAdata(hass, api, entry)
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+        for platform in (sensor, binary_sensor):
+            await platform.async_setup_entry(hass, entry, entities.extend)
+        coordinators.append(coordinator)
+    before = current()
+    for coordinator in coordinators:
+        coordinator.api.release_config()
+    after = current()
+    tracemalloc.stop()
+    await hass.async_stop(force=True)
+
+    per_before = (before - baseline) / controllers
+    per_after = (after - baseline) / controllers
+    print(f"state/all document   {len(document) / 1024:10.1f} KiB")
+    print(f"entities             {len(entities) // controllers:10d} per controller")
+    print(f"held before release  {per_before / 1024:10.1f} KiB per controller")
+    print(f"held after release   {per_after / 1024:10.1f} KiB per controller")
+    print(f"released             {(per_before - per_after) / 1024:10.1f} KiB per controller")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("state", nargs="?", help="state/all dump from njsPC")
+    parser.add_argument("--controllers", type=int, default=4)
+    args = parser.parse_args()
+    if args.state:
+        document = Path(args.state).read_text(encoding="utf-8")
+    else:
+        document = json.dumps(synthetic_state())
+    asyncio.run(measure(document, args.controllers))
+
+
+if __name__ == "__main__":
+    main()
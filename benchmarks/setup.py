@@ -0,0 +1,133 @@
+"""Time to set up the platforms with and without the disabled by default entities.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/setup.py [state.json] [--runs N]
+
+Each run sets up every platform the state needs in a fresh Home Assistant
+with empty entity and device registries, so every entity is registered as on
+the first setup.  The baseline run enables every entity as before the status,
+panel mode and chemistry index entities were disabled by default.  Without a
+state/all dump the synthetic state of benchmarks/memory.py is used.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import importlib
+import json
+import logging
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.config_entries import ConfigEntries, ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import area_registry as ar  # noqa: E402
+from homeassistant.helpers import device_registry as dr  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+from homeassistant.helpers import restore_state as rs  # noqa: E402
+from homeassistant.helpers.entity import DATA_ENTITY_SOURCE  # noqa: E402
+from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: E402
+
+from custom_components.njspc_ha import NjsPCHAapi, NjsPCHAdata  # noqa: E402
+from custom_components.njspc_ha.const import DOMAIN  # noqa: E402
+from custom_components.njspc_ha.coordinator import needed_platforms  # noqa: E402
+
+from memory import synthetic_state  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def setup_once(document: str, enable_all: bool) -> tuple[float, int, int]:
+    """Seconds to set up the platforms with the entities and states added"""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+        await ar.async_load(hass)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        await rs.async_load(hass)
+        # Set up by the entity components in a running instance.
+        hass.data[DATA_ENTITY_SOURCE] = {}
+        entry = ConfigEntry(
+            1, DOMAIN, "njsPC", {"host": "10.0.0.1", "port": 4200}, "user", options={}
+        )
+        # Registered without being set up as MockConfigEntry.add_to_hass does.
+        hass.config_entries = ConfigEntries(hass, {})
+        hass.config_entries._entries[entry.entry_id] = entry
+        api = NjsPCHAapi(hass, dict(entry.data))
+        api.config = json.loads(document)
+        coordinator = NjsPCHAdata(hass, api, entry)
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+        started = perf_counter()
+        entities: list = []
+        for platform_name in sorted(needed_platforms(api.config)):
+            module = importlib.import_module(f"custom_components.njspc_ha.{platform_name}")
+            platform = EntityPlatform(
+                hass=hass,
+                logger=_LOGGER,
+                domain=platform_name,
+                platform_name=DOMAIN,
+                platform=None,
+                scan_interval=timedelta(seconds=30),
+                entity_namespace=None,
+            )
+            platform.config_entry = entry
+            new_entities: list = []
+            await module.async_setup_entry(hass, entry, new_entities.extend)
+            if enable_all:
+                for entity in new_entities:
+                    entity._attr_entity_registry_enabled_default = True
+            await platform.async_add_entities(new_entities)
+            entities.extend(new_entities)
+        elapsed = perf_counter() - started
+
+        added = len(hass.states.async_all())
+        await hass.async_stop(force=True)
+    return elapsed, len(entities), added
+
+
+async def measure(document: str, runs: int) -> None:
+    """Report the median setup time of each case"""
+    cases = {"all enabled": True, "default": False}
+    # The first run pays for the imports.
+    await setup_once(document, True)
+    times: dict[str, list[float]] = {name: [] for name in cases}
+    counts = {}
+    for _ in range(runs):
+        # Alternate the cases so drift affects both alike.
+        for name, enable_all in cases.items():
+            elapsed, entities, added = await setup_once(document, enable_all)
+            times[name].append(elapsed)
+            counts[name] = (entities, added)
+    results = {name: statistics.median(times[name]) for name in cases}
+    for name, (entities, added) in counts.items():
+        print(
+            f"{name:12s} {entities:5d} entities {added:5d} added "
+            f"{results[name] * 1000:8.1f} ms"
+        )
+    saved = results["all enabled"] - results["default"]
+    print(f"saved        {saved * 1000:8.1f} ms ({saved / results['all enabled']:.0%})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("state", nargs="?", help="state/all dump from njsPC")
+    parser.add_argument("--runs", type=int, default=9)
+    args = parser.parse_args()
+    if args.state:
+        document = Path(args.state).read_text(encoding="utf-8")
+    else:
+        document = json.dumps(synthetic_state())
+    asyncio.run(measure(document, args.runs))
+
+
+if __name__ == "__main__":
+    main()
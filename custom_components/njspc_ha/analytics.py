@@ -0,0 +1,348 @@
+"""Streaming models for njsPC-HA"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping, Sequence
+from math import exp
+from statistics import median
+from typing import Any
+
+# Weight kept by the older samples each time a new one arrives.
+HEATING_RATE_FORGETTING = 0.98
+# Samples required before a heat source has a usable rate.
+HEATING_RATE_MIN_SAMPLES = 3
+# Longest gap in hours between two readings that still counts as one sample.
+HEATING_RATE_MAX_GAP = 4.0
+# Level samples kept for each depletion forecast.
+DEPLETION_SAMPLES = 256
+# Rolling window in seconds used to fit the consumption rate.
+DEPLETION_WINDOW = 14 * 86400
+# Shortest span in seconds the samples must cover before forecasting.
+DEPLETION_MIN_SPAN = 12 * 3600
+# Pump speed the filter pressures are normalized to.
+FILTER_REFERENCE_RPM = 3000
+# Slowest pump speed that still gives a meaningful filter pressure.
+FILTER_MIN_RPM = 1000
+# Normalized pressures used to set the clean baseline.
+FILTER_BASELINE_SAMPLES = 10
+# Recent normalized pressures the rise is taken from.
+FILTER_RECENT_SAMPLES = 32
+# (rpm, watts, flow) samples kept for each pump that reports flow.
+FLOW_SAMPLES = 512
+# Samples required before a flow model is fit.
+FLOW_MIN_SAMPLES = 20
+# Assumed wire to water efficiency used for the head estimate.
+PUMP_EFFICIENCY = 0.45
+
+
+class HeatingRateModel:
+    """Degrees per hour learned for each heat source of a body"""
+
+    # This is a least squares fit through the origin of the temperature change
+    # on the elapsed time.  Older samples are discounted so the rate follows the
+    # seasons and each heat source only keeps its running sums so an update is
+    # O(1) no matter how long the model has been learning.
+    def __init__(
+        self,
+        forgetting: float = HEATING_RATE_FORGETTING,
+        max_gap: float = HEATING_RATE_MAX_GAP,
+    ) -> None:
+        self.forgetting = forgetting
+        self.max_gap = max_gap
+        # Heat source -> [sum dt*dt, sum dt*dtemp, samples]
+        self.sums: dict[str, list[float]] = {}
+        self._source: str | None = None
+        self._temp: float | None = None
+        self._at: float = 0.0
+
+    def update(self, source: str | None, temp: float, at: float) -> None:
+        """Add a temperature reading taken at a monotonic time in seconds"""
+        if source is None or source != self._source or self._temp is None:
+            # Start a new run whenever the heat source changes.
+            self._source = source
+            self._temp = temp
+            self._at = at
+            return
+        if temp == self._temp:
+            # Repeated readings carry no time information so keep the
+            # anchor at the last change.
+            return
+        elapsed = (at - self._at) / 3600
+        change = temp - self._temp
+        self._temp = temp
+        self._at = at
+        if elapsed <= 0 or elapsed > self.max_gap:
+            return
+        sums = self.sums.setdefault(source, [0.0, 0.0, 0])
+        sums[0] = self.forgetting * sums[0] + elapsed * elapsed
+        sums[1] = self.forgetting * sums[1] + elapsed * change
+        sums[2] += 1
+
+    def reset_run(self) -> None:
+        """Forget the last reading without touching the learned rates"""
+        self._source = None
+        self._temp = None
+
+    def rate(self, source: str | None) -> float | None:
+        """Degrees per hour for a heat source"""
+        sums = self.sums.get(source)
+        if sums is None or sums[2] < HEATING_RATE_MIN_SAMPLES or sums[0] == 0:
+            return None
+        return sums[1] / sums[0]
+
+    def rates(self) -> dict[str, float]:
+        """Degrees per hour for every heat source with a usable rate"""
+        return {
+            source: round(rate, 2)
+            for source in self.sums
+            if (rate := self.rate(source)) is not None
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Learned coefficients for storage"""
+        return {"sums": {source: list(sums) for source, sums in self.sums.items()}}
+
+    def load(self, restored: dict[str, Any]) -> None:
+        """Restore learned coefficients"""
+        try:
+            self.sums = {
+                str(source): [float(sums[0]), float(sums[1]), int(sums[2])]
+                for source, sums in restored["sums"].items()
+            }
+        except (KeyError, TypeError, ValueError, IndexError, AttributeError):
+            self.sums = {}
+
+
+# Attributes added by a trend.
+TREND_ATTRIBUTES = ("trend_average", "trend_per_hour")
+
+
+class TrendTracker:
+    """Time weighted moving average and rate of change of a reading"""
+
+    # Both averages weight a sample by the time it covers so a burst of events
+    # does not swamp the trend and an update is O(1).  The time constant is in
+    # seconds and the rate is reported per hour.  Both are reported to the
+    # resolution of the reading, the rate to one more digit, so they do not
+    # change with the jitter of every reading.
+    def __init__(self, time_constant: float, digits: int = 3) -> None:
+        self.time_constant = time_constant
+        self.digits = digits
+        self.average: float | None = None
+        self.rate: float | None = None
+        self._last: float | None = None
+        self._at: float = 0.0
+
+    def update(self, value: float | None, at: float) -> None:
+        """Add a reading taken at a monotonic time in seconds"""
+        if value is None:
+            return
+        if self._last is None:
+            if self.average is None:
+                self.average = value
+            self._last = value
+            self._at = at
+            return
+        elapsed = at - self._at
+        if elapsed <= 0:
+            return
+        weight = 1 - exp(-elapsed / self.time_constant)
+        self.average += weight * (value - self.average)
+        slope = (value - self._last) * 3600 / elapsed
+        if self.rate is None:
+            self.rate = slope
+        else:
+            self.rate += weight * (slope - self.rate)
+        self._last = value
+        self._at = at
+
+    def reset(self) -> None:
+        """Forget the last reading after a gap but keep the averages"""
+        self._last = None
+
+    def attributes(self) -> dict[str, float | None]:
+        """State attributes for the trend"""
+        return {
+            "trend_average": round(self.average, self.digits)
+            if self.average is not None
+            else None,
+            "trend_per_hour": round(self.rate, self.digits + 1)
+            if self.rate is not None
+            else None,
+        }
+
+
+class DepletionForecast:
+    """Consumption rate and time until a falling level reaches its floor"""
+
+    # This backs the chemical tank and filter cleaning forecasts.  The level
+    # samples live in a ring buffer and are only added when the level changes.
+    # The rate is refit from the samples inside the rolling window when a
+    # sample arrives and a rise of at least refill_rise, or back up to
+    # refill_level, is taken as a refill (or a cleaning) which starts the
+    # history over.  Smaller rises are kept as noise around the trend.
+    def __init__(
+        self,
+        floor: float = 0,
+        maxlen: int = DEPLETION_SAMPLES,
+        window: float = DEPLETION_WINDOW,
+        refill_rise: float = 0,
+        refill_level: float | None = None,
+    ) -> None:
+        self.floor = floor
+        self.window = window
+        self.refill_rise = refill_rise
+        self.refill_level = refill_level
+        self.samples: deque[tuple[float, float]] = deque(maxlen=maxlen)
+        self.rate: float | None = None
+        self.days_remaining: float | None = None
+        self.empty_at: float | None = None
+
+    def add(self, at: float, level: float) -> bool:
+        """Add a level sample taken at a timestamp in seconds"""
+        if self.samples and self.samples[-1][1] == level:
+            return False
+        if self.is_refill(level):
+            self.samples.clear()
+        self.samples.append((at, level))
+        self._fit(at, level)
+        return True
+
+    def is_refill(self, level: float) -> bool:
+        """Whether a new level is a refill rather than noise on the last one"""
+        if not self.samples or level <= self.samples[-1][1]:
+            return False
+        return level - self.samples[-1][1] >= self.refill_rise or (
+            self.refill_level is not None and level >= self.refill_level
+        )
+
+    def _fit(self, at: float, level: float) -> None:
+        """Refit the consumption rate over the rolling window"""
+        self.rate = None
+        self.days_remaining = None
+        self.empty_at = None
+        points = [sample for sample in self.samples if sample[0] >= at - self.window]
+        if len(points) < 3 or points[-1][0] - points[0][0] < DEPLETION_MIN_SPAN:
+            return
+        start = points[0][0]
+        mean_t = sum((t - start) / 86400 for t, _ in points) / len(points)
+        mean_l = sum(l for _, l in points) / len(points)
+        sxx = 0.0
+        sxy = 0.0
+        for t, l in points:
+            dt = (t - start) / 86400 - mean_t
+            sxx += dt * dt
+            sxy += dt * (l - mean_l)
+        if sxx == 0 or sxy >= 0:
+            return
+        # Units per day used.
+        self.rate = -sxy / sxx
+        self.days_remaining = max(level - self.floor, 0) / self.rate
+        self.empty_at = at + self.days_remaining * 86400
+
+    def as_dict(self) -> dict[str, Any]:
+        """Samples for storage"""
+        return {"samples": [list(sample) for sample in self.samples]}
+
+    def load(self, restored: dict[str, Any]) -> None:
+        """Restore samples and refit"""
+        try:
+            samples = [(float(t), float(l)) for t, l in restored["samples"]]
+        except (KeyError, TypeError, ValueError):
+            return
+        self.samples.clear()
+        self.samples.extend(samples)
+        if self.samples:
+            self._fit(*self.samples[-1])
+
+
+class FilterPressureTrend:
+    """Speed normalized filter pressure and its rise over the clean baseline"""
+
+    # Filter pressure goes with the square of the pump speed so every reading
+    # is scaled to the reference speed before it is compared.  The baseline is
+    # the median of the first readings after a cleaning and the rise is the
+    # median of the recent readings over that baseline.  Both buffers are
+    # bounded.
+    def __init__(self, reference_rpm: float = FILTER_REFERENCE_RPM) -> None:
+        self.reference_rpm = reference_rpm
+        self._baseline: list[float] = []
+        self._recent: deque[float] = deque(maxlen=FILTER_RECENT_SAMPLES)
+        self.baseline: float | None = None
+        self.normalized: float | None = None
+
+    def add(self, pressure: float, rpm: float) -> bool:
+        """Add a pressure reading taken with the pump at a speed"""
+        if rpm < FILTER_MIN_RPM or pressure <= 0:
+            return False
+        self.normalized = pressure * (self.reference_rpm / rpm) ** 2
+        self._recent.append(self.normalized)
+        if self.baseline is None:
+            self._baseline.append(self.normalized)
+            if len(self._baseline) >= FILTER_BASELINE_SAMPLES:
+                self.baseline = median(self._baseline)
+                self._baseline = []
+        return True
+
+    def reset(self) -> None:
+        """Start a new baseline after the filter has been cleaned"""
+        self._baseline = []
+        self._recent.clear()
+        self.baseline = None
+
+    @property
+    def rise(self) -> float | None:
+        """Percent the recent normalized pressure is over the baseline"""
+        if self.baseline is None or not self._recent:
+            return None
+        return (median(self._recent) - self.baseline) / self.baseline * 100
+
+
+def fit_flow_model(
+    samples: Sequence[tuple[float, float, float]]
+) -> tuple[float, float, float] | None:
+    """Fit flow = a * rpm + b * watts / rpm + c to (rpm, watts, flow) samples"""
+    # The affinity laws put flow in proportion to the speed and the watts over
+    # the speed pick up how hard the pump is pushing against the plumbing.
+    # This runs in the executor so numpy is only imported when we get here.
+    if len(samples) < FLOW_MIN_SAMPLES:
+        return None
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    data = np.asarray(samples, dtype=float)
+    rpm, watts, flow = data.T
+    design = np.column_stack((rpm, watts / rpm, np.ones_like(rpm)))
+    if np.linalg.matrix_rank(design) < design.shape[1]:
+        # A pump that has only run at one speed cannot separate the terms.
+        return None
+    coefficients, *_ = np.linalg.lstsq(design, flow, rcond=None)
+    return tuple(float(c) for c in coefficients)
+
+
+def fit_flow_models(
+    samples: Mapping[int, Sequence[tuple[float, float, float]]]
+) -> dict[int | None, tuple[float, float, float]]:
+    """Fit a flow model for each pump and one pooled across all of them"""
+    models: dict[int | None, tuple[float, float, float]] = {}
+    pooled: list[tuple[float, float, float]] = []
+    for pump_id, pump_samples in samples.items():
+        pooled.extend(pump_samples)
+        if (model := fit_flow_model(pump_samples)) is not None:
+            models[pump_id] = model
+    if (model := fit_flow_model(pooled)) is not None:
+        models[None] = model
+    return models
+
+
+def estimate_flow(model: tuple[float, float, float], rpm: float, watts: float) -> float:
+    """Flow from a fitted model"""
+    a, b, c = model
+    return max(a * rpm + b * watts / rpm + c, 0)
+
+
+def estimate_head(flow: float, watts: float) -> float | None:
+    """Head in feet from the flow in gpm and the watts drawn"""
+    # Water horsepower is gpm * feet / 3960 and one horsepower is 745.7 watts.
+    if flow <= 0:
+        return None
+    return watts * PUMP_EFFICIENCY * 3960 / 745.7 / flow
@@ -1,19 +1,33 @@
 """Platform for sensor integration."""
 from __future__ import annotations
 
+from time import perf_counter
+from typing import Any
+from collections.abc import Mapping
+
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.core import HomeAssistant
-
-
-from .controller import FreezeProtectionSensor
-from .chemistry import FlowDetectedSensor
-from .pumps import PumpOnSensor
-from .bodies import FilterOnSensor, BodyCoveredSensor
-from .features import VirtualCircuit
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.components.binary_sensor import (
+    BinarySensorEntity,
+    BinarySensorDeviceClass,
+)
 
+from .coordinator import NjsPCHAdata
+from .entity import PoolEquipmentEntity
 from .const import (
+    PoolEquipmentClass,
+    AGGREGATE_CHEM_ALARM,
     DOMAIN,
+    EVENT_AVAILABILITY,
+    EVENT_BODY,
+    EVENT_CHEM_CONTROLLER,
+    EVENT_CONTROLLER,
+    EVENT_FILTER,
+    EVENT_PUMP,
+    EVENT_VIRTUAL_CIRCUIT,
+    pump_is_on,
 )
 
 
@@ -23,6 +37,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add sensors for past config_entry in HA."""
+    started = perf_counter()
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     new_devices = []
@@ -66,6 +81,506 @@ async def async_setup_entry(
                     chem_controller=chem_controller
                 )
             )
+    if config["chemControllers"]:
+        new_devices.append(ChemistryAlarmSensor(coordinator, config))
+    if config["schedules"]:
+        new_devices.append(ScheduleConflictSensor(coordinator, config))
 
     if new_devices:
         async_add_entities(new_devices)
+    coordinator.metrics.record_setup(Platform.BINARY_SENSOR, perf_counter() - started)
+
+
+class FlowDetectedSensor(PoolEquipmentEntity, BinarySensorEntity):
+    """The current freeze protection status for the control panel"""
+
+    def __init__(self, coordinator: NjsPCHAdata, chem_controller) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator = coordinator, equipment_class=PoolEquipmentClass.CHEM_CONTROLLER, data=chem_controller)
+        if "flowDetected" in chem_controller:
+            self._value = chem_controller["flowDetected"]
+            self._available = True
+        else:
+            self._value = None
+            self._available = False
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self.coordinator.data["event"] == EVENT_CHEM_CONTROLLER:
+            if "flowDetected" in self.coordinator.data:
+                self._available = True
+                self._value = self.coordinator.data["flowDetected"]
+            else:
+                self._available = False
+                self._value = None
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str | None:
+        """Name of the sensor"""
+        return "Flow Detected"
+
+    @property
+    def unique_id(self) -> str | None:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_flow_detected"
+
+    @property
+    def native_value(self) -> bool | None:
+        """Raw value of the sensor"""
+        return self._value
+
+    @property
+    def is_on(self) -> bool:
+        """Return if motion is detected."""
+        return self._value
+
+
+    @property
+    def icon(self) -> str:
+        if self._value is True:
+            return "mdi:waves-arrow-right"
+        return "mdi:wave"
+
+
+class FilterOnSensor(PoolEquipmentEntity, BinarySensorEntity):
+    """The current running state for a pump"""
+
+    def __init__(self, coordinator: NjsPCHAdata, pool_filter: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator,
+            equipment_class=PoolEquipmentClass.FILTER,
+            data=pool_filter,
+        )
+        self._value = False
+        if "isOn" in pool_filter:
+            self._value = pool_filter["isOn"]
+        self._available = True
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_FILTER
+            and self.coordinator.data["id"] == self.equipment_id
+        ):
+            if "isOn" in self.coordinator.data:
+                self._value = self.coordinator.data["isOn"]
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str | None:
+        """Name of the sensor"""
+        return "Filter State"
+
+    @property
+    def unique_id(self) -> str | None:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_ison"
+
+    @property
+    def native_value(self) -> bool | None:
+        """Raw value of the sensor"""
+        return self._value
+
+    @property
+    def is_on(self) -> bool:
+        """Return if the pump is running."""
+        return self._value
+
+    @property
+    def icon(self) -> str:
+        if self._value is True:
+            return "mdi:filter"
+        return "mdi:filter-off"
+
+
+class BodyCoveredSensor(PoolEquipmentEntity, BinarySensorEntity):
+    """The current status of a body cover"""
+
+    def __init__(self, coordinator: NjsPCHAdata, body: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator, equipment_class=PoolEquipmentClass.BODY, data=body
+        )
+        self._value = False
+        if "isCovered" in body:
+            self._value = body["isCovered"]
+        self._available = True
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_BODY
+            and self.coordinator.data["id"] == self.equipment_id
+        ):
+            if "isCovered" in self.coordinator.data:
+                self._value = self.coordinator.data["isCovered"]
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str | None:
+        """Name of the sensor"""
+        return "Cover"
+
+    @property
+    def unique_id(self) -> str | None:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_isCovered"
+
+    @property
+    def is_on(self) -> bool:
+        """Return if the body is covered."""
+        # we want the opposite of the isCovered field
+        return not self._value
+
+    @property
+    def icon(self) -> str:
+        if self._value is True:
+            return "mdi:arrow-down-drop-circle"
+        return "mdi:arrow-up-drop-circle-outline"
+    
+    @property
+    def device_class(self) -> BinarySensorDeviceClass | None:
+        return BinarySensorDeviceClass.DOOR
+
+
+class PumpOnSensor(PoolEquipmentEntity, BinarySensorEntity):
+    """The current running state for a pump"""
+
+    def __init__(self, coordinator: NjsPCHAdata, pump: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator,
+            equipment_class=PoolEquipmentClass.PUMP,
+            data=pump,
+        )
+        self._value = pump_is_on(pump)
+        self._available = True
+        self._attr_has_entity_name = True
+        self._attr_device_class = f"{self.equipment_name}_{self.equipment_class}_ison"
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_PUMP
+            and self.coordinator.data["id"] == self.equipment_id
+        ):
+            self._value = pump_is_on(self.coordinator.data)
+            self._available = True
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str | None:
+        """Name of the sensor"""
+        return "Running State"
+
+    @property
+    def unique_id(self) -> str | None:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_ison"
+
+    @property
+    def native_value(self) -> bool | None:
+        """Raw value of the sensor"""
+        return self._value
+
+    @property
+    def is_on(self) -> bool:
+        """Return if the pump is running."""
+        return self._value
+
+    @property
+    def icon(self) -> str:
+        if self._value is True:
+            return "mdi:pump"
+        return "mdi:pump-off"
+
+
+class FreezeProtectionSensor(PoolEquipmentEntity, BinarySensorEntity):
+    """The current freeze protection status for the control panel"""
+
+    def __init__(self, coordinator: NjsPCHAdata, data: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator = coordinator, equipment_class=PoolEquipmentClass.CONTROL_PANEL, data=data)
+        if "freeze" in data:
+            self._value = data["freeze"]
+            self._available = True
+        else:
+            self._value = None
+            self._available = False
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self.coordinator.data["event"] == EVENT_CONTROLLER:
+            if "freeze" in self.coordinator.data:
+                self._available = True
+                self._value = self.coordinator.data["freeze"]
+            else:
+                self._available = False
+                self._value = None
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str | None:
+        """Name of the sensor"""
+        return "Freeze Protection"
+
+    @property
+    def unique_id(self) -> str | None:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_freeze_protect"
+
+    @property
+    def native_value(self) -> bool | None:
+        """Raw value of the sensor"""
+        return self._value
+
+    @property
+    def is_on(self) -> bool:
+        """Return if motion is detected."""
+        return self._value
+
+
+    @property
+    def icon(self) -> str:
+        if self._value is True:
+            return "mdi:snowflake-alert"
+        return "mdi:snowflake-off"
+
+
+class ChemistryAlarmSensor(PoolEquipmentEntity, BinarySensorEntity):
+    """Whether any chemistry controller has an active alarm"""
+
+    def __init__(self, coordinator: NjsPCHAdata, data: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator = coordinator, equipment_class=PoolEquipmentClass.CONTROL_PANEL, data=data)
+        self._available = True
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_CHEM_CONTROLLER
+            and AGGREGATE_CHEM_ALARM in self.coordinator.aggregates_changed
+        ):
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str | None:
+        """Name of the sensor"""
+        return "Chemistry Alarm"
+
+    @property
+    def unique_id(self) -> str | None:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{AGGREGATE_CHEM_ALARM}"
+
+    @property
+    def device_class(self) -> BinarySensorDeviceClass:
+        return BinarySensorDeviceClass.PROBLEM
+
+    @property
+    def is_on(self) -> bool:
+        """Return if any alarm is active."""
+        return any(self.coordinator.chem_alarms.values())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the state attributes."""
+        return {
+            "alarms": {
+                chem_controller_id: sorted(alarms)
+                for chem_controller_id, alarms in self.coordinator.chem_alarms.items()
+                if alarms
+            }
+        }
+
+
+class VirtualCircuit(PoolEquipmentEntity, BinarySensorEntity):
+    """The current state for a virtual circuit"""
+
+    def __init__(self, coordinator: NjsPCHAdata, virtual_circuit: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CONTROL_PANEL, data={"model":coordinator.model})
+        self._value = False
+        self.circuit_id = virtual_circuit["id"]
+        self.circuit_name = virtual_circuit["name"]
+        if "isOn" in virtual_circuit:
+            self._value = virtual_circuit["isOn"]
+        self._available = True
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_VIRTUAL_CIRCUIT
+            and self.coordinator.data["id"] == self.circuit_id
+        ):
+            if "isOn" in self.coordinator.data:
+                self._value = self.coordinator.data["isOn"]
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str | None:
+        """Name of the sensor"""
+        return self.circuit_name
+
+    @property
+    def unique_id(self) -> str | None:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.circuit_id}_ison"
+
+    @property
+    def native_value(self) -> bool | None:
+        """Raw value of the sensor"""
+        return self._value
+
+    @property
+    def is_on(self) -> bool:
+        """Return if the pump is running."""
+        return self._value
+
+    @property
+    def icon(self) -> str:
+        if self._value is True:
+            return "mdi:toggle-switch-outline"
+        return "mdi:toggle-switch-off-outline"
+
+
+class ScheduleConflictSensor(PoolEquipmentEntity, BinarySensorEntity):
+    """Whether any schedules overlap for a circuit or a pump"""
+
+    def __init__(self, coordinator: NjsPCHAdata, data: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator,
+            equipment_class=PoolEquipmentClass.CONTROL_PANEL,
+            data=data,
+        )
+        self._available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the schedule index"""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.schedule_index.async_add_listener(
+                self._handle_schedule_index_update
+            )
+        )
+
+    @callback
+    def _handle_schedule_index_update(self) -> None:
+        """Handle a change to the schedules."""
+        self.async_write_ha_state()
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        return "Schedule Conflict"
+
+    @property
+    def unique_id(self) -> str:
+        """Set unique device_id"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_schedule_conflict"
+
+    @property
+    def device_class(self) -> BinarySensorDeviceClass:
+        return BinarySensorDeviceClass.PROBLEM
+
+    @property
+    def is_on(self) -> bool:
+        return bool(self.coordinator.schedule_index.conflicts)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return entity specific state attributes."""
+        return {"conflicts": self.coordinator.schedule_index.conflict_list()}
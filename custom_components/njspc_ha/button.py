@@ -1,16 +1,22 @@
 """Platform for light integration."""
+from __future__ import annotations
 
+from time import perf_counter
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.core import HomeAssistant
+from homeassistant.components.button import ButtonEntity
 
-
+from .coordinator import NjsPCHAdata
+from .entity import PoolEquipmentEntity
 from .const import (
     PoolEquipmentClass,
+    API_LIGHT_RUNCOMMAND,
     DOMAIN,
 )
-from .features import LightCommandButton
 
 
 async def async_setup_entry(
@@ -19,6 +25,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add sensors for passed config_entry in HA."""
+    started = perf_counter()
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     config = coordinator.api.get_config()
@@ -52,3 +59,46 @@ async def async_setup_entry(
             )
     if new_devices:
         async_add_entities(new_devices)
+    coordinator.metrics.record_setup(Platform.BUTTON, perf_counter() - started)
+
+
+class LightCommandButton(PoolEquipmentEntity, ButtonEntity):
+    """Light command button entity for njsPC-HA."""
+
+    def __init__(self, coordinator:NjsPCHAdata, equipment_class: PoolEquipmentClass, circuit:Any, command:Any) -> None:
+        """Initialize the button."""
+        super().__init__(coordinator=coordinator, equipment_class=equipment_class, data=circuit)
+        self._command = command
+
+    async def async_press(self) -> None:
+        """Button has been pressed"""
+
+        data = {"id": self.equipment_id, "command": self._command["name"]}
+        await self.coordinator.api.command(url=API_LIGHT_RUNCOMMAND, data=data)
+
+    @property
+    def name(self) -> str:
+        """Name of button"""
+        return self._command["desc"]
+
+    @property
+    def unique_id(self) -> str:
+        """Set unique id"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_{self._command['name']}"
+
+    @property
+    def icon(self) -> str:
+        match self._command["name"]:
+            case "colorsync":
+                return "mdi:cog-sync-outline"
+            case "colorswim":
+                return "mdi:palette-swatch-variant"
+            case "colorhold":
+                return "mdi:eyedropper"
+            case "colorrecall":
+                return "mdi:bookmark"
+            case "lightthumper":
+                return "mdi:gavel"
+            case "thumper":
+                return "mdi:gavel"
+        return "mdi:palette"
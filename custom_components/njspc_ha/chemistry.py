@@ -3,29 +3,29 @@ from __future__ import annotations
 
 from typing import Any
 from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from time import monotonic
 
 
 from homeassistant.const import (
     UnitOfVolume,
+    UnitOfTime,
     UnitOfMass,
     PERCENTAGE,
 )
 
+from .analytics import TREND_ATTRIBUTES, DepletionForecast, TrendTracker
 from .entity import PoolEquipmentEntity
-from .__init__ import NjsPCHAdata
+from .coordinator import NjsPCHAdata
 from homeassistant.helpers.entity import EntityCategory
-from homeassistant.components.switch import SwitchEntity
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorStateClass,
+    SensorDeviceClass,
 )
-from homeassistant.components.binary_sensor import (
-    BinarySensorEntity
-)
-from homeassistant.components.number import (
-    NumberEntity,
-    NumberMode
-)
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
+from homeassistant.util import dt as dt_util
 from .const import (
     PoolEquipmentClass,
     EVENT_AVAILABILITY,
@@ -36,286 +36,20 @@ from .const import (
     SALT_REQUIRED,
     TARGET_OUTPUT,
     CURRENT_OUTPUT,
-    API_CHLORINATOR_POOL_SETPOINT,
-    API_CHLORINATOR_SPA_SETPOINT,
-    API_CHEM_CONTROLLER_SETPOINT,
-    API_SUPERCHLOR,
-    POOL_SETPOINT,
-    SUPER_CHLOR_HOURS,
-    API_CONFIG_CHLORINATOR,
-    SUPER_CHLOR
+    DEADBAND_ORP,
+    DEADBAND_PH,
+    DEADBAND_SALT,
 )
 
-class FlowDetectedSensor(PoolEquipmentEntity, BinarySensorEntity):
-    """The current freeze protection status for the control panel"""
-
-    def __init__(self, coordinator: NjsPCHAdata, chem_controller) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator = coordinator, equipment_class=PoolEquipmentClass.CHEM_CONTROLLER, data=chem_controller)
-        if "flowDetected" in chem_controller:
-            self._value = chem_controller["flowDetected"]
-            self._available = True
-        else:
-            self._value = None
-            self._available = False
-
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if self.coordinator.data["event"] == EVENT_CHEM_CONTROLLER:
-            if "flowDetected" in self.coordinator.data:
-                self._available = True
-                self._value = self.coordinator.data["flowDetected"]
-            else:
-                self._available = False
-                self._value = None
-            self.async_write_ha_state()
-        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
-            self._available = self.coordinator.data["available"]
-            self.async_write_ha_state()
-
-    @property
-    def should_poll(self) -> bool:
-        return False
-
-    @property
-    def available(self) -> bool:
-        return self._available
-
-    @property
-    def name(self) -> str | None:
-        """Name of the sensor"""
-        return "Flow Detected"
-
-    @property
-    def unique_id(self) -> str | None:
-        """ID of the sensor"""
-        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_flow_detected"
-
-    @property
-    def native_value(self) -> bool | None:
-        """Raw value of the sensor"""
-        return self._value
-
-    @property
-    def is_on(self) -> bool:
-        """Return if motion is detected."""
-        return self._value
-
-
-    @property
-    def icon(self) -> str:
-        if self._value is True:
-            return "mdi:waves-arrow-right"
-        return "mdi:wave"
-
-class ChemControllerSetpoint(PoolEquipmentEntity, NumberEntity):
-    """Chemistry setpoint for ORP or pH"""
-    def __init__(
-        self, coordinator: NjsPCHAdata, chem_controller, chem_type: str
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHEM_CONTROLLER, data=chem_controller)
-        self.chem_type = chem_type
-        self.coordinator_context = object()
-        self._state_attributes: dict[str, Any] = dict([])
-        self._value = None
-        self._available = True
-        if self.chem_type in chem_controller and chem_controller[self.chem_type]["setpoint"]:
-            self._value = chem_controller[self.chem_type]["setpoint"]
-
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if (
-            self.coordinator.data["event"] == EVENT_CHEM_CONTROLLER
-            and self.coordinator.data["id"] == self.equipment_id
-            and self.chem_type in self.coordinator.data
-        ):
-            if "setpoint" in self.coordinator.data[self.chem_type]:
-                self._value = self.coordinator.data[self.chem_type]["setpoint"]
-            self.async_write_ha_state()
-        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
-            self._available = self.coordinator.data["available"]
-            self.async_write_ha_state()
-
-    async def async_set_native_value(self, value: float) -> None:
-        """Update the current value."""
-        new_value = value
-        if self.chem_type == "orp":
-            new_value = int(value)
-        data = {"id": self.equipment_id, self.chem_type: {"setpoint": new_value}}
-        await self.coordinator.api.command(url=API_CHEM_CONTROLLER_SETPOINT, data=data)
-
-    @property
-    def mode(self) -> NumberMode:
-        return NumberMode.BOX
-
-    @property
-    def should_poll(self) -> bool:
-        return False
-
-    @property
-    def available(self) -> bool:
-        return self._available
-
-    @property
-    def name(self) -> str:
-        """Name of the Setpoint"""
-        name = "ORP" if self.chem_type == "orp" else "pH"
-        return f"{name} Setpoint"
-
-    @property
-    def unique_id(self) -> str:
-        """ID of the setpoint"""
-        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_{self.chem_type}_setpoint"
-
-    @property
-    def icon(self) -> str:
-        return "mdi:creation"
-
-    @property
-    def native_value(self):
-        """value"""
-        return self._value
-
-    @property
-    def native_step(self) -> float:
-        match(self.chem_type):
-            case "ph":
-                return .1
-            case "orp":
-                return 10
-        return 0
-
-    @property
-    def native_unit_of_measurement(self) -> str | None:
-        return "mV" if self.chem_type == "orp" else None
-
-    @property
-    def native_min_value(self) -> float:
-        match(self.chem_type):
-            case "ph":
-                return 6.8
-            case "orp":
-                return 400
-        return 0
-
-    @property
-    def native_max_value(self) -> float:
-        match(self.chem_type):
-            case "ph":
-                return 8.0
-            case "orp":
-                return 800
-        return 1000
-
-class ChemControllerIndex(PoolEquipmentEntity, NumberEntity):
-    """Index values for Chem Controllers"""
-    def __init__(
-        self, coordinator: NjsPCHAdata, chem_controller, index_name: str
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHEM_CONTROLLER, data=chem_controller)
-        self.index_name = index_name
-        self.coordinator_context = object()
-        self._state_attributes: dict[str, Any] = dict([])
-        self._value = None
-        self._available = True
-        if self.index_name in chem_controller:
-            self._value = chem_controller[self.index_name]
-
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if (
-            self.coordinator.data["event"] == EVENT_CHEM_CONTROLLER
-            and self.coordinator.data["id"] == self.equipment_id
-            and self.index_name in self.coordinator.data
-        ):
-            self._value = self.coordinator.data[self.index_name]
-            self.async_write_ha_state()
-        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
-            self._available = self.coordinator.data["available"]
-            self.async_write_ha_state()
-
-    async def async_set_native_value(self, value: float) -> None:
-        """Update the current value."""
-        new_value = int(value)
-        data = {"id": self.equipment_id, self.index_name: new_value}
-        await self.coordinator.api.command(url=API_CHEM_CONTROLLER_SETPOINT, data=data)
-
-    @property
-    def mode(self) -> NumberMode:
-        return NumberMode.BOX
-
-    @property
-    def should_poll(self) -> bool:
-        return False
-
-    @property
-    def available(self) -> bool:
-        return self._available
-
-    @property
-    def name(self) -> str:
-        """Name of the Setpoint"""
-        match(self.index_name):
-            case "calciumHardness":
-                return "Calcium Hardness"
-            case "borates":
-                return "Borates"
-            case "cyanuricAcid":
-                return "Cyanuric Acid"
-            case "alkalinity":
-                return "Total Alkalinity"
-            case _:
-                return self.index_name
-
-    @property
-    def unique_id(self) -> str:
-        """ID of the setpoint"""
-        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_{self.index_name}_setpoint"
-
-    @property
-    def icon(self) -> str:
-        return "mdi:test-tube"
-
-    @property
-    def native_value(self):
-        """value"""
-        return self._value
-
-    @property
-    def native_step(self) -> int:
-        return 1
-
-    @property
-    def native_min_value(self) -> int:
-        match(self.index_name):
-            case "borates":
-                return 0
-            case "calciumHardness":
-                return 25
-            case "alkalinity":
-                return 25
-            case "cyanuricAcid":
-                return 0
-        return 0
-
-    @property
-    def native_max_value(self) -> int:
-        match(self.index_name):
-            case "borates":
-                return 201
-            case "calciumHardness":
-                return 800
-            case "alkalinity":
-                return 800
-            case "cyanuricAcid":
-                return 201
-        return 0
-
-    @property
-    def native_unit_of_measurement(self) -> str | None:
-        return "ppm"
+# Time constants in seconds for the reading trends.  Probes wander quickly,
+# salt and tanks only move over days.
+TREND_CHEMISTRY = 3600
+TREND_SALT = 6 * 3600
+TREND_TANK = 24 * 3600
+# Digits the trends are reported to.  The pH is read to hundredths and the
+# rest to whole units.
+TREND_DIGITS_PH = 2
+TREND_DIGITS = 0
 
 class ChemistryDosingStatus(PoolEquipmentEntity, SensorEntity):
     """The current dosing status for the chemical"""
@@ -328,6 +62,7 @@ class ChemistryDosingStatus(PoolEquipmentEntity, SensorEntity):
         self._state_attributes: dict[str, Any] = dict([])
         self.chem_type = chemical["type"]
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
         self._value = None
 
         if "dosingStatus" in chemical:
@@ -433,6 +168,7 @@ class ChemistryDemandSensor(PoolEquipmentEntity, SensorEntity):
         self._state_attributes: dict[str, Any] = dict([])
         self.chem_type = chemical["type"]
         self._value = None
+        self._attr_entity_registry_enabled_default = False
 
         if "demand" in chemical:
             self._value = chemical["demand"]
@@ -542,7 +278,8 @@ class ChemistryTankLevel(PoolEquipmentEntity, SensorEntity):
             self._available = True
         else:
             self._available = False
-
+        self._trend = TrendTracker(TREND_TANK, TREND_DIGITS)
+        self._update_trend()
 
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -566,13 +303,21 @@ class ChemistryTankLevel(PoolEquipmentEntity, SensorEntity):
                     else:
                         self._value = 0
                 self._available = True
+                self._update_trend()
             else:
                 self._available = False
             self.async_write_ha_state()
         elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._trend.reset()
             self._available = self.coordinator.data["available"]
             self.async_write_ha_state()
 
+    def _update_trend(self) -> None:
+        """Add the tank level to the trend"""
+        if "capacity" in self._state_attributes and "level" in self._state_attributes:
+            self._trend.update(self._value, monotonic())
+            self._state_attributes.update(self._trend.attributes())
+
     @property
     def should_poll(self) -> bool:
         return False
@@ -619,6 +364,182 @@ class ChemistryTankLevel(PoolEquipmentEntity, SensorEntity):
         """Return the state attributes."""
         return self._state_attributes
 
+@dataclass
+class TankForecastStoredData(ExtraStoredData):
+    """Tank level samples kept across restarts"""
+
+    forecast: dict[str, Any]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the samples."""
+        return self.forecast
+
+
+def tank_name(chem_type: str) -> str:
+    """Name prefix for a chemical tank"""
+    match(chem_type):
+        case "ph":
+            return "Acid Tank"
+        case "orp":
+            return "Chlorine Tank"
+    return f"{chem_type} Tank"
+
+
+class ChemistryTankDaysRemaining(PoolEquipmentEntity, SensorEntity, RestoreEntity):
+    """Days until a chemistry tank is empty"""
+
+    # The forecast is shared with the empty date sensor through the
+    # coordinator.  This sensor keeps the samples across restarts.
+    def __init__(
+        self, coordinator: NjsPCHAdata, chem_controller, chemical: Any
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHEM_CONTROLLER, data=chem_controller)
+        self.chem_type = chemical["chemType"]
+        self._key = (self.equipment_id, self.chem_type)
+        if self._key not in coordinator.tank_forecasts:
+            coordinator.tank_forecasts[self._key] = DepletionForecast()
+        self._forecast = coordinator.tank_forecasts[self._key]
+        self._units = None
+        if "tank" in chemical and "units" in chemical["tank"]:
+            self._units = chemical["tank"]["units"]["name"]
+        self._available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the tank level samples"""
+        await super().async_added_to_hass()
+        if not self._forecast.samples and (
+            last := await self.async_get_last_extra_data()
+        ) is not None:
+            self._forecast.load(last.as_dict())
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_CHEM_CONTROLLER
+            and self._key in self.coordinator.tank_levels_changed
+        ):
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def extra_restore_state_data(self) -> TankForecastStoredData:
+        """Samples to keep across restarts"""
+        return TankForecastStoredData(self._forecast.as_dict())
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str | None:
+        """Name of the sensor"""
+        return f"{tank_name(self.chem_type)} Days Remaining"
+
+    @property
+    def unique_id(self) -> str | None:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_{self.chem_type}_tankdays"
+
+    @property
+    def device_class(self) -> SensorDeviceClass:
+        """The sensor device class for the sensor"""
+        return SensorDeviceClass.DURATION
+
+    @property
+    def native_value(self) -> float | None:
+        """Raw value of the sensor"""
+        if self._forecast.days_remaining is None:
+            return None
+        return round(self._forecast.days_remaining, 1)
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        return UnitOfTime.DAYS
+
+    @property
+    def icon(self) -> str:
+        return "mdi:calendar-clock"
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            "consumption_per_day": round(self._forecast.rate, 3)
+            if self._forecast.rate is not None
+            else None,
+            "units": self._units,
+            "samples": len(self._forecast.samples),
+        }
+
+
+class ChemistryTankEmptyDate(PoolEquipmentEntity, SensorEntity):
+    """Projected date a chemistry tank runs empty"""
+
+    def __init__(
+        self, coordinator: NjsPCHAdata, chem_controller, chemical: Any
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHEM_CONTROLLER, data=chem_controller)
+        self.chem_type = chemical["chemType"]
+        self._key = (self.equipment_id, self.chem_type)
+        if self._key not in coordinator.tank_forecasts:
+            coordinator.tank_forecasts[self._key] = DepletionForecast()
+        self._forecast = coordinator.tank_forecasts[self._key]
+        self._available = True
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_CHEM_CONTROLLER
+            and self._key in self.coordinator.tank_levels_changed
+        ):
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str | None:
+        """Name of the sensor"""
+        return f"{tank_name(self.chem_type)} Empty Date"
+
+    @property
+    def unique_id(self) -> str | None:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_{self.chem_type}_tankempty"
+
+    @property
+    def device_class(self) -> SensorDeviceClass:
+        """The sensor device class for the sensor"""
+        return SensorDeviceClass.TIMESTAMP
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Raw value of the sensor"""
+        if self._forecast.empty_at is None:
+            return None
+        return dt_util.utc_from_timestamp(self._forecast.empty_at)
+
+    @property
+    def icon(self) -> str:
+        return "mdi:calendar-alert"
+
+
 class SaturationIndexSensor(PoolEquipmentEntity, SensorEntity):
     """Saturation Index Sensor for njsPC-HA"""
 
@@ -630,6 +551,7 @@ class SaturationIndexSensor(PoolEquipmentEntity, SensorEntity):
         self._state_attributes: dict[str, str] = dict([])
         self.index_name = index_name
         self._available = True
+        self._attr_entity_registry_enabled_default = False
         self._value = None
         if self.index_name in chem_controller:
             self._value = chem_controller[self.index_name]
@@ -697,6 +619,8 @@ class SaturationIndexSensor(PoolEquipmentEntity, SensorEntity):
 class ChemistrySensor(PoolEquipmentEntity, SensorEntity):
     """Chemistry Sensor for njsPC-HA"""
 
+    _volatile_attributes = ("probe_reading", *TREND_ATTRIBUTES)
+
     def __init__(
         self, coordinator: NjsPCHAdata, chem_controller, chemical: Any
     ) -> None:
@@ -704,6 +628,7 @@ class ChemistrySensor(PoolEquipmentEntity, SensorEntity):
         super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHEM_CONTROLLER, data=chem_controller)
         self._state_attributes: dict[str, str] = dict([])
         self.chem_type = chemical["chemType"]
+        self._deadband = DEADBAND_ORP if self.chem_type == "orp" else DEADBAND_PH
         probe = chem_controller[self.chem_type]["probe"]
         if "temperature" in probe:
             self._state_attributes["temperature"] = probe["temperature"]
@@ -713,6 +638,11 @@ class ChemistrySensor(PoolEquipmentEntity, SensorEntity):
         if "level" in chemical:
             self._value = chemical["level"]
         self._available = True
+        self._trend = TrendTracker(
+            TREND_CHEMISTRY, TREND_DIGITS_PH if self.chem_type == "ph" else TREND_DIGITS
+        )
+        self._trend.update(self._value, monotonic())
+        self._state_attributes.update(self._trend.attributes())
 
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -730,8 +660,11 @@ class ChemistrySensor(PoolEquipmentEntity, SensorEntity):
                 if "tempUnits" in probe:
                     self._state_attributes["temp_units"] = probe["tempUnits"]["name"]
             self._value = chemical["level"]
-            self.async_write_ha_state()
+            self._trend.update(self._value, monotonic())
+            self._state_attributes.update(self._trend.attributes())
+            self.async_write_significant_state(self._deadband, self._value)
         elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._trend.reset()
             self._available = self.coordinator.data["available"]
             self.async_write_ha_state()
 
@@ -787,6 +720,9 @@ class ChemistrySensor(PoolEquipmentEntity, SensorEntity):
 class SaltSensor(PoolEquipmentEntity, SensorEntity):
     """SWG Salt Sensor for njsPC-HA"""
 
+    # njsPC works out the salt required from the salt level.
+    _volatile_attributes = ("salt_required", *TREND_ATTRIBUTES)
+
     def __init__(self, coordinator, chlorinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHLORINATOR, data=chlorinator)
@@ -800,6 +736,8 @@ class SaltSensor(PoolEquipmentEntity, SensorEntity):
             self.salt_required = chlorinator[SALT_REQUIRED]
         if SALT_TARGET in chlorinator:
             self.salt_target = chlorinator[SALT_TARGET]
+        self._trend = TrendTracker(TREND_SALT, TREND_DIGITS)
+        self._trend.update(self._value, monotonic())
 
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -811,12 +749,14 @@ class SaltSensor(PoolEquipmentEntity, SensorEntity):
             
             if SALT_LEVEL in self.coordinator.data:
                 self._value = self.coordinator.data[SALT_LEVEL]
+                self._trend.update(self._value, monotonic())
             if SALT_TARGET in self.coordinator.data:
                 self.salt_target = self.coordinator.data[SALT_TARGET]
             if SALT_REQUIRED in self.coordinator.data:
                 self.salt_required = self.coordinator.data[SALT_REQUIRED]
-            self.async_write_ha_state()
+            self.async_write_significant_state(DEADBAND_SALT, self._value)
         elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._trend.reset()
             self._available = self.coordinator.data["available"]
             self.async_write_ha_state()
 
@@ -863,6 +803,7 @@ class SaltSensor(PoolEquipmentEntity, SensorEntity):
         return {
             "salt_target": self.salt_target,
             "salt_required": self.salt_required,
+            **self._trend.attributes(),
         }
 
 class SaltTargetSensor(PoolEquipmentEntity, SensorEntity):
@@ -1124,217 +1065,3 @@ class TargetOutputSensor(PoolEquipmentEntity, SensorEntity):
     @property
     def native_unit_of_measurement(self) -> str:
         return PERCENTAGE
-
-class ChlorinatorSetpoint(PoolEquipmentEntity, NumberEntity):
-    """Number for setting SWG Setpoint in njsPC-HA."""
-
-    def __init__(self, coordinator:NjsPCHAdata, chlorinator: Any, setpoint) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHLORINATOR, data=chlorinator)
-        self._type = setpoint
-        self._available = True
-        self._value = None
-        if setpoint in chlorinator:
-            self._value = chlorinator[setpoint]
-
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if (
-            self.coordinator.data["event"] == EVENT_CHLORINATOR
-            and self.coordinator.data["id"] == self.equipment_id
-        ):
-            if self._type in self.coordinator.data:
-                self._value = self.coordinator.data[self._type]
-                self._available = True
-            else:
-                self._available = False
-            self.async_write_ha_state()
-        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
-            self._available = self.coordinator.data["available"]
-            self.async_write_ha_state()
-
-    async def async_set_native_value(self, value: float) -> None:
-        """Update the current value."""
-        new_value = int(value)
-        data = {"id": self.equipment_id, "setPoint": new_value}
-        if self._type == POOL_SETPOINT:
-            await self.coordinator.api.command(url=API_CHLORINATOR_POOL_SETPOINT, data=data)
-        else:
-            await self.coordinator.api.command(url=API_CHLORINATOR_SPA_SETPOINT, data=data)
-
-    @property
-    def mode(self) -> NumberMode:
-        return NumberMode.AUTO
-
-    @property
-    def should_poll(self) -> bool:
-        return False
-
-    @property
-    def available(self) -> bool:
-        return self._available
-
-    @property
-    def name(self) -> str:
-        """Name of the sensor"""
-        name = "Pool" if self._type == POOL_SETPOINT else "Spa"
-        return f"{name} Setpoint"
-
-    @property
-    def unique_id(self) -> str:
-        """ID of the sensor"""
-        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_{self._type}setpoint"
-
-    @property
-    def icon(self) -> str:
-        return "mdi:creation"
-
-    @property
-    def native_value(self):
-        """value"""
-        return self._value
-
-    @property
-    def native_step(self) -> int:
-        return 1
-
-    @property
-    def native_unit_of_measurement(self) -> str:
-        return PERCENTAGE
-
-class SuperChlorHours(PoolEquipmentEntity, NumberEntity):
-    """Number for setting SWG SuperChlorinate Hours in njsPC-HA."""
-
-    def __init__(self, coordinator:NjsPCHAdata, chlorinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHLORINATOR, data=chlorinator)
-        self._value = None
-        if SUPER_CHLOR_HOURS in chlorinator:
-            self._value = chlorinator[SUPER_CHLOR_HOURS]
-        self._available = True
-
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if (
-            self.coordinator.data["event"] == EVENT_CHLORINATOR
-            and self.coordinator.data["id"] == self.equipment_id
-        ):
-            if SUPER_CHLOR_HOURS in self.coordinator.data:
-                self._value = self.coordinator.data[SUPER_CHLOR_HOURS]
-                self._available = True
-            self.async_write_ha_state()
-        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
-            self._available = self.coordinator.data["available"]
-            self.async_write_ha_state()
-
-    async def async_set_native_value(self, value: float) -> None:
-        """Update the current value."""
-        new_value = int(value)
-        data = {"id": self.equipment_id, "superChlorHours": new_value}
-        await self.coordinator.api.command(url=API_CONFIG_CHLORINATOR, data=data)
-
-    @property
-    def mode(self) -> NumberMode:
-        return NumberMode.AUTO
-
-    @property
-    def should_poll(self) -> bool:
-        return False
-
-    @property
-    def available(self) -> bool:
-        return self._available
-
-    @property
-    def name(self) -> str:
-        """Name of the sensor"""
-        return "SuperChlor Hours"
-
-    @property
-    def unique_id(self) -> str:
-        """ID of the sensor"""
-        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_superchlor_hours"
-
-    @property
-    def icon(self) -> str:
-        return "mdi:timer"
-
-    @property
-    def native_value(self) -> int:
-        """value"""
-        return self._value
-
-    @property
-    def native_step(self) -> int:
-        return 1
-
-    @property
-    def native_unit_of_measurement(self) -> str:
-        return "H"
-
-    @property
-    def native_min_value(self) -> int:
-        return 1
-
-    @property
-    def native_max_value(self) -> int:
-        return 24
-
-class SuperChlorSwitch(PoolEquipmentEntity, SwitchEntity):
-    """Super Chlorinate switch for njsPC-HA"""
-
-    def __init__(self, coordinator, chlorinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHLORINATOR, data=chlorinator)
-        self._value = None
-        if SUPER_CHLOR in chlorinator:
-            self._value = chlorinator[SUPER_CHLOR]
-        self._available = True
-
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if (
-            self.coordinator.data["event"] == EVENT_CHLORINATOR
-            and self.coordinator.data["id"] == self.equipment_id
-            and SUPER_CHLOR in self.coordinator.data
-        ):
-            self._value = self.coordinator.data[SUPER_CHLOR]
-            self.async_write_ha_state()
-        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
-            self._available = self.coordinator.data["available"]
-            self.async_write_ha_state()
-
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        """Turn the entity on."""
-        data = {"id": self.equipment_id, "superChlorinate": True}
-        await self.coordinator.api.command(url=API_SUPERCHLOR, data=data)
-
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        """Turn the entity on."""
-        data = {"id": self.equipment_id, "superChlorinate": False}
-        await self.coordinator.api.command(url=API_SUPERCHLOR, data=data)
-
-    @property
-    def should_poll(self) -> bool:
-        return False
-
-    @property
-    def available(self) -> bool:
-        return self._available
-
-    @property
-    def name(self) -> str:
-        return "Super Chlorinate"
-
-    @property
-    def unique_id(self) -> str:
-        """Unique identifier for the entity"""
-        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_superchlorinate"
-
-    @property
-    def is_on(self) -> bool:
-        return self._value
-
-    @property
-    def icon(self) -> str:
-        return "mdi:atom-variant"
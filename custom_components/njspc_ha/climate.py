@@ -1,12 +1,42 @@
 """Platform for climate integration."""
 from __future__ import annotations
 
+from time import perf_counter
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature, Platform
+from homeassistant.components.climate import (
+    ClimateEntity,
+    ClimateEntityFeature,
+    HVACAction,
+    HVACMode,
+)
+
+from .entity import PoolEquipmentEntity
+from .const import (
+    PoolEquipmentClass,
+    API_SET_HEATMODE,
+    API_TEMPERATURE_SETPOINT,
+    DOMAIN,
+    EVENT_AVAILABILITY,
+    EVENT_BODY,
+)
 
-from .bodies import BodyHeater
-from .const import DESC, DOMAIN
+NJSPC_HVAC_ACTION_TO_HASS = {
+    # Map to None if we do not know how to represent.
+    "off": HVACAction.OFF,
+    "heater": HVACAction.HEATING,
+    "solar": HVACAction.HEATING,
+    "hpheat": HVACAction.HEATING,
+    "hybheat": HVACAction.HEATING,
+    "mtheat": HVACAction.HEATING,
+    "cooling": HVACAction.COOLING,
+    "hpcool": HVACAction.COOLING,
+    "cooldown": HVACAction.OFF,
+}
 
 
 async def async_setup_entry(
@@ -15,6 +45,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add climates for passed config_entry in HA."""
+    started = perf_counter()
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     config = coordinator.api.get_config()
@@ -35,9 +66,9 @@ async def async_setup_entry(
         _has_cooling = False
         if "hasCoolSetpoint" in body["heaterOptions"]:
             _has_cooling = body["heaterOptions"]["hasCoolSetpoint"]
-        _heatmodes = {}
-        for mode in await coordinator.api.get_heatmodes(identifier=body["id"]):
-            _heatmodes[mode["val"]] = mode[DESC]
+        _heatmodes = coordinator.mode_tables.get(
+            await coordinator.api.get_heatmodes(identifier=body["id"])
+        )
         # Below is not needed the heater options will tell us if the cooling setpoint
         # should be available and we should not have to round trip.
         # _has_cooling = await coordinator.api.has_cooling(body=body["type"]["val"])
@@ -53,3 +84,264 @@ async def async_setup_entry(
 
     if new_devices:
         async_add_entities(new_devices)
+    coordinator.metrics.record_setup(Platform.CLIMATE, perf_counter() - started)
+
+
+class BodyHeater(PoolEquipmentEntity, ClimateEntity):
+    """Climate entity for njsPC-HA"""
+
+    # When thinking about heaters for pool/spa you need to not think of it so much
+    # like a home thermostat.  While a home thermostat can be made to work
+    # the difference becomes a struggle to overcome.
+    # Home Thermostats typical assume only two heat/cool sources that are tied
+    # directly to the mode.  For instance, if it is heating the furnace is on and
+    # if it is cooling the air conditioner is on.  Finally, (and of no use to us),
+    # the blower can be on at different speeds to enhance the distribution.
+    #
+    # For Pool thermostats the heat source can and will be varied depending on how
+    # many are installed and which combination is the most efficient.  On a simple
+    # heater/solar installation both heat sources can fill the potential for heating
+    # and the solar can be be used for cooling depending on the conditions.  When you
+    # throw hybrid heaters or heat pumps with cooling options into the mix the
+    # calculation for which component of the heater is active becomes a bit goofier.
+    #
+    # Finally, we must not forget that in shared body systems one heater will act
+    # like two devices and be mutually exclusive to the particular body.  Our
+    # representation here reflects this by attaching the heater to the body device.
+    # This is not the heater device and we may add it later to show diagnostic data.
+    def __init__(self, coordinator, body, heatmodes, units, has_cooling) -> None:
+        """Initialize the body heater."""
+        super().__init__(
+            coordinator=coordinator, equipment_class=PoolEquipmentClass.BODY, data=body
+        )
+        self._heatmodes = heatmodes
+        self._units = units
+        self._available = True
+        self._has_cooling = has_cooling
+        self.heat_setpoint = None
+        self.cool_setpoint = None
+        self.heat_mode = None
+        self.heat_status = None
+        self.body_temperature = None
+        if "setPoint" in body:
+            self.heat_setpoint = body["setPoint"]
+        if "coolSetpoint" in body:
+            self.cool_setpoint = body["coolSetpoint"]
+        if "temp" in body:
+            self.body_temperature = body["temp"]
+        if "heatMode" in body:
+            self.heat_mode = body["heatMode"]
+        if "heatStatus" in body:
+            self.heat_status = body["heatStatus"]
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_BODY
+            and self.coordinator.data["id"] == self.equipment_id
+        ):
+            body = self.coordinator.data
+            # Because of the way Pentair reports these they may
+            # not yet be set so always check for the value
+            # in the event
+            if "temp" in body:
+                self.body_temperature = body["temp"]
+            if "setPoint" in body:
+                self.heat_setpoint = body["setPoint"]
+            if "coolSetpoint" in body:
+                self.cool_setpoint = body["coolSetpoint"]
+            if "heatStatus" in body:
+                self.heat_status = body["heatStatus"]
+            if "heatMode" in body:
+                self.heat_mode = body["heatMode"]
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        """Do not need to poll"""
+        return False
+
+    @property
+    def available(self) -> bool:
+        """Entity availability"""
+        return self._available
+
+    @property
+    def name(self) -> str:
+        """Set name of entity"""
+        return "Heater"
+
+    @property
+    def unique_id(self) -> str:
+        """Set unique id"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_heater"
+
+    @property
+    def temperature_unit(self) -> str:
+        """Set temperature units"""
+        return (
+            UnitOfTemperature.FAHRENHEIT
+            if self._units == 0
+            else UnitOfTemperature.CELSIUS
+        )
+
+    @property
+    def target_temperature(self) -> float | None:
+        """Set target temp if cooling isn't enabled"""
+        return self.heat_setpoint if self._has_cooling is False else None
+
+    @property
+    def target_temperature_high(self) -> float | None:
+        """Set cooling temp if cooling is enabled"""
+        return self.cool_setpoint if self._has_cooling is True else None
+
+    @property
+    def target_temperature_low(self) -> float | None:
+        """Set heating temp if cooling is enabled"""
+        return self.heat_setpoint if self._has_cooling is True else None
+
+    @property
+    def current_temperature(self) -> float | None:
+        """Get current temp"""
+        return self.body_temperature
+
+    @property
+    def min_temp(self) -> float:
+        """Set min temp specific to body type"""
+        return 40 if self._units == 0 else 21
+        # try:
+        #     if self._body["type"]["val"] == 0:
+        #         # pool setpoint
+        #         return 70 if self._units == 0 else 21
+        #     else:
+        #         # spa setpoint
+        #         return 90 if self._units == 0 else 32
+        # except:
+        #     # default to pool
+        #     return 70 if self._units == 0 else 21
+
+    @property
+    def max_temp(self) -> float:
+        """Set max temp specific to body type"""
+        return 104 if self._units == 0 else 40
+        # try:
+        #     if self._body["type"]["val"] == 0:
+        #         # pool setpoint
+        #         return 95 if self._units == 0 else 35
+        #     else:
+        #         # spa setpoint
+        #         return 104 if self._units == 0 else 40
+        # except:
+        #     # default to pool
+        #     return 95 if self._units == 0 else 35
+
+    @property
+    def hvac_modes(self) -> list[HVACMode] | list[str]:
+        """if only off and heat are options, add them as modes, else use presets"""
+        # The typical list of heat modes are:
+        # off
+        # gas only
+        # solar only
+        # solar preferred
+        # heatpump only
+        # heatpump preferred
+        # hybrid
+        # dual heat
+        _on: HVACMode = (
+            HVACMode.HEAT_COOL if self._has_cooling is True else HVACMode.HEAT
+        )
+        return [HVACMode.OFF, _on] if len(self._heatmodes) <= 2 else [HVACMode.AUTO]
+
+    @property
+    def hvac_mode(self) -> HVACMode:
+        if len(self._heatmodes) <= 2:
+            # if heatMode is 0/1 it is off, anything else is heat
+            _on: HVACMode = (
+                HVACMode.HEAT_COOL if self._has_cooling is True else HVACMode.HEAT
+            )
+            return HVACMode.OFF if self.heat_mode["name"] == "off" else _on
+        return HVACMode.AUTO
+
+    @property
+    def preset_mode(self) -> str:
+        if len(self._heatmodes) <= 2:
+            return None
+        if self.heat_mode["val"] in self._heatmodes:
+            return self._heatmodes.name(self.heat_mode["val"])
+        return "Off"
+
+    @property
+    def preset_modes(self) -> list[str]:
+        if len(self._heatmodes) <= 2:
+            return None
+        return list(self._heatmodes.names)
+
+    @property
+    def hvac_action(self) -> HVACAction:
+        try:
+            return NJSPC_HVAC_ACTION_TO_HASS[self.heat_status["name"]]
+        except KeyError:
+            return HVACAction.OFF
+
+    @property
+    def supported_features(self) -> ClimateEntityFeature:
+        if len(self._heatmodes) <= 2 and self._has_cooling is True:
+            # only 1 heater that supports cooling
+            return ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
+        elif len(self._heatmodes) <= 2:
+            # only 1 heater that doesn't support cooling
+            return ClimateEntityFeature.TARGET_TEMPERATURE
+        elif self._has_cooling is True:
+            # multiple heaters that support cooling
+            return (
+                ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
+                | ClimateEntityFeature.PRESET_MODE
+            )
+        else:
+            # multiple heaters that don't support cooling
+            return (
+                ClimateEntityFeature.TARGET_TEMPERATURE
+                | ClimateEntityFeature.PRESET_MODE
+            )
+
+    async def async_set_temperature(self, **kwargs: Any) -> None:
+        data = {"id": self.equipment_id}
+        if "target_temp_low" in kwargs:
+            data["heatSetpoint"] = kwargs.get("target_temp_low")
+        if "target_temp_high" in kwargs:
+            data["coolSetpoint"] = kwargs.get("target_temp_high")
+        if ATTR_TEMPERATURE in kwargs:
+            data["heatSetpoint"] = kwargs.get(ATTR_TEMPERATURE)
+        # data = {"id": self._body["id"], "heatSetpoint": kwargs.get(ATTR_TEMPERATURE)}
+        await self.coordinator.api.command(url=API_TEMPERATURE_SETPOINT, data=data)
+
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+        if len(self._heatmodes) <= 2:
+            njspc_value = (
+                self._heatmodes.off if hvac_mode == HVACMode.OFF else self._heatmodes.on
+            )
+            if njspc_value is None:
+                self.coordinator.logger.error(
+                    "Invalid mode for set_hvac_mode: %s", hvac_mode
+                )
+                return
+            data = {"id": self.equipment_id, "mode": njspc_value}
+            await self.coordinator.api.command(url=API_SET_HEATMODE, data=data)
+        return
+
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
+        if len(self._heatmodes) <= 2:
+            return None
+
+        njspc_value = self._heatmodes.value(preset_mode)
+
+        if njspc_value is None:
+            self.coordinator.logger.error(
+                "Invalid mode for set_hvac_mode: %s", preset_mode
+            )
+            return
+        data = {"id": self.equipment_id, "mode": njspc_value}
+        await self.coordinator.api.command(url=API_SET_HEATMODE, data=data)
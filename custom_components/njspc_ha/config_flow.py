@@ -7,7 +7,7 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import aiohttp_client
@@ -17,7 +17,16 @@ from urllib.parse import urlparse
 
 from homeassistant.const import CONF_HOST, CONF_PORT
 
-from .const import DOMAIN
+from .const import (
+    CONF_HEARTBEAT,
+    CONF_PUMP_RATED_FLOW,
+    CONF_TELEMETRY_RETENTION,
+    CONF_TELEMETRY_STORE,
+    DEFAULT_DEADBANDS,
+    DEFAULT_HEARTBEAT,
+    DEFAULT_TELEMETRY_RETENTION,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,6 +66,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.server_id = None
         self.controller_name = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -170,5 +187,56 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the njsPC-HA options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the deadbands for the noisy sensors and the telemetry store."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        schema = {
+            vol.Required(
+                CONF_HEARTBEAT,
+                default=options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+            vol.Required(
+                CONF_TELEMETRY_STORE,
+                default=options.get(CONF_TELEMETRY_STORE, False),
+            ): bool,
+            vol.Required(
+                CONF_TELEMETRY_RETENTION,
+                default=options.get(
+                    CONF_TELEMETRY_RETENTION, DEFAULT_TELEMETRY_RETENTION
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=365)),
+            vol.Required(
+                CONF_PUMP_RATED_FLOW,
+                default=options.get(CONF_PUMP_RATED_FLOW, 0),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        }
+        for key, default in DEFAULT_DEADBANDS.items():
+            schema[
+                vol.Required(
+                    f"{key}_absolute",
+                    default=options.get(f"{key}_absolute", default.absolute),
+                )
+            ] = vol.All(vol.Coerce(float), vol.Range(min=0))
+            schema[
+                vol.Required(
+                    f"{key}_relative",
+                    default=options.get(f"{key}_relative", default.relative),
+                )
+            ] = vol.All(vol.Coerce(float), vol.Range(min=0, max=1))
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -1,11 +1,43 @@
 """Constants for the njsPC-HA integration."""
 
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
 from homeassistant.backports.enum import StrEnum
+from homeassistant.const import Platform
 
 
 DOMAIN = "njspc_ha"
 MANUFACTURER = "nodejs-PoolController"
 
+PLATFORMS: list[Platform] = [
+    Platform.SENSOR,
+    Platform.SWITCH,
+    Platform.CLIMATE,
+    Platform.NUMBER,
+    Platform.LIGHT,
+    Platform.BUTTON,
+    Platform.BINARY_SENSOR,
+]
+# Platforms with entities on every controller.
+ALWAYS_PLATFORMS = {Platform.SENSOR, Platform.BINARY_SENSOR}
+
+# STORAGE
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+STORAGE_VERSION = 2
+# Snapshots taken by the snapshot_state service.
+SNAPSHOTS_STORAGE_KEY = f"{DOMAIN}.pool_snapshots"
+SNAPSHOTS_STORAGE_VERSION = 1
+
+# Keys of the initial state/all document kept once the entities are created.
+CONFIG_INDEX_KEYS = ("model", "clockMode", "appVersionState")
+
+# CONNECTION
+CONNECT_TIMEOUT = 10
+RECONNECT_DELAY_MIN = 1
+RECONNECT_DELAY_MAX = 300
+
 # API ENDPOINTS
 API_STATE_ALL = "state/all"
 API_CIRCUIT_SETSTATE = "state/circuit/setState"
@@ -28,6 +60,7 @@ API_TEMPERATURE_SETPOINT = "state/body/setPoint"
 API_SET_HEATMODE = "state/body/heatMode"
 API_CHEM_CONTROLLER_SETPOINT = "state/chemController"
 API_CONFIG_SCHEDULE = "config/schedule"
+API_PANEL_MODE = "state/panelMode"
 
 # SOCKETIO EVENTS
 EVENT_CIRCUIT = "circuit"
@@ -45,6 +78,44 @@ EVENT_FILTER = "filter"
 EVENT_VIRTUAL_CIRCUIT = "virtualCircuit"
 EVENT_SCHEDULE = "schedule"
 
+# The state/all key of the equipment each event is for.  The events are only
+# handled when the controller has that equipment or the key is None.
+EVENT_EQUIPMENT: dict[str, str | None] = {
+    EVENT_TEMPS: None,
+    EVENT_CONTROLLER: None,
+    EVENT_BODY: None,
+    EVENT_PUMP: "pumps",
+    EVENT_CIRCUIT: "circuits",
+    EVENT_CHLORINATOR: "chlorinators",
+    EVENT_CHEM_CONTROLLER: "chemControllers",
+    EVENT_LIGHTGROUP: "lightGroups",
+    EVENT_CIRCUITGROUP: "circuitGroups",
+    EVENT_FEATURE: "features",
+    EVENT_FILTER: "filters",
+    EVENT_VIRTUAL_CIRCUIT: "virtualCircuits",
+    EVENT_SCHEDULE: "schedules",
+}
+# Seconds after which a repeat of the last event for a piece of equipment is
+# passed on rather than dropped as a duplicate.
+DUPLICATE_KEEPALIVE = 60
+# Events queued ahead of the telemetry.  These carry the changes made from
+# Home Assistant so they are dispatched in order and never merged.
+INGEST_CONTROL_EVENTS = frozenset(
+    {
+        EVENT_CIRCUIT,
+        EVENT_FEATURE,
+        EVENT_CIRCUITGROUP,
+        EVENT_LIGHTGROUP,
+        EVENT_BODY,
+        EVENT_CHLORINATOR,
+        EVENT_SCHEDULE,
+    }
+)
+# Socket events queued for dispatch before the oldest telemetry is shed.
+INGEST_QUEUE_SIZE = 256
+# Event fired on the Home Assistant bus for every njsPC event.
+NJSPC_BUS_EVENT = "njspc-ha_event"
+
 POOL_SETPOINT = "poolSetpoint"
 SPA_SETPOINT = "spaSetpoint"
 
@@ -64,6 +135,88 @@ SUPER_CHLOR_HOURS = "superChlorHours"
 MIN_FLOW = "minFlow"
 MAX_FLOW = "maxFlow"
 
+# OPTIONS
+CONF_HEARTBEAT = "heartbeat"
+DEFAULT_HEARTBEAT = 900
+CONF_TELEMETRY_STORE = "telemetry_store"
+CONF_PUMP_RATED_FLOW = "pump_rated_flow"
+CONF_TELEMETRY_RETENTION = "telemetry_retention_days"
+DEFAULT_TELEMETRY_RETENTION = 7
+
+# TELEMETRY
+# Seconds between writes of the buffered readings to the telemetry store.
+TELEMETRY_WRITE_INTERVAL = 10
+# Seconds between deletes of the readings older than the retention.
+TELEMETRY_PRUNE_INTERVAL = 3600
+# Readings returned for each series by a query.
+TELEMETRY_QUERY_LIMIT = 10000
+
+# SERVICES
+# Commands a batched service has in flight at once.
+BATCH_PARALLEL = 4
+SERVICE_SET_SERVICE_MODE = "set_service_mode"
+SERVICE_SET_AUTO_MODE = "set_auto_mode"
+SERVICE_SET_STATES = "set_states"
+SERVICE_APPLY_SCENE = "apply_scene"
+SERVICE_SNAPSHOT_STATE = "snapshot_state"
+SERVICE_RESTORE_STATE = "restore_state"
+SERVICE_QUERY_TELEMETRY = "query_telemetry"
+
+# PUMPS
+# Seconds between refits of the estimated flow models.
+FLOW_REFIT_INTERVAL = 900
+
+# AGGREGATES
+AGGREGATE_PUMP_POWER = "pump_power"
+AGGREGATE_CIRCUITS_ON = "circuits_on"
+AGGREGATE_HEATERS_ACTIVE = "heaters_active"
+AGGREGATE_CHEM_ALARM = "chem_alarm"
+
+# FILTERS
+# Clean percentage at which a filter is due for cleaning.
+FILTER_CLEAN_THRESHOLD = 10
+# A rise in the clean percentage of this many points, or back up to the
+# cleaned level, is a cleaning.  Smaller rises are the pressure moving with
+# the pump speed.
+FILTER_CLEANED_RISE = 10
+FILTER_CLEANED_LEVEL = 95
+
+# DEADBANDS
+DEADBAND_TEMPERATURE = "temperature"
+DEADBAND_POWER = "power"
+DEADBAND_SPEED = "speed"
+DEADBAND_PRESSURE = "pressure"
+DEADBAND_ORP = "orp"
+DEADBAND_PH = "ph"
+DEADBAND_SALT = "salt"
+DEADBAND_FLOW = "flow"
+
+
+@dataclass(frozen=True)
+class SensorDeadband:
+    """Describes when a change in a numeric reading is worth writing."""
+
+    absolute: float = 0
+    """Changes at or below this amount are not written"""
+
+    relative: float = 0
+    """Changes at or below this fraction of the last written value are not written"""
+
+    heartbeat: int = DEFAULT_HEARTBEAT
+    """Seconds after which the current value is written regardless of change"""
+
+
+DEFAULT_DEADBANDS: dict[str, SensorDeadband] = {
+    DEADBAND_TEMPERATURE: SensorDeadband(absolute=0.2),
+    DEADBAND_POWER: SensorDeadband(absolute=5, relative=0.02),
+    DEADBAND_SPEED: SensorDeadband(absolute=10),
+    DEADBAND_PRESSURE: SensorDeadband(absolute=0.2),
+    DEADBAND_ORP: SensorDeadband(absolute=3),
+    DEADBAND_PH: SensorDeadband(absolute=0.02),
+    DEADBAND_SALT: SensorDeadband(absolute=50),
+    DEADBAND_FLOW: SensorDeadband(absolute=0.5),
+}
+
 
 class PoolEquipmentClass(StrEnum):
     """Class for pool equipment."""
@@ -152,3 +305,27 @@ class PoolEquipmentModel(StrEnum):
 
     FILTER = "Pool Filter"
     """Equipment filter for the pool"""
+
+
+# HEATERS
+# Heat status names for the heat sources that are heating or cooling the body.
+HEAT_STATUS_HEATING = frozenset({"heater", "solar", "hpheat", "hybheat", "mtheat"})
+HEAT_STATUS_COOLING = frozenset({"cooling", "hpcool"})
+
+
+def heater_is_firing(body: Mapping[str, Any]) -> bool | None:
+    """Whether a heat source is heating or cooling the body"""
+    if "heatStatus" not in body or "name" not in body["heatStatus"]:
+        return None
+    name = body["heatStatus"]["name"]
+    return name in HEAT_STATUS_HEATING or name in HEAT_STATUS_COOLING
+
+
+# PUMPS
+def pump_is_on(pump: Mapping[str, Any]) -> bool:
+    """Whether the pump data says the pump is running"""
+    if "relay" in pump:
+        return pump["relay"] > 0
+    if "command" in pump:
+        return pump["command"] == 10
+    return False
@@ -7,93 +7,33 @@ import logging
 
 from homeassistant.helpers.entity import EntityCategory
 
-from homeassistant.components.binary_sensor import (
-    BinarySensorEntity
-)
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorStateClass,
     SensorDeviceClass
 )
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import UnitOfPower, UnitOfTemperature
 from .entity import PoolEquipmentEntity
-from .__init__ import NjsPCHAdata
+from .coordinator import NjsPCHAdata
 from .const import (
-    PoolEquipmentModel,
     PoolEquipmentClass,
+    AGGREGATE_CIRCUITS_ON,
+    AGGREGATE_HEATERS_ACTIVE,
+    AGGREGATE_PUMP_POWER,
     EVENT_AVAILABILITY,
+    EVENT_BODY,
+    EVENT_CIRCUIT,
     EVENT_CONTROLLER,
+    EVENT_FEATURE,
+    EVENT_PUMP,
     EVENT_TEMPS,
-    STATUS,
-    DESC
+    DEADBAND_TEMPERATURE,
 )
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class FreezeProtectionSensor(PoolEquipmentEntity, BinarySensorEntity):
-    """The current freeze protection status for the control panel"""
-
-    def __init__(self, coordinator: NjsPCHAdata, data: Any) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator = coordinator, equipment_class=PoolEquipmentClass.CONTROL_PANEL, data=data)
-        if "freeze" in data:
-            self._value = data["freeze"]
-            self._available = True
-        else:
-            self._value = None
-            self._available = False
-
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if self.coordinator.data["event"] == EVENT_CONTROLLER:
-            if "freeze" in self.coordinator.data:
-                self._available = True
-                self._value = self.coordinator.data["freeze"]
-            else:
-                self._available = False
-                self._value = None
-            self.async_write_ha_state()
-        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
-            self._available = self.coordinator.data["available"]
-            self.async_write_ha_state()
-
-    @property
-    def should_poll(self) -> bool:
-        return False
-
-    @property
-    def available(self) -> bool:
-        return self._available
-
-    @property
-    def name(self) -> str | None:
-        """Name of the sensor"""
-        return "Freeze Protection"
-
-    @property
-    def unique_id(self) -> str | None:
-        """ID of the sensor"""
-        return f"{self.coordinator.controller_id}_{self.equipment_class}_freeze_protect"
-
-    @property
-    def native_value(self) -> bool | None:
-        """Raw value of the sensor"""
-        return self._value
-
-    @property
-    def is_on(self) -> bool:
-        """Return if motion is detected."""
-        return self._value
-
-
-    @property
-    def icon(self) -> str:
-        if self._value is True:
-            return "mdi:snowflake-alert"
-        return "mdi:snowflake-off"
-
 class PanelModeSensor(PoolEquipmentEntity, SensorEntity):
     """The current dosing status for the chemical"""
 
@@ -104,6 +44,7 @@ class PanelModeSensor(PoolEquipmentEntity, SensorEntity):
         super().__init__(coordinator = coordinator, equipment_class=PoolEquipmentClass.CONTROL_PANEL, data = data)
         self._state_attributes: dict[str, Any] = dict([])
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
         self._value = None
         if "mode" in data:
             self._value = data["mode"]["desc"]
@@ -181,9 +122,14 @@ class TempProbeSensor(PoolEquipmentEntity, SensorEntity):
             and self._key in self.coordinator.data
         ):  # make sure the data we are looking for is in the coordinator data
             self._value = round(self.coordinator.data[self._key], 1)
-            if "units" in self.coordinator.data:
+            if (
+                "units" in self.coordinator.data
+                and self.coordinator.data["units"]["name"] != self._units
+            ):
                 self._units = self.coordinator.data["units"]["name"]
-            self.async_write_ha_state()
+                self.async_write_ha_state()
+            else:
+                self.async_write_significant_state(DEADBAND_TEMPERATURE, self._value)
         elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
             self._available = self.coordinator.data["available"]
             self.async_write_ha_state()
@@ -244,35 +190,31 @@ class TempProbeSensor(PoolEquipmentEntity, SensorEntity):
             return UnitOfTemperature.FAHRENHEIT
         return UnitOfTemperature.CELSIUS
 
-class EquipmentStatusSensor(PoolEquipmentEntity, SensorEntity):
-    """Equipment Status Sensor for njsPC-HA"""
 
-    def __init__(
-        self,
-        coordinator: NjsPCHAdata,
-        equipment_class: PoolEquipmentClass,
-        equipment_model: PoolEquipmentModel,
-        equipment: Any,
-        event: str,
-    ) -> None:
+class ControllerAggregateSensor(PoolEquipmentEntity, SensorEntity):
+    """Controller wide total kept by the coordinator"""
+
+    # The coordinator keeps the totals up to date as the equipment events come
+    # in so this only reads them when its total changed.
+    def __init__(self, coordinator: NjsPCHAdata, data: Any, key: str) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator=coordinator, equipment_class=equipment_class, data=equipment)
-        self._value = None
-        if STATUS in equipment and DESC in equipment[STATUS]:
-            self._value = equipment[STATUS][DESC]
-        self._event = event
+        super().__init__(coordinator = coordinator, equipment_class=PoolEquipmentClass.CONTROL_PANEL, data = data)
+        self._key = key
+        match(key):
+            case "pump_power":
+                self._events = (EVENT_PUMP,)
+            case "circuits_on":
+                self._events = (EVENT_CIRCUIT, EVENT_FEATURE)
+            case "heaters_active":
+                self._events = (EVENT_BODY,)
         self._available = True
-        self._attr_device_class = f"{self.equipment_name}_status"
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
 
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         if (
-            self.coordinator.data["event"] == self._event
-            and self.coordinator.data["id"] == self.equipment_id
+            self.coordinator.data["event"] in self._events
+            and self._key in self.coordinator.aggregates_changed
         ):
-            if STATUS in self.coordinator.data and DESC in self.coordinator.data[STATUS]:
-                self._value = self.coordinator.data[STATUS][DESC]
             self.async_write_ha_state()
         elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
             self._available = self.coordinator.data["available"]
@@ -287,21 +229,75 @@ class EquipmentStatusSensor(PoolEquipmentEntity, SensorEntity):
         return self._available
 
     @property
-    def name(self) -> str:
+    def name(self) -> str | None:
         """Name of the sensor"""
-        return "Status"
+        match(self._key):
+            case "pump_power":
+                return "Total Pump Power"
+            case "circuits_on":
+                return "Circuits On"
+            case "heaters_active":
+                return "Heaters Active"
 
     @property
-    def unique_id(self) -> str:
+    def unique_id(self) -> str | None:
         """ID of the sensor"""
-        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_status"
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self._key}"
 
     @property
-    def native_value(self) -> str | None:
-        return self._value
+    def state_class(self) -> SensorStateClass:
+        """State class of the sensor"""
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def device_class(self) -> SensorDeviceClass | None:
+        if self._key == AGGREGATE_PUMP_POWER:
+            return SensorDeviceClass.POWER
+        return None
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        if self._key == AGGREGATE_PUMP_POWER:
+            return UnitOfPower.WATT
+        return None
+
+    @property
+    def native_value(self) -> float | int:
+        """Raw value of the sensor"""
+        match(self._key):
+            case "pump_power":
+                return round(self.coordinator.total_pump_watts)
+            case "circuits_on":
+                return len(self.coordinator.circuits_on)
+            case "heaters_active":
+                return len(self.coordinator.heaters_active)
 
     @property
     def icon(self) -> str:
-        if self._value != "Ok":
-            return "mdi:alert-circle"
-        return "mdi:check-circle"
+        match(self._key):
+            case "pump_power":
+                return "mdi:lightning-bolt"
+            case "circuits_on":
+                return "mdi:electric-switch-closed"
+            case "heaters_active":
+                return "mdi:fire"
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the state attributes."""
+        if self._key == AGGREGATE_CIRCUITS_ON:
+            return {
+                "circuits": sorted(
+                    circuit_id
+                    for event, circuit_id in self.coordinator.circuits_on
+                    if event == EVENT_CIRCUIT
+                ),
+                "features": sorted(
+                    feature_id
+                    for event, feature_id in self.coordinator.circuits_on
+                    if event == EVENT_FEATURE
+                ),
+            }
+        if self._key == AGGREGATE_HEATERS_ACTIVE:
+            return {"bodies": sorted(self.coordinator.heaters_active)}
+        return None
@@ -0,0 +1,890 @@
+"""Coordinator and api for njsPC-HA"""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict, deque
+from collections.abc import Callable, Mapping
+from functools import partial
+import logging
+import sqlite3
+from time import monotonic, perf_counter, time
+from typing import Any
+
+import aiohttp
+import socketio
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform, CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+
+from .ingest import IngestQueue
+from .metrics import PerformanceMetrics
+from .modes import ModeTables
+from .snapshots import PoolStateMirror
+from .telemetry import TelemetryStore
+from .timeline import ScheduleIndex, pump_circuits
+from .analytics import (
+    FLOW_SAMPLES,
+    DepletionForecast,
+    FilterPressureTrend,
+    fit_flow_models,
+)
+from .const import (
+    BATCH_PARALLEL,
+    AGGREGATE_CHEM_ALARM,
+    AGGREGATE_CIRCUITS_ON,
+    AGGREGATE_HEATERS_ACTIVE,
+    AGGREGATE_PUMP_POWER,
+    ALWAYS_PLATFORMS,
+    CONF_HEARTBEAT,
+    CONF_TELEMETRY_RETENTION,
+    CONF_TELEMETRY_STORE,
+    DEFAULT_TELEMETRY_RETENTION,
+    CONFIG_INDEX_KEYS,
+    CONNECT_TIMEOUT,
+    FILTER_CLEAN_THRESHOLD,
+    FILTER_CLEANED_LEVEL,
+    FILTER_CLEANED_RISE,
+    INGEST_QUEUE_SIZE,
+    heater_is_firing,
+    DEFAULT_DEADBANDS,
+    RECONNECT_DELAY_MAX,
+    RECONNECT_DELAY_MIN,
+    SUPER_CHLOR,
+    API_CONFIG_BODY,
+    API_CONFIG_CIRCUIT,
+    API_CONFIG_HEATERS,
+    API_HEATMODES,
+    API_LIGHTTHEMES,
+    API_STATE_ALL,
+    API_LIGHTCOMMANDS,
+    DOMAIN,
+    DUPLICATE_KEEPALIVE,
+    SNAPSHOTS_STORAGE_KEY,
+    SNAPSHOTS_STORAGE_VERSION,
+    EVENT_AVAILABILITY,
+    EVENT_BODY,
+    EVENT_CHLORINATOR,
+    EVENT_CHEM_CONTROLLER,
+    EVENT_CIRCUIT,
+    EVENT_CIRCUITGROUP,
+    EVENT_FEATURE,
+    EVENT_LIGHTGROUP,
+    EVENT_PUMP,
+    EVENT_FILTER,
+    EVENT_TEMPS,
+    EVENT_SCHEDULE,
+    EVENT_EQUIPMENT,
+    PLATFORMS,
+    NJSPC_BUS_EVENT,
+    WATTS,
+    SensorDeadband,
+)
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# Platforms each entry has been reloaded to add.  An entry is only reloaded
+# once for a platform so equipment the platform ends up ignoring cannot cause
+# a reload loop.
+_PLATFORM_RELOADS: dict[str, set[Platform]] = {}
+
+
+def _is_light(circuit: Mapping[str, Any]) -> bool:
+    """Whether a circuit is a light"""
+    return isinstance(circuit.get("type"), Mapping) and bool(
+        circuit["type"].get("isLight")
+    )
+
+
+def needed_platforms(config: Mapping[str, Any]) -> set[Platform]:
+    """Platforms that have entities for the equipment in state/all"""
+    platforms = set(ALWAYS_PLATFORMS)
+    if (
+        config.get("circuits")
+        or config.get("circuitGroups")
+        or config.get("features")
+        or config.get("schedules")
+        or any(SUPER_CHLOR in chlor for chlor in config.get("chlorinators", []))
+    ):
+        platforms.add(Platform.SWITCH)
+    if config.get("heaters"):
+        platforms.add(Platform.CLIMATE)
+    if config.get("chlorinators") or config.get("chemControllers"):
+        platforms.add(Platform.NUMBER)
+    if config.get("lightGroups") or any(
+        _is_light(circuit) for circuit in config.get("circuits", [])
+    ):
+        platforms.update((Platform.LIGHT, Platform.BUTTON))
+    return platforms
+
+
+def filter_pumps(config: Mapping[str, Any]) -> dict[int, set[int]]:
+    """Ids of the pumps that serve the body of each filter"""
+    bodies = config.get("temps", {}).get("bodies", [])
+    serves = pump_circuits(config.get("pumps", []))
+    pumps: dict[int, set[int]] = {}
+    for pool_filter in config.get("filters", []):
+        if "id" not in pool_filter:
+            continue
+        # The filter body is 0 for the pool and 1 for the spa (body 1 and 2)
+        # or 32 when it is shared by both.
+        filter_body = pool_filter.get("body")
+        if isinstance(filter_body, Mapping):
+            filter_body = filter_body.get("val")
+        circuits = {
+            body["circuit"]
+            for body in bodies
+            if "circuit" in body
+            and (filter_body not in (0, 1, 2, 3) or body.get("id") == filter_body + 1)
+        }
+        pumps[pool_filter["id"]] = {
+            pump_id for pump_id, served in serves.items() if served & circuits
+        }
+    return pumps
+
+
+def event_platforms(event: str, data: Mapping[str, Any]) -> set[Platform]:
+    """Platforms that have entities for the equipment in a socket event"""
+    if event == EVENT_CIRCUIT:
+        if _is_light(data):
+            return {Platform.SWITCH, Platform.LIGHT, Platform.BUTTON}
+        return {Platform.SWITCH}
+    if event == EVENT_LIGHTGROUP:
+        return {Platform.LIGHT, Platform.BUTTON}
+    if event in (EVENT_FEATURE, EVENT_CIRCUITGROUP, EVENT_SCHEDULE):
+        return {Platform.SWITCH}
+    if event == EVENT_CHEM_CONTROLLER:
+        return {Platform.NUMBER}
+    if event == EVENT_CHLORINATOR:
+        if SUPER_CHLOR in data:
+            return {Platform.NUMBER, Platform.SWITCH}
+        return {Platform.NUMBER}
+    if (
+        event == EVENT_BODY
+        and isinstance(data.get("heaterOptions"), Mapping)
+        and data["heaterOptions"].get("total", 0) > 0
+    ):
+        return {Platform.CLIMATE}
+    return set()
+
+
+class NjsPCHAdata(DataUpdateCoordinator):
+    """Data coordinator for receiving from nodejs-PoolController"""
+
+    def __init__(
+        self, hass: HomeAssistant, api: NjsPCHAapi, entry: ConfigEntry
+    ) -> None:
+        """Initialize data coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            # Name of the data. For logging purposes.
+            name=DOMAIN,
+        )
+        self.api = api
+        self.entry = entry
+        self.metrics = api.metrics
+        # The platforms forwarded for the entry.  When equipment for another
+        # platform shows up the entry is reloaded to add it.
+        self.platforms: list[Platform] = list(PLATFORMS)
+        self._reload_requested = False
+        self.sio = None
+        self._connect_task: asyncio.Task | None = None
+        # Socket events waiting to be dispatched by the consumer task.
+        self.ingest = IngestQueue(INGEST_QUEUE_SIZE, self.forget_fingerprint)
+        self._ingest_task: asyncio.Task | None = None
+        # Startup metrics.  These are reported in the diagnostics.
+        self.setup_started = monotonic()
+        self.setup_attempts = 1
+        self.snapshot_source = "live"
+        # Where the state/all snapshot and value tables are saved.
+        self.store: NjsPCHAstore | None = None
+        self.connect_attempts = 0
+        self.time_to_ready: float | None = None
+        self.model = api.config["model"]
+        self.version = "Unknown"
+        # Cache this off so the creation of entities is faster
+        self.controller_id = api.get_controller_id()
+        # Bodies from the last temps event indexed by id along with the ids
+        # that changed in that event.  Body sensors read their slice from here
+        # rather than scanning the array.
+        self.temps_bodies: dict[int, Any] = {}
+        self.temps_bodies_changed: set[int] = set()
+        # Deadbands for the noisy numeric sensors.  The stats hold the number
+        # of values received and written for each deadband.
+        self.deadbands = self.get_deadbands(entry.options)
+        self.deadband_stats: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+        # Level forecasts for the chemical tanks keyed by chem controller id and
+        # chemical along with the keys that got a new level in the last event.
+        self.tank_forecasts: dict[tuple[int, str], DepletionForecast] = {}
+        self.tank_levels_changed: set[tuple[int, str]] = set()
+        # Latest speed of each pump joined to the filter pressures so the
+        # pressures can be compared across speeds.  The clean forecasts
+        # predict when the clean percentage reaches the threshold.
+        self.pump_rpms: dict[int, float] = {
+            pump["id"]: pump["rpm"]
+            for pump in api.config.get("pumps", [])
+            if "id" in pump and "rpm" in pump
+        }
+        self.filter_pumps = filter_pumps(api.config)
+        self.filter_trends: dict[int, FilterPressureTrend] = {}
+        self.filter_clean_forecasts: dict[int, DepletionForecast] = {}
+        # (rpm, watts, flow) samples from the pumps that report flow and the
+        # flow models fit from them.  The model keyed by None is pooled across
+        # all the pumps.
+        self.flow_samples: dict[int, deque[tuple[float, float, float]]] = {}
+        self.flow_models: dict[int | None, tuple[float, float, float]] = {}
+        self._flow_samples_added = 0
+        # Controller wide aggregates.  These are kept up to date by adding and
+        # removing the contribution of each piece of equipment as its events
+        # arrive and the keys of the aggregates that changed in the last event
+        # are noted so the sensors only write when they need to.
+        self.pump_watts: dict[int, float] = {}
+        self.total_pump_watts = 0.0
+        self.circuits_on: set[tuple[str, int]] = set()
+        self.heaters_active: set[int] = set()
+        self.chem_alarms: dict[int, set[str]] = {}
+        self.aggregates_changed: set[str] = set()
+        self.seed_aggregates(api.config)
+        # Next run of every schedule.  It is started with the entry and kept
+        # up to date from the schedule events.
+        self.schedule_index = ScheduleIndex(
+            hass, api.config.get("schedules", []), api.config.get("pumps", [])
+        )
+        # Settings the snapshot services save and restore along with the
+        # snapshots taken so far by name.
+        self.state_mirror = PoolStateMirror(api.config)
+        self.snapshots: dict[str, dict[str, Any]] = {}
+        self.snapshot_store = Store(
+            hass, SNAPSHOTS_STORAGE_VERSION, f"{SNAPSHOTS_STORAGE_KEY}.{entry.entry_id}"
+        )
+        # Light theme and heat mode tables shared by the entities that have
+        # the same table.
+        self.mode_tables = ModeTables()
+        # Fingerprint of the last event passed on for each (event, id) and
+        # when it was passed on so exact repeats can be dropped.
+        self.event_fingerprints: dict[tuple[str, Any], tuple[int, float]] = {}
+        # What the coordinator itself does with each type of socket event
+        # before the entities get it.
+        self.event_indexers: dict[str, tuple[Callable[[Any], None], ...]] = {
+            EVENT_TEMPS: (self.index_temps_bodies,),
+            EVENT_PUMP: (self.update_aggregates, self.index_pump),
+            EVENT_CIRCUIT: (self.update_state_mirror, self.update_aggregates),
+            EVENT_CHLORINATOR: (self.update_state_mirror,),
+            EVENT_CHEM_CONTROLLER: (self.update_aggregates, self.index_tank_levels),
+            EVENT_BODY: (self.update_state_mirror, self.update_aggregates),
+            EVENT_FEATURE: (self.update_state_mirror, self.update_aggregates),
+            EVENT_LIGHTGROUP: (self.update_state_mirror,),
+            EVENT_FILTER: (self.index_filter,),
+            EVENT_SCHEDULE: (self.schedule_index.async_update_schedule,),
+        }
+        # Raw readings kept in a local file when the telemetry store is on.
+        self.telemetry: TelemetryStore | None = None
+        if entry.options.get(CONF_TELEMETRY_STORE, False):
+            self.telemetry = TelemetryStore(
+                hass.config.path(
+                    STORAGE_DIR, f"{DOMAIN}.{entry.entry_id}.telemetry.db"
+                ),
+                entry.options.get(
+                    CONF_TELEMETRY_RETENTION, DEFAULT_TELEMETRY_RETENTION
+                ),
+            )
+            for event in (EVENT_TEMPS, EVENT_PUMP, EVENT_CHEM_CONTROLLER):
+                self.event_indexers[event] += (self.index_telemetry,)
+        if "appVersionState" in api.config:
+            self.version = f'{api.config["appVersionState"]["installed"]} ({api.config["appVersionState"]["gitLocalBranch"]}-{api.config["appVersionState"]["gitLocalCommit"][-7:]})'
+
+    async def sio_connect(self):
+        """Method to connect to nodejs-PoolController"""
+
+        self.sio = socketio.AsyncClient(
+            reconnection=True,
+            reconnection_attempts=0,
+            reconnection_delay=1,
+            reconnection_delay_max=10,
+            logger=False,
+            engineio_logger=False,
+        )
+        # Turn off the incessant logging from the socketio/engineio client the
+        # arguments above do nothing as it doesn't check for false when it
+        # instantiates the SocketIO client.  It just inherits engineio's logger
+        # which defaults to chatty kathy.
+        logging.getLogger("socketio.client").setLevel(logging.ERROR)
+        logging.getLogger("engineio.client").setLevel(logging.ERROR)
+
+        for event, equipment_key in EVENT_EQUIPMENT.items():
+            # Events for equipment the controller does not have fall through
+            # to the catch-all handler.
+            if equipment_key is None or self.api.config.get(equipment_key):
+                self.sio.on(event, partial(self.receive_event, event))
+        self.sio.on("*", self.handle_other_event)
+
+        @self.sio.event
+        async def connect():
+            avail = {"event": EVENT_AVAILABILITY, "available": True}
+            self.ingest.put(EVENT_AVAILABILITY, avail)
+            self.metrics.record_connection("connected")
+            self.logger.debug(f"SocketIO connect to {self.api.get_base_url()}")
+            if self.time_to_ready is None:
+                self.time_to_ready = round(monotonic() - self.setup_started, 3)
+                self.logger.info(
+                    "Connected to njsPC %s seconds after setup started (%s setup attempts, %s connection attempts)",
+                    self.time_to_ready,
+                    self.setup_attempts,
+                    self.connect_attempts,
+                )
+                if self.snapshot_source == "cache":
+                    # Reload so the entities are created from the live state.
+                    self.hass.async_create_task(
+                        self.hass.config_entries.async_reload(self.entry.entry_id)
+                    )
+
+        @self.sio.event
+        async def connect_error(data):
+            avail = {"event": EVENT_AVAILABILITY, "available": False}
+            self.ingest.put(EVENT_AVAILABILITY, avail)
+            self.metrics.record_connection("connect_error", str(data))
+            self.logger.error(f"SocketIO connection error: {data}")
+
+        @self.sio.event
+        async def disconnect():
+            avail = {"event": EVENT_AVAILABILITY, "available": False}
+            self.ingest.put(EVENT_AVAILABILITY, avail)
+            self.metrics.record_connection("disconnected")
+            self.logger.debug(f"SocketIO disconnect to {self.api.get_base_url()}")
+
+        # The consumer never finishes so it must not hold up the startup.
+        self._ingest_task = self.entry.async_create_background_task(
+            self.hass, self.async_consume_events(), f"{DOMAIN} ingest"
+        )
+        self._connect_task = self.entry.async_create_background_task(
+            self.hass, self.async_connect(), f"{DOMAIN} connect"
+        )
+
+    async def async_connect(self) -> None:
+        """Connect to njsPC retrying with an exponential backoff"""
+        # The socketio client only reconnects on its own once the first
+        # connection has been made.  Until then we retry here so that a
+        # missing njsPC does not hold up the Home Assistant startup.
+        delay = RECONNECT_DELAY_MIN
+        while True:
+            self.connect_attempts += 1
+            try:
+                await self.sio.connect(self.api.get_base_url())
+                return
+            except socketio.exceptions.ConnectionError as err:
+                self.logger.debug(
+                    "Unable to connect to %s retrying in %s seconds: %s",
+                    self.api.get_base_url(),
+                    delay,
+                    err,
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_DELAY_MAX)
+
+    @staticmethod
+    def get_deadbands(options: Mapping[str, Any]) -> dict[str, SensorDeadband]:
+        """Merge the configured deadbands over the defaults"""
+        heartbeat = options.get(CONF_HEARTBEAT)
+        deadbands = {}
+        for key, default in DEFAULT_DEADBANDS.items():
+            deadbands[key] = SensorDeadband(
+                absolute=options.get(f"{key}_absolute", default.absolute),
+                relative=options.get(f"{key}_relative", default.relative),
+                heartbeat=heartbeat if heartbeat is not None else default.heartbeat,
+            )
+        return deadbands
+
+    def receive_event(self, event: str, data) -> None:
+        """Queue a socket event for the consumer task"""
+        if self.is_duplicate(event, data):
+            self.metrics.record_duplicate(event)
+            return
+        self.ingest.put(event, data)
+
+    async def async_consume_events(self) -> None:
+        """Dispatch the queued socket events one at a time"""
+        while True:
+            event, data = await self.ingest.get()
+            try:
+                if event == EVENT_AVAILABILITY:
+                    self.async_set_updated_data(data)
+                else:
+                    self.handle_event(event, data)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception("Error dispatching njsPC %s event", event)
+            # Let the rest of Home Assistant run between events during a burst.
+            await asyncio.sleep(0)
+
+    def handle_event(self, event: str, data) -> None:
+        """Index a socket event and send it to the entities and the bus"""
+        started = perf_counter()
+        data["event"] = event
+        for indexer in self.event_indexers.get(event, ()):
+            indexer(data)
+        self.check_platforms(event, data)
+        self.async_set_updated_data(data)
+        self.send_to_bus(data)
+        self.metrics.record_event(event, perf_counter() - started)
+
+    def is_duplicate(self, event: str, data) -> bool:
+        """Whether an event repeats the last one for the same equipment"""
+        key = (event, data.get("id"))
+        fingerprint = hash(repr(data))
+        now = monotonic()
+        last = self.event_fingerprints.get(key)
+        if (
+            last is not None
+            and last[0] == fingerprint
+            and now - last[1] < DUPLICATE_KEEPALIVE
+        ):
+            return True
+        self.event_fingerprints[key] = (fingerprint, now)
+        return False
+
+    def forget_fingerprint(self, event: str, data) -> None:
+        """Let the next event for the equipment through after one is shed"""
+        self.event_fingerprints.pop((event, data.get("id")), None)
+
+    def handle_other_event(self, event: str, data=None) -> None:
+        """Count the events nothing has registered for"""
+        self.metrics.record_unhandled(event)
+        if event in EVENT_EQUIPMENT and isinstance(data, dict):
+            self.check_platforms(event, data)
+            # No entity wants it but an automation might.
+            data["event"] = event
+            self.send_to_bus(data)
+
+    def check_platforms(self, event: str, data) -> None:
+        """Reload the entry when an event has equipment for a missing platform"""
+        if self._reload_requested or len(self.platforms) == len(PLATFORMS):
+            return
+        reloads = _PLATFORM_RELOADS.setdefault(self.entry.entry_id, set())
+        missing = event_platforms(event, data).difference(self.platforms, reloads)
+        if not missing:
+            return
+        reloads.update(missing)
+        self._reload_requested = True
+        self.logger.info(
+            "New %s equipment needs the %s platforms, reloading",
+            event,
+            ", ".join(sorted(missing)),
+        )
+        self.hass.async_create_task(
+            self.hass.config_entries.async_reload(self.entry.entry_id)
+        )
+
+    def update_state_mirror(self, data) -> None:
+        """Copy the settings in an event into the snapshot mirror"""
+        self.state_mirror.update(data["event"], data)
+
+    async def async_load_snapshots(self) -> None:
+        """Load the snapshots saved before the last reload or restart"""
+        stored = await self.snapshot_store.async_load()
+        if stored is None:
+            return
+        self.snapshots = {
+            name: PoolStateMirror.load(snapshot)
+            for name, snapshot in stored.get("snapshots", {}).items()
+        }
+
+    async def async_save_snapshot(self, name: str) -> None:
+        """Take a snapshot of the current settings and save it"""
+        self.snapshots[name] = self.state_mirror.snapshot()
+        await self.snapshot_store.async_save({"snapshots": self.snapshots})
+
+    def index_pump(self, data) -> None:
+        """Note the speed of a pump and add it to the flow samples"""
+        if "rpm" in data and "id" in data:
+            self.pump_rpms[data["id"]] = data["rpm"]
+            self.add_flow_sample(data)
+
+    def index_temps_bodies(self, data) -> None:
+        """Index the bodies in a temps event by id and note which ones changed"""
+        if "bodies" not in data:
+            self.temps_bodies_changed = set()
+            return
+        bodies = {}
+        changed = set()
+        for body in data["bodies"]:
+            bodies[body["id"]] = body
+            if self.temps_bodies.get(body["id"]) != body:
+                changed.add(body["id"])
+        self.temps_bodies = bodies
+        self.temps_bodies_changed = changed
+
+    def index_tank_levels(self, data) -> None:
+        """Add the tank levels in a chemController event to the forecasts"""
+        changed = set()
+        for chem_type in ("ph", "orp"):
+            chemical = data.get(chem_type)
+            if (
+                not isinstance(chemical, Mapping)
+                or "tank" not in chemical
+                or "level" not in chemical["tank"]
+            ):
+                continue
+            key = (data["id"], chem_type)
+            if key not in self.tank_forecasts:
+                self.tank_forecasts[key] = DepletionForecast()
+            if self.tank_forecasts[key].add(time(), chemical["tank"]["level"]):
+                changed.add(key)
+        self.tank_levels_changed = changed
+
+    def seed_aggregates(self, config) -> None:
+        """Start the aggregates from the initial state"""
+        for pump in config.get("pumps", []):
+            self.update_aggregates({**pump, "event": EVENT_PUMP})
+        for circuit in config.get("circuits", []):
+            self.update_aggregates({**circuit, "event": EVENT_CIRCUIT})
+        for feature in config.get("features", []):
+            self.update_aggregates({**feature, "event": EVENT_FEATURE})
+        for body in config.get("temps", {}).get("bodies", []):
+            self.update_aggregates({**body, "event": EVENT_BODY})
+        for chem_controller in config.get("chemControllers", []):
+            self.update_aggregates({**chem_controller, "event": EVENT_CHEM_CONTROLLER})
+        self.aggregates_changed = set()
+
+    def update_aggregates(self, data) -> None:
+        """Move the contribution of one piece of equipment in the aggregates"""
+        changed = set()
+        event = data["event"]
+        if "id" not in data:
+            self.aggregates_changed = changed
+            return
+        if event == EVENT_PUMP and WATTS in data:
+            watts = data[WATTS] or 0
+            previous = self.pump_watts.get(data["id"], 0)
+            if watts != previous:
+                self.pump_watts[data["id"]] = watts
+                self.total_pump_watts += watts - previous
+                changed.add(AGGREGATE_PUMP_POWER)
+        elif event in (EVENT_CIRCUIT, EVENT_FEATURE) and "isOn" in data:
+            key = (event, data["id"])
+            if data["isOn"] and key not in self.circuits_on:
+                self.circuits_on.add(key)
+                changed.add(AGGREGATE_CIRCUITS_ON)
+            elif not data["isOn"] and key in self.circuits_on:
+                self.circuits_on.discard(key)
+                changed.add(AGGREGATE_CIRCUITS_ON)
+        elif event == EVENT_BODY:
+            firing = heater_is_firing(data)
+            if firing and data["id"] not in self.heaters_active:
+                self.heaters_active.add(data["id"])
+                changed.add(AGGREGATE_HEATERS_ACTIVE)
+            elif firing is False and data["id"] in self.heaters_active:
+                self.heaters_active.discard(data["id"])
+                changed.add(AGGREGATE_HEATERS_ACTIVE)
+        elif event == EVENT_CHEM_CONTROLLER and isinstance(data.get("alarms"), Mapping):
+            alarms = set()
+            for name, alarm in data["alarms"].items():
+                # The alarms are value maps although some are plain numbers.
+                value = alarm.get("val") if isinstance(alarm, Mapping) else alarm
+                if isinstance(value, (int, float)) and value != 0:
+                    alarms.add(name)
+            if alarms != self.chem_alarms.get(data["id"], set()):
+                self.chem_alarms[data["id"]] = alarms
+                changed.add(AGGREGATE_CHEM_ALARM)
+        self.aggregates_changed = changed
+
+    def add_flow_sample(self, data) -> None:
+        """Buffer the speed, watts and flow from a pump event"""
+        if (
+            data.get("rpm", 0) > 0
+            and data.get("watts", 0) > 0
+            and data.get("flow", 0) > 0
+        ):
+            if data["id"] not in self.flow_samples:
+                self.flow_samples[data["id"]] = deque(maxlen=FLOW_SAMPLES)
+            self.flow_samples[data["id"]].append(
+                (data["rpm"], data["watts"], data["flow"])
+            )
+            self._flow_samples_added += 1
+
+    async def async_refit_flow_models(self, now=None) -> None:
+        """Refit the flow models in the executor when there are new samples"""
+        if self._flow_samples_added == 0:
+            return
+        self._flow_samples_added = 0
+        samples = {
+            pump_id: list(pump_samples)
+            for pump_id, pump_samples in self.flow_samples.items()
+        }
+        self.flow_models = await self.hass.async_add_executor_job(
+            fit_flow_models, samples
+        )
+
+    def index_telemetry(self, data) -> None:
+        """Buffer the readings in an event for the telemetry store"""
+        if self.telemetry is not None:
+            self.telemetry.add(data["event"], data)
+
+    async def async_open_telemetry(self) -> None:
+        """Open the telemetry store and drop the readings past the retention"""
+        try:
+            await self.hass.async_add_executor_job(self.telemetry.open)
+            await self.hass.async_add_executor_job(self.telemetry.prune)
+        except sqlite3.Error as err:
+            self.logger.error(
+                "Unable to open the telemetry store %s: %s", self.telemetry.path, err
+            )
+            self.telemetry = None
+
+    async def async_write_telemetry(self, now=None) -> None:
+        """Write the buffered readings to the telemetry store in the executor"""
+        if self.telemetry is None:
+            return
+        samples = self.telemetry.take()
+        if not samples:
+            return
+        try:
+            await self.hass.async_add_executor_job(self.telemetry.write, samples)
+        except sqlite3.Error as err:
+            self.logger.warning(
+                "Unable to write %s telemetry readings: %s", len(samples), err
+            )
+
+    async def async_prune_telemetry(self, now=None) -> None:
+        """Delete the readings past the retention in the executor"""
+        if self.telemetry is None:
+            return
+        try:
+            await self.hass.async_add_executor_job(self.telemetry.prune)
+        except sqlite3.Error as err:
+            self.logger.warning("Unable to prune the telemetry store: %s", err)
+
+    async def async_close_telemetry(self) -> None:
+        """Write what is left in the buffer and close the telemetry store"""
+        if self.telemetry is None:
+            return
+        await self.async_write_telemetry()
+        await self.hass.async_add_executor_job(self.telemetry.close)
+
+    def index_filter(self, data) -> None:
+        """Add a filter event to the pressure trend and clean forecast"""
+        if "id" not in data:
+            return
+        trend = self.get_filter_trend(data["id"])
+        if "cleanPercentage" in data:
+            forecast = self.get_filter_clean_forecast(data["id"])
+            if forecast.is_refill(data["cleanPercentage"]):
+                # The filter has been cleaned.
+                trend.reset()
+            forecast.add(time(), data["cleanPercentage"])
+        if "pressure" in data:
+            # Only fall back on the fastest pump when we cannot tell which
+            # pumps serve the filter.
+            pump_ids = self.filter_pumps.get(data["id"]) or self.pump_rpms
+            rpm = max(
+                (self.pump_rpms[pump_id] for pump_id in pump_ids if pump_id in self.pump_rpms),
+                default=0,
+            )
+            trend.add(data["pressure"], rpm)
+
+    def get_filter_trend(self, filter_id: int) -> FilterPressureTrend:
+        """Pressure trend for a filter"""
+        if filter_id not in self.filter_trends:
+            self.filter_trends[filter_id] = FilterPressureTrend()
+        return self.filter_trends[filter_id]
+
+    def get_filter_clean_forecast(self, filter_id: int) -> DepletionForecast:
+        """Clean percentage forecast for a filter"""
+        if filter_id not in self.filter_clean_forecasts:
+            self.filter_clean_forecasts[filter_id] = DepletionForecast(
+                floor=FILTER_CLEAN_THRESHOLD,
+                refill_rise=FILTER_CLEANED_RISE,
+                refill_level=FILTER_CLEANED_LEVEL,
+            )
+        return self.filter_clean_forecasts[filter_id]
+
+    async def sio_close(self):
+        """Close the connection to njsPC"""
+        if self._connect_task is not None and not self._connect_task.done():
+            self._connect_task.cancel()
+        await self.sio.disconnect()
+        if self._ingest_task is not None and not self._ingest_task.done():
+            self._ingest_task.cancel()
+
+    def send_to_bus(self, data):
+        """Send incoming messages to HA event bus"""
+        # The bus returns before building the event when nothing, including
+        # the listeners for all events, is listening.
+        bus_data = {"evt": data["event"], "data": data}
+        self.hass.bus.async_fire(NJSPC_BUS_EVENT, bus_data)
+
+
+class NjsPCHAstore(Store):
+    """The last state/all and value tables to start from when njsPC is unreachable"""
+
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        """Wrap the state/all saved by the first version"""
+        if old_major_version == 1:
+            return {"state": old_data, "tables": {}}
+        raise NotImplementedError
+
+
+class NjsPCHAapi:
+    """API for sending data to nodejs-PoolController"""
+
+    def __init__(self, hass: HomeAssistant, data) -> None:
+        self.hass = hass
+        self.data = data
+        self._base_url = f"http://{data[CONF_HOST]}:{data[CONF_PORT]}"
+        self.config = None
+        # Heat mode, light theme and light command tables by url.  They are
+        # saved with the state/all snapshot and used when njsPC is unreachable.
+        self.tables: dict[str, list[dict[str, Any]]] = {}
+        self.reachable = False
+        self._session = None
+        self.model = "Unknown"
+        self.version = "Unknown"
+        self.metrics = PerformanceMetrics()
+
+    def get_base_url(self):
+        """Return the base url"""
+        return self._base_url
+
+    def get_config(self):
+        """Return the initial config"""
+        return self.config
+
+    def release_config(self) -> None:
+        """Swap the initial state/all document for the few keys used after setup"""
+        if self.config is None:
+            return
+        self.config = {
+            key: self.config[key] for key in CONFIG_INDEX_KEYS if key in self.config
+        }
+
+    async def command(self, url: str, data) -> bool:
+        """Send commands to nodejs-PoolController via PUT request"""
+        started = perf_counter()
+        success = False
+        try:
+            async with self._session.put(
+                f"{self._base_url}/{url}", json=data
+            ) as resp:
+                if resp.status == 200:
+                    success = True
+                else:
+                    _LOGGER.error(await resp.text())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.error("Unable to send %s to %s: %s", url, self._base_url, err)
+        self.metrics.record_command(url, perf_counter() - started, success)
+        return success
+
+    async def command_batch(self, commands: list[tuple[str, Any]]) -> list[bool]:
+        """Send several commands at once with a bound on how many are in flight"""
+        semaphore = asyncio.Semaphore(BATCH_PARALLEL)
+
+        async def _command(url: str, data) -> bool:
+            async with semaphore:
+                return await self.command(url=url, data=data)
+
+        return await asyncio.gather(
+            *(_command(url, data) for url, data in commands)
+        )
+
+    async def get_initial(self) -> bool:
+        """Get the initial config from nodejs-PoolController"""
+        self._session = aiohttp_client.async_get_clientsession(self.hass)
+        self.config = await self.get_state()
+        self.reachable = self.config is not None
+        return self.reachable
+
+    async def get_state(self) -> dict[str, Any] | None:
+        """Get the current state of all the equipment"""
+        try:
+            async with self._session.get(
+                f"{self._base_url}/{API_STATE_ALL}",
+                timeout=aiohttp.ClientTimeout(total=CONNECT_TIMEOUT),
+            ) as resp:
+                if resp.status == 200:
+                    return await resp.json()
+                _LOGGER.error(await resp.text())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Unable to connect to %s: %s", self._base_url, err)
+        return None
+
+    async def get_table(self, url: str) -> list[dict[str, Any]]:
+        """Get a table of values from njsPC or the cached copy when it is unreachable"""
+        if self.reachable:
+            try:
+                async with self._session.get(
+                    f"{self._base_url}/{url}",
+                    timeout=aiohttp.ClientTimeout(total=CONNECT_TIMEOUT),
+                ) as resp:
+                    if resp.status == 200:
+                        self.tables[url] = await resp.json()
+                        return self.tables[url]
+                    _LOGGER.error(await resp.text())
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                _LOGGER.warning(
+                    "Unable to get %s from %s, using the cached copy: %s",
+                    url,
+                    self._base_url,
+                    err,
+                )
+        return self.tables.get(url, [])
+
+    async def get_heatmodes(self, identifier):
+        """Get the available heat modes for body"""
+        return await self.get_table(f"{API_CONFIG_BODY}/{identifier}/{API_HEATMODES}")
+
+    async def get_lightthemes(self, identifier):
+        """Get list of themes for light"""
+        return await self.get_table(
+            f"{API_CONFIG_CIRCUIT}/{identifier}/{API_LIGHTTHEMES}"
+        )
+
+    async def get_lightcommands(self, identifier):
+        """Get light commands for lights"""
+        return await self.get_table(
+            f"{API_CONFIG_CIRCUIT}/{identifier}/{API_LIGHTCOMMANDS}"
+        )
+
+    async def has_cooling(self, body) -> bool:
+        """Check to see if any of the heaters have cooling enabled"""
+        _has_cooling: bool = False
+        async with self._session.get(f"{self._base_url}/{API_CONFIG_HEATERS}") as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                for heater in data["heaters"]:
+                    if "coolingEnabled" in heater:
+                        # only run if cooling enabled is a key
+                        if body == 0:
+                            if (
+                                heater["body"] == 0 or heater["body"] == 32
+                            ) and "coolingEnabled" in heater:
+                                _has_cooling = (
+                                    True
+                                    if heater["coolingEnabled"] is True
+                                    else _has_cooling
+                                )
+
+                        else:
+                            if heater["body"] == 1 or heater["body"] == 32:
+                                _has_cooling = (
+                                    True
+                                    if heater["coolingEnabled"] is True
+                                    else _has_cooling
+                                )
+                return _has_cooling
+
+            else:
+                _LOGGER.error(await resp.text())
+                return _has_cooling
+
+    def get_controller_id(self) -> str:
+        """Gets the unique id of the njsPC controller"""
+        # Maybe we rethink this and pass a uuid from njsPC. It already exists in the data.
+        return f'{self.data[CONF_HOST].replace(".", "")}{self.data[CONF_PORT]}'
+
+    def get_unique_id(self, name) -> str:
+        """Create a unique id for entity"""
+        _id = f'{self.data[CONF_HOST].replace(".", "")}{self.data[CONF_PORT]}_{name.lower()}'
+        return _id
@@ -0,0 +1,125 @@
+"""Diagnostics support for njsPC-HA."""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from .coordinator import NjsPCHAdata
+from .const import DOMAIN
+
+# Keys in the njsPC state that identify the installation.
+TO_REDACT = {
+    CONF_HOST,
+    "ip",
+    "mac",
+    "macAddress",
+    "serial",
+    "serialNumber",
+    "address",
+    "latitude",
+    "longitude",
+    "zip",
+    "email",
+    "phone",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: NjsPCHAdata = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "options": dict(entry.options),
+        "startup": {
+            "snapshot_source": coordinator.snapshot_source,
+            "setup_attempts": coordinator.setup_attempts,
+            "connect_attempts": coordinator.connect_attempts,
+            "time_to_ready": coordinator.time_to_ready,
+            "connected": coordinator.sio is not None and coordinator.sio.connected,
+        },
+        "platforms": list(coordinator.platforms),
+        "deadbands": get_deadband_diagnostics(coordinator),
+        "schedule_conflicts": coordinator.schedule_index.conflict_list(),
+        "performance": coordinator.metrics.as_dict(),
+        "ingest": coordinator.ingest.as_dict(),
+        "telemetry": (
+            coordinator.telemetry.as_dict() if coordinator.telemetry is not None else None
+        ),
+        "entities": get_entity_diagnostics(hass, entry),
+        "state": await get_state_diagnostics(coordinator),
+    }
+
+
+async def get_state_diagnostics(coordinator: NjsPCHAdata) -> dict[str, Any]:
+    """The redacted state from njsPC or the stored snapshot when it is unreachable"""
+    state = await coordinator.api.get_state()
+    source = "live"
+    if state is None:
+        # The state we started from is released once the entities are created.
+        cached = await coordinator.store.async_load() if coordinator.store else None
+        if cached is None:
+            return {"source": None, "data": None}
+        state = cached["state"]
+        source = "cache"
+    return {"source": source, "data": async_redact_data(state, TO_REDACT)}
+
+
+def get_entity_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Count the entities of the entry by platform and class"""
+    platforms: Counter[str] = Counter()
+    disabled: Counter[str] = Counter()
+    for entity in er.async_entries_for_config_entry(
+        er.async_get(hass), entry.entry_id
+    ):
+        platforms[entity.domain] += 1
+        if entity.disabled:
+            disabled[entity.domain] += 1
+    classes: Counter[str] = Counter()
+    for platform in async_get_platforms(hass, DOMAIN):
+        if platform.config_entry is None or platform.config_entry.entry_id != entry.entry_id:
+            continue
+        for entity in platform.entities.values():
+            classes[type(entity).__name__] += 1
+    return {
+        "total": sum(platforms.values()),
+        "platforms": dict(platforms),
+        "disabled": dict(disabled),
+        "classes": dict(sorted(classes.items())),
+    }
+
+
+def get_deadband_diagnostics(coordinator: NjsPCHAdata) -> dict[str, Any]:
+    """Report how many sensor writes the deadbands have saved"""
+    total_received = 0
+    total_written = 0
+    sensors = {}
+    for key, (received, written) in coordinator.deadband_stats.items():
+        total_received += received
+        total_written += written
+        sensors[key] = {
+            "received": received,
+            "written": written,
+            "write_reduction": write_reduction(received, written),
+        }
+    return {
+        "received": total_received,
+        "written": total_written,
+        "write_reduction": write_reduction(total_received, total_written),
+        "sensors": sensors,
+    }
+
+
+def write_reduction(received: int, written: int) -> float | None:
+    """Fraction of the received values that were not written"""
+    if received == 0:
+        return None
+    return round(1 - written / received, 3)
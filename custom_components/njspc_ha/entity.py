@@ -1,8 +1,10 @@
 """Base Entity for njsPC."""
 from __future__ import annotations
 
+from time import monotonic
+
 from homeassistant.helpers.entity import DeviceInfo, Entity
-from . import NjsPCHAdata
+from .coordinator import NjsPCHAdata
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN, MANUFACTURER, PoolEquipmentClass, PoolEquipmentModel
 from dataclasses import dataclass
@@ -92,6 +94,10 @@ DEVICE_MAPPING: dict[PoolEquipmentClass, PoolEquipmentDescription] = {
 class PoolEquipmentEntity(CoordinatorEntity[NjsPCHAdata], Entity):
     """Defines an Equipment Related Entity for njsPC"""
 
+    # Attributes that move with every reading.  They are refreshed whenever the
+    # state is written but do not force a write of their own.
+    _volatile_attributes: tuple[str, ...] = ()
+
     def __init__(
         self, coordinator: NjsPCHAdata, equipment_class: PoolEquipmentClass, data: any
     ) -> None:
@@ -112,6 +118,41 @@ class PoolEquipmentEntity(CoordinatorEntity[NjsPCHAdata], Entity):
                 self.equipment_name = dev.label
         self._attr_has_entity_name = True
         self._available = True
+        self._written_value = None
+        self._written_attributes = None
+        self._written_at = 0.0
+
+    def async_write_significant_state(self, deadband: str, value: float | None) -> None:
+        """Write the state only when the value moves outside of its deadband.
+
+        A change is significant when it exceeds both the absolute and relative
+        deadbands or when the heartbeat has elapsed since the last write.  A
+        change in the attributes other than the volatile ones is always written.
+        """
+        band = self.coordinator.deadbands[deadband]
+        stats = self.coordinator.deadband_stats[deadband]
+        stats[0] += 1
+        now = monotonic()
+        written = self._written_value
+        attributes = self.extra_state_attributes
+        if attributes is not None:
+            attributes = {
+                key: val
+                for key, val in attributes.items()
+                if key not in self._volatile_attributes
+            }
+        if (
+            value is None
+            or written is None
+            or now - self._written_at >= band.heartbeat
+            or abs(value - written) > max(band.absolute, abs(written) * band.relative)
+            or attributes != self._written_attributes
+        ):
+            self._written_value = value
+            self._written_attributes = attributes
+            self._written_at = now
+            stats[1] += 1
+            self.async_write_ha_state()
 
     def format_duration(self, secs: int) -> str:
         """Format a number of seconds into an output string"""
@@ -0,0 +1,121 @@
+"""Ingest queue between the njsPC socket and the dispatch of its events"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+from itertools import count
+from time import monotonic
+from typing import Any
+
+from .const import EVENT_AVAILABILITY, INGEST_CONTROL_EVENTS
+from .metrics import TimingStats
+
+# Priorities of the queued events.  Lower goes first.
+PRIORITY_AVAILABILITY = 0
+PRIORITY_CONTROL = 1
+PRIORITY_TELEMETRY = 2
+
+
+def event_priority(event: str) -> int:
+    """Priority of a socket event"""
+    if event == EVENT_AVAILABILITY:
+        return PRIORITY_AVAILABILITY
+    if event in INGEST_CONTROL_EVENTS:
+        return PRIORITY_CONTROL
+    return PRIORITY_TELEMETRY
+
+
+class IngestQueue:
+    """Bounded priority queue of socket events
+
+    Availability goes first and replaces any availability still queued.  The
+    events for the equipment that is switched and set from Home Assistant go
+    next in the order they arrived so none of the changes are lost.  Telemetry
+    goes last and an event is merged into the one still queued for the same
+    equipment.  When the queue is full the oldest event of the lowest priority
+    is shed and on_shed is called with it.
+    """
+
+    def __init__(
+        self, maxsize: int, on_shed: Callable[[str, dict], None] | None = None
+    ) -> None:
+        self.maxsize = maxsize
+        self.on_shed = on_shed
+        # Queued (event, data, queued at) by key for each priority.  Control
+        # events are keyed by a sequence number so they are never merged.
+        self._pending: tuple[dict[Any, tuple[str, dict, float]], ...] = (
+            {},
+            {},
+            {},
+        )
+        self._sequence = count()
+        self._ready = asyncio.Event()
+        self.max_depth = 0
+        self.merged: Counter[str] = Counter()
+        self.shed: Counter[str] = Counter()
+        self.wait = TimingStats()
+
+    def __len__(self) -> int:
+        return sum(len(pending) for pending in self._pending)
+
+    def put(self, event: str, data: dict) -> None:
+        """Queue a socket event"""
+        priority = event_priority(event)
+        pending = self._pending[priority]
+        if priority == PRIORITY_CONTROL:
+            key: Any = next(self._sequence)
+        else:
+            key = (event, data.get("id"))
+        if key in pending:
+            queued_event, queued, queued_at = pending[key]
+            if priority == PRIORITY_TELEMETRY:
+                queued.update(data)
+                data = queued
+            # Keep the place in the queue so busy equipment is not starved.
+            pending[key] = (event, data, queued_at)
+            self.merged[event] += 1
+            return
+        if len(self) >= self.maxsize and not self._shed(event, data, priority):
+            return
+        pending[key] = (event, data, monotonic())
+        self.max_depth = max(self.max_depth, len(self))
+        self._ready.set()
+
+    def _shed(self, event: str, data: dict, priority: int) -> bool:
+        """Make room for an event, False when the event itself is shed"""
+        for lower in range(PRIORITY_TELEMETRY, priority - 1, -1):
+            if self._pending[lower]:
+                key = next(iter(self._pending[lower]))
+                shed_event, shed_data, _ = self._pending[lower].pop(key)
+                self._dropped(shed_event, shed_data)
+                return True
+        self._dropped(event, data)
+        return False
+
+    def _dropped(self, event: str, data: dict) -> None:
+        """Count a shed event and report it"""
+        self.shed[event] += 1
+        if self.on_shed is not None:
+            self.on_shed(event, data)
+
+    async def get(self) -> tuple[str, dict]:
+        """Wait for the next event to dispatch"""
+        while not len(self):
+            self._ready.clear()
+            await self._ready.wait()
+        pending = next(pending for pending in self._pending if pending)
+        event, data, queued_at = pending.pop(next(iter(pending)))
+        self.wait.add(monotonic() - queued_at)
+        return event, data
+
+    def as_dict(self) -> dict[str, Any]:
+        """Queue depth and counters for the diagnostics"""
+        return {
+            "depth": len(self),
+            "max_depth": self.max_depth,
+            "maxsize": self.maxsize,
+            "wait": self.wait.as_dict(),
+            "merged": dict(self.merged.most_common()),
+            "shed": dict(self.shed.most_common()),
+        }
@@ -1,11 +1,14 @@
 """Platform for light integration."""
 from __future__ import annotations
 
+from time import perf_counter
 from typing import Any
 
 from .entity import PoolEquipmentEntity
+from .modes import ModeTable
 from homeassistant.components.light import ATTR_EFFECT, LightEntity, LightEntityFeature
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.core import HomeAssistant
 
@@ -14,7 +17,6 @@ from .const import (
     API_CIRCUIT_SETSTATE,
     API_CIRCUIT_SETTHEME,
     API_LIGHTGROUP_SETSTATE,
-    DESC,
     DOMAIN,
     EVENT_AVAILABILITY,
     EVENT_CIRCUIT,
@@ -27,6 +29,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add sensors for passed config_entry in HA."""
+    started = perf_counter()
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     config = coordinator.api.get_config()
@@ -34,9 +37,9 @@ async def async_setup_entry(
     for circuit in config["circuits"]:
         try:
             if circuit["type"]["isLight"]:
-                _lightthemes = {}
-                for theme in await coordinator.api.get_lightthemes(circuit["id"]):
-                    _lightthemes[theme["val"]] = theme[DESC]
+                _lightthemes = coordinator.mode_tables.get(
+                    await coordinator.api.get_lightthemes(circuit["id"])
+                )
                 new_devices.append(
                     CircuitLight(
                         coordinator=coordinator,
@@ -48,9 +51,9 @@ async def async_setup_entry(
         except KeyError:
             pass
     for group in config["lightGroups"]:
-        _lightthemes = {}
-        for theme in await coordinator.api.get_lightthemes(group["id"]):
-            _lightthemes[theme["val"]] = theme[DESC]
+        _lightthemes = coordinator.mode_tables.get(
+            await coordinator.api.get_lightthemes(group["id"])
+        )
         new_devices.append(
             CircuitLight(
                 coordinator=coordinator,
@@ -62,6 +65,7 @@ async def async_setup_entry(
 
     if new_devices:
         async_add_entities(new_devices)
+    coordinator.metrics.record_setup(Platform.LIGHT, perf_counter() - started)
 
 class CircuitLight(PoolEquipmentEntity, LightEntity):
     """Light entity for njsPC-HA."""
@@ -71,7 +75,7 @@ class CircuitLight(PoolEquipmentEntity, LightEntity):
         coordinator,
         equipment_class: PoolEquipmentClass,
         circuit: Any,
-        lightthemes: Any,
+        lightthemes: ModeTable,
     ) -> None:
         """Initialize the light."""
         match equipment_class:
@@ -113,14 +117,7 @@ class CircuitLight(PoolEquipmentEntity, LightEntity):
         """Turn the entity on."""
         if ATTR_EFFECT in kwargs:
             if len(self._lightthemes) > 0:
-                njspc_value = next(
-                    (
-                        k
-                        for k, v in self._lightthemes.items()
-                        if v == kwargs[ATTR_EFFECT]
-                    ),
-                    None,
-                )
+                njspc_value = self._lightthemes.value(kwargs[ATTR_EFFECT])
                 if njspc_value is None:
                     self.coordinator.logger.error(
                         "Invalid theme for colorlogic light: %s", kwargs[ATTR_EFFECT]
@@ -167,18 +164,13 @@ class CircuitLight(PoolEquipmentEntity, LightEntity):
         """Which effect is active"""
         # Try not to load the stack with try catch for keyerror
         # don't know how efficeint the exception handling is
-        if self._lighting_theme in self._lightthemes:
-            return self._lightthemes[self._lighting_theme]
-        return None
+        return self._lightthemes.name(self._lighting_theme)
 
     @property
     def effect_list(self) -> list[str]:
         """Get list of effects"""
         if len(self._lightthemes) > 0:
-            _effects = []
-            for effect in self._lightthemes.values():
-                _effects.append(effect)
-            return _effects
+            return list(self._lightthemes.names)
         return None
 
     @property
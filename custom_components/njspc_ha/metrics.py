@@ -0,0 +1,120 @@
+"""Performance counters for njsPC-HA"""
+from __future__ import annotations
+
+from collections import Counter, deque
+from time import monotonic
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+# Connection changes kept for the diagnostics.
+CONNECTION_HISTORY = 50
+
+
+class TimingStats:
+    """Count, mean and max of a timed operation"""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add one timing"""
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """Timings in milliseconds"""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else None,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class PerformanceMetrics:
+    """Counters for the socket events, commands, connection and setup"""
+
+    def __init__(self) -> None:
+        self.started = monotonic()
+        self.events: Counter[str] = Counter()
+        self.dispatch: dict[str, TimingStats] = {}
+        self.commands: dict[str, TimingStats] = {}
+        self.command_failures: Counter[str] = Counter()
+        self.unhandled: Counter[str] = Counter()
+        self.duplicates: Counter[str] = Counter()
+        self.connections: deque[dict[str, Any]] = deque(maxlen=CONNECTION_HISTORY)
+        self.setup: dict[str, float] = {}
+
+    def record_event(self, event: str, seconds: float) -> None:
+        """Count a socket event and how long it took to dispatch"""
+        self.events[event] += 1
+        if event not in self.dispatch:
+            self.dispatch[event] = TimingStats()
+        self.dispatch[event].add(seconds)
+
+    def record_duplicate(self, event: str) -> None:
+        """Count a socket event dropped as a repeat of the last one"""
+        self.duplicates[event] += 1
+
+    def record_unhandled(self, event: str) -> None:
+        """Count a socket event that nothing consumes"""
+        self.unhandled[event] += 1
+
+    def record_command(self, url: str, seconds: float, success: bool) -> None:
+        """Add the latency of a command sent to njsPC"""
+        if url not in self.commands:
+            self.commands[url] = TimingStats()
+        self.commands[url].add(seconds)
+        if not success:
+            self.command_failures[url] += 1
+
+    def record_connection(self, state: str, detail: Any = None) -> None:
+        """Note a change in the socket connection"""
+        self.connections.append(
+            {"at": dt_util.utcnow().isoformat(), "state": state, "detail": detail}
+        )
+
+    def record_setup(self, phase: str, seconds: float) -> None:
+        """Note how long a phase of the setup took"""
+        self.setup[phase] = round(seconds, 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Counters for the diagnostics"""
+        minutes = max(monotonic() - self.started, 1) / 60
+        duplicates = sum(self.duplicates.values())
+        passed = sum(self.events.values())
+        return {
+            "uptime_minutes": round(minutes, 1),
+            "events": {
+                event: {
+                    "count": count,
+                    "per_minute": round(count / minutes, 2),
+                    "dispatch": self.dispatch[event].as_dict(),
+                    "duplicates": self.duplicates[event],
+                    "duplicate_rate": duplicate_rate(self.duplicates[event], count),
+                }
+                for event, count in self.events.most_common()
+            },
+            "duplicates": duplicates,
+            "duplicate_rate": duplicate_rate(duplicates, passed),
+            "unhandled_events": dict(self.unhandled.most_common()),
+            "commands": {
+                url: {**stats.as_dict(), "failures": self.command_failures[url]}
+                for url, stats in self.commands.items()
+            },
+            "connections": list(self.connections),
+            "setup_seconds": dict(self.setup),
+        }
+
+
+def duplicate_rate(duplicates: int, passed: int) -> float | None:
+    """Fraction of the received events that were dropped as duplicates"""
+    if duplicates + passed == 0:
+        return None
+    return round(duplicates / (duplicates + passed), 3)
@@ -0,0 +1,63 @@
+"""Value tables for light themes and heat modes"""
+from __future__ import annotations
+
+from typing import Any
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+
+from .const import DESC
+
+# The description njsPC uses for the heat mode that turns the heater off.
+HEAT_MODE_OFF = "off"
+
+
+class ModeTable:
+    """Read only map between the njsPC values and the descriptions of a table"""
+
+    __slots__ = ("forward", "reverse", "names", "off", "on")
+
+    def __init__(self, entries: tuple[tuple[Any, str], ...]) -> None:
+        self.forward: Mapping[Any, str] = MappingProxyType(dict(entries))
+        # The first value wins when njsPC gives two values the same description.
+        reverse: dict[str, Any] = {}
+        for val, desc in entries:
+            reverse.setdefault(desc, val)
+        self.reverse: Mapping[str, Any] = MappingProxyType(reverse)
+        self.names: tuple[str, ...] = tuple(self.forward.values())
+        self.off = next(
+            (val for val, desc in entries if desc.lower() == HEAT_MODE_OFF), None
+        )
+        self.on = next(
+            (val for val, desc in entries if desc.lower() != HEAT_MODE_OFF), None
+        )
+
+    def __len__(self) -> int:
+        return len(self.forward)
+
+    def __contains__(self, val: Any) -> bool:
+        return val in self.forward
+
+    def name(self, val: Any) -> str | None:
+        """Description of a value"""
+        return self.forward.get(val)
+
+    def value(self, name: str) -> Any:
+        """Value of a description"""
+        return self.reverse.get(name)
+
+
+class ModeTables:
+    """Interns the tables so equipment with the same table shares one copy"""
+
+    def __init__(self) -> None:
+        self._tables: dict[tuple[tuple[Any, str], ...], ModeTable] = {}
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def get(self, modes: Iterable[Mapping[str, Any]]) -> ModeTable:
+        """The shared table for a list of njsPC values"""
+        entries = tuple((mode["val"], mode[DESC]) for mode in modes)
+        if entries not in self._tables:
+            self._tables[entries] = ModeTable(entries)
+        return self._tables[entries]
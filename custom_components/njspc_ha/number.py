@@ -1,15 +1,30 @@
 """Number platform for njsPC-HA"""
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Any
 
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, Platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.components.number import NumberEntity, NumberMode
 
-from .const import DOMAIN, POOL_SETPOINT, SPA_SETPOINT, SUPER_CHLOR_HOURS
-from .chemistry import (
-    ChlorinatorSetpoint,
-    SuperChlorHours,
-    ChemControllerSetpoint,
-    ChemControllerIndex,
+from .coordinator import NjsPCHAdata
+from .entity import PoolEquipmentEntity
+from .const import (
+    PoolEquipmentClass,
+    API_CHEM_CONTROLLER_SETPOINT,
+    API_CHLORINATOR_POOL_SETPOINT,
+    API_CHLORINATOR_SPA_SETPOINT,
+    API_CONFIG_CHLORINATOR,
+    DOMAIN,
+    EVENT_AVAILABILITY,
+    EVENT_CHEM_CONTROLLER,
+    EVENT_CHLORINATOR,
+    POOL_SETPOINT,
+    SPA_SETPOINT,
+    SUPER_CHLOR_HOURS,
 )
 
 
@@ -19,6 +34,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add sensors for passed config_entry in HA."""
+    started = perf_counter()
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     config = coordinator.api.get_config()
@@ -99,3 +115,373 @@ async def async_setup_entry(
             pass
     if new_devices:
         async_add_entities(new_devices)
+    coordinator.metrics.record_setup(Platform.NUMBER, perf_counter() - started)
+
+
+class ChemControllerSetpoint(PoolEquipmentEntity, NumberEntity):
+    """Chemistry setpoint for ORP or pH"""
+    def __init__(
+        self, coordinator: NjsPCHAdata, chem_controller, chem_type: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHEM_CONTROLLER, data=chem_controller)
+        self.chem_type = chem_type
+        self.coordinator_context = object()
+        self._state_attributes: dict[str, Any] = dict([])
+        self._value = None
+        self._available = True
+        if self.chem_type in chem_controller and chem_controller[self.chem_type]["setpoint"]:
+            self._value = chem_controller[self.chem_type]["setpoint"]
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_CHEM_CONTROLLER
+            and self.coordinator.data["id"] == self.equipment_id
+            and self.chem_type in self.coordinator.data
+        ):
+            if "setpoint" in self.coordinator.data[self.chem_type]:
+                self._value = self.coordinator.data[self.chem_type]["setpoint"]
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Update the current value."""
+        new_value = value
+        if self.chem_type == "orp":
+            new_value = int(value)
+        data = {"id": self.equipment_id, self.chem_type: {"setpoint": new_value}}
+        await self.coordinator.api.command(url=API_CHEM_CONTROLLER_SETPOINT, data=data)
+
+    @property
+    def mode(self) -> NumberMode:
+        return NumberMode.BOX
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        """Name of the Setpoint"""
+        name = "ORP" if self.chem_type == "orp" else "pH"
+        return f"{name} Setpoint"
+
+    @property
+    def unique_id(self) -> str:
+        """ID of the setpoint"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_{self.chem_type}_setpoint"
+
+    @property
+    def icon(self) -> str:
+        return "mdi:creation"
+
+    @property
+    def native_value(self):
+        """value"""
+        return self._value
+
+    @property
+    def native_step(self) -> float:
+        match(self.chem_type):
+            case "ph":
+                return .1
+            case "orp":
+                return 10
+        return 0
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        return "mV" if self.chem_type == "orp" else None
+
+    @property
+    def native_min_value(self) -> float:
+        match(self.chem_type):
+            case "ph":
+                return 6.8
+            case "orp":
+                return 400
+        return 0
+
+    @property
+    def native_max_value(self) -> float:
+        match(self.chem_type):
+            case "ph":
+                return 8.0
+            case "orp":
+                return 800
+        return 1000
+
+
+class ChemControllerIndex(PoolEquipmentEntity, NumberEntity):
+    """Index values for Chem Controllers"""
+    def __init__(
+        self, coordinator: NjsPCHAdata, chem_controller, index_name: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHEM_CONTROLLER, data=chem_controller)
+        self.index_name = index_name
+        self.coordinator_context = object()
+        self._attr_entity_registry_enabled_default = False
+        self._state_attributes: dict[str, Any] = dict([])
+        self._value = None
+        self._available = True
+        if self.index_name in chem_controller:
+            self._value = chem_controller[self.index_name]
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_CHEM_CONTROLLER
+            and self.coordinator.data["id"] == self.equipment_id
+            and self.index_name in self.coordinator.data
+        ):
+            self._value = self.coordinator.data[self.index_name]
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Update the current value."""
+        new_value = int(value)
+        data = {"id": self.equipment_id, self.index_name: new_value}
+        await self.coordinator.api.command(url=API_CHEM_CONTROLLER_SETPOINT, data=data)
+
+    @property
+    def mode(self) -> NumberMode:
+        return NumberMode.BOX
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        """Name of the Setpoint"""
+        match(self.index_name):
+            case "calciumHardness":
+                return "Calcium Hardness"
+            case "borates":
+                return "Borates"
+            case "cyanuricAcid":
+                return "Cyanuric Acid"
+            case "alkalinity":
+                return "Total Alkalinity"
+            case _:
+                return self.index_name
+
+    @property
+    def unique_id(self) -> str:
+        """ID of the setpoint"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_{self.index_name}_setpoint"
+
+    @property
+    def icon(self) -> str:
+        return "mdi:test-tube"
+
+    @property
+    def native_value(self):
+        """value"""
+        return self._value
+
+    @property
+    def native_step(self) -> int:
+        return 1
+
+    @property
+    def native_min_value(self) -> int:
+        match(self.index_name):
+            case "borates":
+                return 0
+            case "calciumHardness":
+                return 25
+            case "alkalinity":
+                return 25
+            case "cyanuricAcid":
+                return 0
+        return 0
+
+    @property
+    def native_max_value(self) -> int:
+        match(self.index_name):
+            case "borates":
+                return 201
+            case "calciumHardness":
+                return 800
+            case "alkalinity":
+                return 800
+            case "cyanuricAcid":
+                return 201
+        return 0
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        return "ppm"
+
+
+class ChlorinatorSetpoint(PoolEquipmentEntity, NumberEntity):
+    """Number for setting SWG Setpoint in njsPC-HA."""
+
+    def __init__(self, coordinator:NjsPCHAdata, chlorinator: Any, setpoint) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHLORINATOR, data=chlorinator)
+        self._type = setpoint
+        self._available = True
+        self._value = None
+        if setpoint in chlorinator:
+            self._value = chlorinator[setpoint]
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_CHLORINATOR
+            and self.coordinator.data["id"] == self.equipment_id
+        ):
+            if self._type in self.coordinator.data:
+                self._value = self.coordinator.data[self._type]
+                self._available = True
+            else:
+                self._available = False
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Update the current value."""
+        new_value = int(value)
+        data = {"id": self.equipment_id, "setPoint": new_value}
+        if self._type == POOL_SETPOINT:
+            await self.coordinator.api.command(url=API_CHLORINATOR_POOL_SETPOINT, data=data)
+        else:
+            await self.coordinator.api.command(url=API_CHLORINATOR_SPA_SETPOINT, data=data)
+
+    @property
+    def mode(self) -> NumberMode:
+        return NumberMode.AUTO
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        """Name of the sensor"""
+        name = "Pool" if self._type == POOL_SETPOINT else "Spa"
+        return f"{name} Setpoint"
+
+    @property
+    def unique_id(self) -> str:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_{self._type}setpoint"
+
+    @property
+    def icon(self) -> str:
+        return "mdi:creation"
+
+    @property
+    def native_value(self):
+        """value"""
+        return self._value
+
+    @property
+    def native_step(self) -> int:
+        return 1
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        return PERCENTAGE
+
+
+class SuperChlorHours(PoolEquipmentEntity, NumberEntity):
+    """Number for setting SWG SuperChlorinate Hours in njsPC-HA."""
+
+    def __init__(self, coordinator:NjsPCHAdata, chlorinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHLORINATOR, data=chlorinator)
+        self._value = None
+        if SUPER_CHLOR_HOURS in chlorinator:
+            self._value = chlorinator[SUPER_CHLOR_HOURS]
+        self._available = True
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_CHLORINATOR
+            and self.coordinator.data["id"] == self.equipment_id
+        ):
+            if SUPER_CHLOR_HOURS in self.coordinator.data:
+                self._value = self.coordinator.data[SUPER_CHLOR_HOURS]
+                self._available = True
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Update the current value."""
+        new_value = int(value)
+        data = {"id": self.equipment_id, "superChlorHours": new_value}
+        await self.coordinator.api.command(url=API_CONFIG_CHLORINATOR, data=data)
+
+    @property
+    def mode(self) -> NumberMode:
+        return NumberMode.AUTO
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        """Name of the sensor"""
+        return "SuperChlor Hours"
+
+    @property
+    def unique_id(self) -> str:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_superchlor_hours"
+
+    @property
+    def icon(self) -> str:
+        return "mdi:timer"
+
+    @property
+    def native_value(self) -> int:
+        """value"""
+        return self._value
+
+    @property
+    def native_step(self) -> int:
+        return 1
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        return "H"
+
+    @property
+    def native_min_value(self) -> int:
+        return 1
+
+    @property
+    def native_max_value(self) -> int:
+        return 24
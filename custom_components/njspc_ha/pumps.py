@@ -3,22 +3,22 @@ from __future__ import annotations
 
 from typing import Any
 from collections.abc import Mapping
+from datetime import datetime, timedelta
+from time import monotonic
 import math
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorEntity,
     SensorStateClass,
     SensorDeviceClass,
 )
-from homeassistant.const import UnitOfPower
-
-from .entity import PoolEquipmentEntity, NjsPCHAdata
-
-from homeassistant.components.binary_sensor import (
-    BinarySensorEntity,
-)
-
+from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.helpers.event import async_track_time_interval
 
+from .analytics import estimate_flow, estimate_head
+from .coordinator import NjsPCHAdata
+from .entity import PoolEquipmentEntity
 from .const import (
     RPM,
     EVENT_PUMP,
@@ -27,9 +27,40 @@ from .const import (
     FLOW,
     MIN_FLOW,
     MAX_FLOW,
+    CONF_PUMP_RATED_FLOW,
+    DEADBAND_FLOW,
+    DEADBAND_POWER,
+    DEADBAND_SPEED,
     PoolEquipmentClass,
 )
 
+# How often the energy sensors write their accumulated total.
+ENERGY_WRITE_INTERVAL = timedelta(minutes=5)
+
+
+class WattsIntegrator:
+    """Integrates a stream of watts readings into kWh"""
+
+    # njsPC only sends the watts when they change so each reading is held
+    # until the next one arrives.
+    def __init__(self, kwh: float = 0) -> None:
+        self.kwh = kwh
+        self._watts: float | None = None
+        self._at = 0.0
+
+    def update(self, watts: float | None, now: float) -> None:
+        """Account for the previous reading and start on the new one"""
+        self.kwh = self.value_at(now)
+        self._watts = watts
+        self._at = now
+
+    def value_at(self, now: float) -> float:
+        """Total energy including the current reading up to now"""
+        if self._watts is None:
+            return self.kwh
+        return self.kwh + self._watts * (now - self._at) / 3600000
+
+
 class PumpProgramSensor(PoolEquipmentEntity, SensorEntity):
     """Program Pump Sensor for njsPC-HA"""
 
@@ -113,7 +144,6 @@ class PumpProgramSensor(PoolEquipmentEntity, SensorEntity):
         return "mdi:speedometer"
 
 
-
 class PumpSpeedSensor(PoolEquipmentEntity, SensorEntity):
     """RPM Pump Sensor for njsPC-HA"""
 
@@ -148,7 +178,7 @@ class PumpSpeedSensor(PoolEquipmentEntity, SensorEntity):
             else:
                 self._available = False
                 self._value = None
-            self.async_write_ha_state()
+            self.async_write_significant_state(DEADBAND_SPEED, self._value)
         elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
             self._available = self.coordinator.data["available"]
             self.async_write_ha_state()
@@ -223,7 +253,7 @@ class PumpPowerSensor(PoolEquipmentEntity, SensorEntity):
             in self.coordinator.data  # make sure the data we are looking for is in the coordinator data
         ):
             self._value = self.coordinator.data[WATTS]
-            self.async_write_ha_state()
+            self.async_write_significant_state(DEADBAND_POWER, self._value)
         elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
             self._available = self.coordinator.data["available"]
             self.async_write_ha_state()
@@ -348,8 +378,15 @@ class PumpFlowSensor(PoolEquipmentEntity, SensorEntity):
         return self._state_attributes
 
 
-class PumpOnSensor(PoolEquipmentEntity, BinarySensorEntity):
-    """The current running state for a pump"""
+class PumpEstimatedFlowSensor(PoolEquipmentEntity, SensorEntity):
+    """Estimated flow for a variable speed pump"""
+
+    # The coordinator refits the flow models in the background and this only
+    # evaluates them.  The pump's own model is preferred, then the model pooled
+    # from every pump that reports flow and finally the affinity law scaled
+    # from the maximum speed of the pump type and its maximum flow or, for the
+    # pump types that do not have one, the rated flow from the options.
+    _volatile_attributes = ("estimated_head_ft",)
 
     def __init__(self, coordinator: NjsPCHAdata, pump: Any) -> None:
         """Initialize the sensor."""
@@ -358,16 +395,16 @@ class PumpOnSensor(PoolEquipmentEntity, BinarySensorEntity):
             equipment_class=PoolEquipmentClass.PUMP,
             data=pump,
         )
-        self._value = None
-        if "relay" in pump:
-            self._value = pump["relay"] > 0
-        elif "command" in pump:
-            self._value = pump["command"] == 10
-        else:
-            self._value = False
+        self._rpm = pump.get(RPM)
+        self._watts = pump.get(WATTS)
+        self._max_flow = pump["type"].get("maxFlow") or coordinator.entry.options.get(
+            CONF_PUMP_RATED_FLOW
+        )
+        self._max_speed = pump["type"].get("maxSpeed")
         self._available = True
-        self._attr_has_entity_name = True
-        self._attr_device_class = f"{self.equipment_name}_{self.equipment_class}_ison"
+        self._flow: float | None = None
+        self._model: str | None = None
+        self._update_estimate()
 
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -375,18 +412,36 @@ class PumpOnSensor(PoolEquipmentEntity, BinarySensorEntity):
             self.coordinator.data["event"] == EVENT_PUMP
             and self.coordinator.data["id"] == self.equipment_id
         ):
-            if "relay" in self.coordinator.data:
-                self._value = self.coordinator.data["relay"] > 0
-            elif "command" in self.coordinator.data:
-                self._value = self.coordinator.data["command"] == 10
-            else:
-                self._value = False
-            self._available = True
-            self.async_write_ha_state()
+            if RPM in self.coordinator.data:
+                self._rpm = self.coordinator.data[RPM]
+            if WATTS in self.coordinator.data:
+                self._watts = self.coordinator.data[WATTS]
+            self._update_estimate()
+            self.async_write_significant_state(DEADBAND_FLOW, self._flow)
         elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
             self._available = self.coordinator.data["available"]
             self.async_write_ha_state()
 
+    def _update_estimate(self) -> None:
+        """Estimate the flow from the latest speed and watts"""
+        flow, self._model = self._estimate()
+        self._flow = round(flow, 1) if flow is not None else None
+
+    def _estimate(self) -> tuple[float | None, str | None]:
+        """Estimated flow and the model it came from"""
+        if not self._rpm or self._rpm <= 0:
+            return 0, None
+        if self._watts is not None:
+            if self.equipment_id in self.coordinator.flow_models:
+                model = self.coordinator.flow_models[self.equipment_id]
+                return estimate_flow(model, self._rpm, self._watts), "pump"
+            if None in self.coordinator.flow_models:
+                model = self.coordinator.flow_models[None]
+                return estimate_flow(model, self._rpm, self._watts), "pooled"
+        if self._max_flow and self._max_speed:
+            return self._max_flow * self._rpm / self._max_speed, "affinity"
+        return None, None
+
     @property
     def should_poll(self) -> bool:
         return False
@@ -396,27 +451,222 @@ class PumpOnSensor(PoolEquipmentEntity, BinarySensorEntity):
         return self._available
 
     @property
-    def name(self) -> str | None:
+    def name(self) -> str:
         """Name of the sensor"""
-        return "Running State"
+        return "Estimated Flow"
 
     @property
-    def unique_id(self) -> str | None:
+    def unique_id(self) -> str:
         """ID of the sensor"""
-        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_ison"
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_estimatedflow"
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        """State class of the sensor"""
+        return SensorStateClass.MEASUREMENT
 
     @property
-    def native_value(self) -> bool | None:
+    def native_value(self) -> float | None:
         """Raw value of the sensor"""
-        return self._value
+        return self._flow
 
     @property
-    def is_on(self) -> bool:
-        """Return if the pump is running."""
-        return self._value
+    def native_unit_of_measurement(self) -> str:
+        """Unit of measurement of the sensor"""
+        return "gpm"
 
     @property
     def icon(self) -> str:
-        if self._value is True:
-            return "mdi:pump"
-        return "mdi:pump-off"
+        return "mdi:pump"
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return entity specific state attributes."""
+        head = None
+        if self._flow and self._watts:
+            head = estimate_head(self._flow, self._watts)
+        # The head moves with the watts so it is only refreshed with the flow.
+        return {
+            "model": self._model,
+            "estimated_head_ft": round(head) if head is not None else None,
+        }
+
+
+class PumpEnergySensor(PoolEquipmentEntity, RestoreSensor):
+    """Energy used by a pump for njsPC-HA"""
+
+    def __init__(self, coordinator: NjsPCHAdata, pump: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator,
+            equipment_class=PoolEquipmentClass.PUMP,
+            data=pump,
+        )
+        self._watts = pump.get(WATTS)
+        self._integrator = WattsIntegrator()
+        self._available = True
+        self._attr_device_class = f"{self.equipment_name}_{self.equipment_class}_energy"
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the total and start accumulating"""
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        if last is not None and last.native_value is not None:
+            self._integrator.kwh = float(last.native_value)
+        self._integrator.update(self._watts, monotonic())
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_write_energy, ENERGY_WRITE_INTERVAL
+            )
+        )
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_PUMP
+            and self.coordinator.data["id"] == self.equipment_id
+            and WATTS in self.coordinator.data
+        ):
+            # Accumulate only.  The total is written on a fixed interval.
+            self._watts = self.coordinator.data[WATTS]
+            self._integrator.update(self._watts, monotonic())
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            # We do not know what the pump is doing while disconnected.  Once
+            # reconnected carry on from the last watts until a new reading.
+            self._integrator.update(
+                self._watts if self._available else None, monotonic()
+            )
+            self.async_write_ha_state()
+
+    async def _async_write_energy(self, now: datetime) -> None:
+        """Write the accumulated energy"""
+        self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        """Name of the sensor"""
+        return "Energy"
+
+    @property
+    def unique_id(self) -> str:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_energy"
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        """State class of the sensor"""
+        return SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self) -> float:
+        """Raw value of the sensor"""
+        return round(self._integrator.value_at(monotonic()), 3)
+
+    @property
+    def device_class(self) -> SensorDeviceClass:
+        """The sensor device class for the sensor"""
+        return SensorDeviceClass.ENERGY
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        return UnitOfEnergy.KILO_WATT_HOUR
+
+
+class PumpTotalEnergySensor(PoolEquipmentEntity, RestoreSensor):
+    """Energy used by all pumps for njsPC-HA"""
+
+    def __init__(self, coordinator: NjsPCHAdata, pumps: list[Any]) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator,
+            equipment_class=PoolEquipmentClass.CONTROL_PANEL,
+            data={"model": coordinator.model},
+        )
+        self._pump_watts: dict[int, float] = {}
+        for pump in pumps:
+            self._pump_watts[pump["id"]] = pump.get(WATTS) or 0
+        self._total_watts = sum(self._pump_watts.values())
+        self._integrator = WattsIntegrator()
+        self._available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the total and start accumulating"""
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        if last is not None and last.native_value is not None:
+            self._integrator.kwh = float(last.native_value)
+        self._integrator.update(self._total_watts, monotonic())
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_write_energy, ENERGY_WRITE_INTERVAL
+            )
+        )
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_PUMP
+            and self.coordinator.data["id"] in self._pump_watts
+            and WATTS in self.coordinator.data
+        ):
+            watts = self.coordinator.data[WATTS] or 0
+            pump_id = self.coordinator.data["id"]
+            self._total_watts += watts - self._pump_watts[pump_id]
+            self._pump_watts[pump_id] = watts
+            self._integrator.update(self._total_watts, monotonic())
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self._integrator.update(
+                self._total_watts if self._available else None, monotonic()
+            )
+            self.async_write_ha_state()
+
+    async def _async_write_energy(self, now: datetime) -> None:
+        """Write the accumulated energy"""
+        self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        """Name of the sensor"""
+        return "Pump Energy"
+
+    @property
+    def unique_id(self) -> str:
+        """ID of the sensor"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_pump_energy"
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        """State class of the sensor"""
+        return SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self) -> float:
+        """Raw value of the sensor"""
+        return round(self._integrator.value_at(monotonic()), 3)
+
+    @property
+    def device_class(self) -> SensorDeviceClass:
+        """The sensor device class for the sensor"""
+        return SensorDeviceClass.ENERGY
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        return UnitOfEnergy.KILO_WATT_HOUR
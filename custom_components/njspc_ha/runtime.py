@@ -0,0 +1,217 @@
+"""Runtime counters for njsPC-HA"""
+from __future__ import annotations
+
+from typing import Any
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import monotonic
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorStateClass,
+    SensorDeviceClass,
+)
+from homeassistant.const import UnitOfTime
+from homeassistant.helpers.event import (
+    async_track_time_change,
+    async_track_time_interval,
+)
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
+from homeassistant.util import dt as dt_util
+
+from .entity import PoolEquipmentEntity
+from .coordinator import NjsPCHAdata
+from .const import PoolEquipmentClass, EVENT_AVAILABILITY
+
+# How often a running counter writes its accumulated time.
+RUNTIME_WRITE_INTERVAL = timedelta(minutes=5)
+
+
+@dataclass
+class RuntimeStoredData(ExtraStoredData):
+    """Runtime counters kept across restarts"""
+
+    today: float
+    lifetime: float
+    last_reset: datetime
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the counters."""
+        return {
+            "today": self.today,
+            "lifetime": self.lifetime,
+            "last_reset": self.last_reset.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> RuntimeStoredData | None:
+        """Initialize the counters from a dict."""
+        try:
+            last_reset = dt_util.parse_datetime(restored["last_reset"])
+            if last_reset is None:
+                return None
+            return cls(float(restored["today"]), float(restored["lifetime"]), last_reset)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+class RuntimeSensor(PoolEquipmentEntity, SensorEntity, RestoreEntity):
+    """Daily and lifetime on-time for a piece of equipment"""
+
+    # The state is the hours on today and resets at midnight.  The lifetime
+    # hours are kept as an attribute and both are restored after a restart
+    # so there is nothing to query from the recorder.
+    def __init__(
+        self,
+        coordinator: NjsPCHAdata,
+        equipment_class: PoolEquipmentClass,
+        data: Any,
+        event: str,
+        is_on: Callable[[Mapping[str, Any]], bool | None],
+        key: str = "",
+        event_id: int | None = None,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator, equipment_class=equipment_class, data=data
+        )
+        self._event = event
+        self._event_id = event_id if event_id is not None else self.equipment_id
+        self._is_on_func = is_on
+        self._key = key
+        self._is_on = bool(is_on(data))
+        self._on_since: float | None = None
+        self._today = 0.0
+        self._lifetime = 0.0
+        self._last_reset = dt_util.start_of_local_day()
+        self._available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the counters and start the timers"""
+        await super().async_added_to_hass()
+        if (last := await self.async_get_last_extra_data()) is not None and (
+            restored := RuntimeStoredData.from_dict(last.as_dict())
+        ) is not None:
+            self._lifetime = restored.lifetime
+            if restored.last_reset >= self._last_reset:
+                self._today = restored.today
+        if self._is_on:
+            self._on_since = monotonic()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_write_running, RUNTIME_WRITE_INTERVAL
+            )
+        )
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._async_reset_today, hour=0, minute=0, second=0
+            )
+        )
+
+    def _accumulate(self) -> None:
+        """Add the time on since the last accumulation"""
+        if self._on_since is not None:
+            now = monotonic()
+            self._today += now - self._on_since
+            self._lifetime += now - self._on_since
+            self._on_since = now
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == self._event
+            and self.coordinator.data["id"] == self._event_id
+        ):
+            is_on = self._is_on_func(self.coordinator.data)
+            if is_on is None or is_on == self._is_on:
+                return
+            self._accumulate()
+            self._is_on = is_on
+            self._on_since = monotonic() if is_on and self._available else None
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            # Stop counting while we cannot see the equipment.
+            self._accumulate()
+            self._available = self.coordinator.data["available"]
+            self._on_since = monotonic() if self._is_on and self._available else None
+            self.async_write_ha_state()
+
+    async def _async_write_running(self, now: datetime) -> None:
+        """Write the counter while the equipment is running"""
+        if self._on_since is not None:
+            self._accumulate()
+            self.async_write_ha_state()
+
+    async def _async_reset_today(self, now: datetime) -> None:
+        """Start a new day"""
+        self._accumulate()
+        self._today = 0.0
+        self._last_reset = dt_util.start_of_local_day()
+        self.async_write_ha_state()
+
+    @property
+    def extra_restore_state_data(self) -> RuntimeStoredData:
+        """Counters to keep across restarts"""
+        running = 0.0
+        if self._on_since is not None:
+            running = monotonic() - self._on_since
+        return RuntimeStoredData(
+            self._today + running, self._lifetime + running, self._last_reset
+        )
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        """Name of the sensor"""
+        if self._key:
+            return f"{self._key.capitalize()} Runtime Today"
+        return "Runtime Today"
+
+    @property
+    def unique_id(self) -> str:
+        """ID of the sensor"""
+        if self._key:
+            return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_{self._key}_runtime"
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_runtime"
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        """State class of the sensor"""
+        return SensorStateClass.TOTAL
+
+    @property
+    def last_reset(self) -> datetime:
+        """When the daily counter was last reset"""
+        return self._last_reset
+
+    @property
+    def device_class(self) -> SensorDeviceClass:
+        """The sensor device class for the sensor"""
+        return SensorDeviceClass.DURATION
+
+    @property
+    def native_value(self) -> float:
+        """Raw value of the sensor"""
+        return round(self._today / 3600, 3)
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        return UnitOfTime.HOURS
+
+    @property
+    def icon(self) -> str:
+        return "mdi:timer-outline"
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return entity specific state attributes."""
+        # The last reset attribute is added by the sensor entity.
+        return {"lifetime_hours": round(self._lifetime / 3600, 3)}
@@ -3,170 +3,65 @@ from __future__ import annotations
 
 from typing import Any
 from collections.abc import Mapping
+from datetime import datetime
 
 
-from homeassistant.components.switch import SwitchEntity
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
 
 
 from .entity import PoolEquipmentEntity
-from .__init__ import NjsPCHAdata
+from .coordinator import NjsPCHAdata
 from .const import (
     PoolEquipmentClass,
-    EVENT_SCHEDULE,
     EVENT_AVAILABILITY,
-    API_CONFIG_SCHEDULE,
 )
+from .timeline import schedule_key
 
-DAY_ABBREVIATIONS = {
-    "sun": "U",
-    "sat": "S",
-    "fri": "F",
-    "thu": "H",
-    "wed": "W",
-    "tue": "T",
-    "mon": "M",
-}
 
-
-class ScheduleSwitch(PoolEquipmentEntity, SwitchEntity):
-    """Schedule switch for njsPC-HA"""
+class ScheduleNextRunSensor(PoolEquipmentEntity, SensorEntity):
+    """Next time the schedules turn a circuit on"""
 
     def __init__(
         self,
         coordinator: NjsPCHAdata,
         equipment_class: PoolEquipmentClass,
         schedule,
-        clockMode: int = 12,
         body=None,
     ) -> None:
-        """Initialize the switch."""
+        """Initialize the sensor."""
         data = schedule["circuit"]
         if body is not None:
-            # change it over to body if provided
             data = body
         super().__init__(
             coordinator=coordinator,
             equipment_class=equipment_class,
             data=data,
         )
-
+        self._key = schedule_key(schedule)
         self._available = True
-        self._value = False
-        self._clock_mode = clockMode
-
-        self._attr_has_entity_name = False
-        self.schedule_id = schedule["id"]
-        self.schedule_name = schedule["circuit"]["name"]
-        if "disabled" in schedule:
-            self._value = schedule["disabled"]
-
-        self._state_attributes: dict[str, Any] = dict([])
-        if "scheduleDays" in schedule:
-            self._state_attributes["days"] = self.format_schedule_days(
-                schedule_days=schedule["scheduleDays"]
-            )
-        if "startTime" in schedule and "startTimeType" in schedule:
-            self._state_attributes["start_time"] = self.format_start_stop_times(
-                time=schedule["startTime"], time_type=schedule["startTimeType"]["val"]
-            )
-        if "endTime" in schedule and "endTimeType" in schedule:
-            self._state_attributes["end_time"] = self.format_start_stop_times(
-                time=schedule["endTime"], time_type=schedule["endTimeType"]["val"]
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the schedule index"""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.schedule_index.async_add_listener(
+                self._handle_schedule_index_update
             )
+        )
+
+    @callback
+    def _handle_schedule_index_update(self) -> None:
+        """Handle a change to the schedule runs."""
+        self.async_write_ha_state()
 
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if (
-            self.coordinator.data["event"] == EVENT_SCHEDULE
-            and self.coordinator.data["id"] == self.schedule_id
-        ):
-            if "disabled" in self.coordinator.data:
-                self._value = self.coordinator.data["disabled"]
-            else:
-                self._value = False
-            if (
-                "circuit" in self.coordinator.data
-                and "name" in self.coordinator.data["circuit"]
-            ):
-                self.schedule_name = self.coordinator.data["circuit"]["name"]
-
-            if (
-                "startTime" in self.coordinator.data
-                and "startTimeType" in self.coordinator.data
-            ):
-                self._state_attributes["start_time"] = self.format_start_stop_times(
-                    time=self.coordinator.data["startTime"],
-                    time_type=self.coordinator.data["startTimeType"]["val"],
-                )
-            if (
-                "endTime" in self.coordinator.data
-                and "endTimeType" in self.coordinator.data
-            ):
-                self._state_attributes["end_time"] = self.format_start_stop_times(
-                    time=self.coordinator.data["endTime"],
-                    time_type=self.coordinator.data["endTimeType"]["val"],
-                )
-            if "scheduleDays" in self.coordinator.data:
-                self._state_attributes["days"] = self.format_schedule_days(
-                    schedule_days=self.coordinator.data["scheduleDays"]
-                )
-            self.async_write_ha_state()
-        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+        if self.coordinator.data["event"] == EVENT_AVAILABILITY:
             self._available = self.coordinator.data["available"]
             self.async_write_ha_state()
 
-    async def async_turn_on(self, **kwargs: Any) -> None:
-        """Turn the entity on."""
-        data = {"id": self.schedule_id, "disabled": False}
-        await self.coordinator.api.command(url=API_CONFIG_SCHEDULE, data=data)
-
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        """Turn the entity on."""
-        data = {"id": self.schedule_id, "disabled": True}
-        await self.coordinator.api.command(url=API_CONFIG_SCHEDULE, data=data)
-
-    def format_start_stop_times(self, time: int, time_type: int) -> str:
-        """Format the minutes time to human readable"""
-        formatted = ""
-        if time_type == 1:
-            return "Sunrise"
-        elif time_type == 2:
-            return "Sunset"
-        elif time_type == 0:
-            hrs = time // 60
-            mins = time - (hrs * 60)
-            if self._clock_mode == 24:
-                formatted = f"{hrs:02}:{mins:02}"
-            else:
-                ampm = "am"
-                if hrs > 12:
-                    hrs = hrs - 12
-                    ampm = "pm"
-                formatted = f"{hrs}:{mins:02} {ampm}"
-        else:
-            formatted = "Unknown"
-        return formatted
-
-    def format_schedule_days(self, schedule_days) -> str:
-        """Format the scheduled days into a string"""
-        formatted = ""
-        if schedule_days["val"] == 127:
-            formatted = "Every Day"
-        elif schedule_days["val"] == 31:
-            formatted = "Weekdays"
-        elif schedule_days["val"] == 96:
-            formatted = "Weekends"
-        else:
-            day_list = []
-            idx = 0
-            for day in schedule_days["days"]:
-                if day["name"] == "sun":
-                    # we need to change the insert index if Sunday is in the list so that it stays at the beginning
-                    idx = 1
-                day_list.insert(idx, DAY_ABBREVIATIONS[day["name"]])
-            formatted = "-".join(day_list)
-        return formatted
-
     @property
     def should_poll(self) -> bool:
         return False
@@ -177,26 +72,113 @@ class ScheduleSwitch(PoolEquipmentEntity, SwitchEntity):
 
     @property
     def name(self) -> str:
-        return f"{self.schedule_name} Schedule"
+        return "Next Scheduled Run"
 
     @property
     def unique_id(self) -> str:
         """Set unique device_id"""
-        return f"{self.coordinator.controller_id}_schedule_{self.schedule_id}_disabled"
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_next_run"
 
     @property
-    def is_on(self) -> bool:
-        return not self._value
+    def device_class(self) -> SensorDeviceClass:
+        return SensorDeviceClass.TIMESTAMP
+
+    @property
+    def native_value(self) -> datetime | None:
+        next_on, _, _ = self.coordinator.schedule_index.circuit_runs(
+            self._key, dt_util.utcnow()
+        )
+        return next_on
 
     @property
     def icon(self) -> str:
-        if self._value:
-            return "mdi:calendar-remove"
-        else:
-            return "mdi:calendar-clock"
+        return "mdi:calendar-arrow-right"
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return entity specific state attributes."""
+        _, next_off, running = self.coordinator.schedule_index.circuit_runs(
+            self._key, dt_util.utcnow()
+        )
+        return {
+            "next_off": next_off.isoformat() if next_off is not None else None,
+            "running": running,
+        }
+
 
-        return self._state_attributes
+class NextScheduledEventSensor(PoolEquipmentEntity, SensorEntity):
+    """Next time any schedule turns something on or off"""
+
+    def __init__(self, coordinator: NjsPCHAdata, data: Any) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator,
+            equipment_class=PoolEquipmentClass.CONTROL_PANEL,
+            data=data,
+        )
+        self._available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the schedule index"""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.schedule_index.async_add_listener(
+                self._handle_schedule_index_update
+            )
+        )
+
+    @callback
+    def _handle_schedule_index_update(self) -> None:
+        """Handle a change to the schedule runs."""
+        self.async_write_ha_state()
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        return "Next Scheduled Event"
+
+    @property
+    def unique_id(self) -> str:
+        """Set unique device_id"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_next_scheduled_event"
+
+    @property
+    def device_class(self) -> SensorDeviceClass:
+        return SensorDeviceClass.TIMESTAMP
+
+    @property
+    def native_value(self) -> datetime | None:
+        boundary = self.coordinator.schedule_index.next_boundary(dt_util.utcnow())
+        return boundary[0] if boundary is not None else None
+
+    @property
+    def icon(self) -> str:
+        return "mdi:calendar-clock"
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return entity specific state attributes."""
+        index = self.coordinator.schedule_index
+        boundary = index.next_boundary(dt_util.utcnow())
+        if boundary is None:
+            return None
+        _, schedule_id, turns_on = boundary
+        schedule = index.schedules[schedule_id]
+        return {
+            "schedule_id": schedule_id,
+            "circuit": schedule.get("circuit", {}).get("name"),
+            "action": "on" if turns_on else "off",
+        }
@@ -1,14 +1,17 @@
 """Platform for sensor integration."""
 from __future__ import annotations
 
+from time import perf_counter
 from typing import Any
 
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.core import HomeAssistant
 
-from .entity import PoolEquipmentEntity, NjsPCHAdata
+from .coordinator import NjsPCHAdata
+from .entity import PoolEquipmentEntity
 
 from homeassistant.components.sensor import SensorEntity
 
@@ -16,6 +19,8 @@ from .chemistry import (
     ChemistryDemandSensor,
     ChemistrySensor,
     ChemistryTankLevel,
+    ChemistryTankDaysRemaining,
+    ChemistryTankEmptyDate,
     ChemistryDosingStatus,
     SaltSensor,
     SaltRequiredSensor,
@@ -24,23 +29,50 @@ from .chemistry import (
     TargetOutputSensor,
     SaturationIndexSensor,
 )
-from .pumps import PumpPowerSensor, PumpFlowSensor, PumpSpeedSensor, PumpProgramSensor
-from .controller import PanelModeSensor, TempProbeSensor
-from .bodies import BodyTempSensor, FilterPressureSensor, FilterCleanSensor, BodyCoveredSensor
+from .pumps import (
+    PumpPowerSensor,
+    PumpFlowSensor,
+    PumpEstimatedFlowSensor,
+    PumpSpeedSensor,
+    PumpProgramSensor,
+    PumpEnergySensor,
+    PumpTotalEnergySensor,
+)
+from .controller import ControllerAggregateSensor, PanelModeSensor, TempProbeSensor
+from .bodies import (
+    BodyTempSensor,
+    FilterPressureSensor,
+    FilterCleanSensor,
+    FilterPressureRiseSensor,
+    FilterCleaningDueSensor,
+    BodyTimeToSetpointSensor,
+)
+from .runtime import RuntimeSensor
+from .schedules import NextScheduledEventSensor, ScheduleNextRunSensor
+from .timeline import schedule_equipment, schedule_key
 from .const import (
+    AGGREGATE_CIRCUITS_ON,
+    AGGREGATE_HEATERS_ACTIVE,
+    AGGREGATE_PUMP_POWER,
     PoolEquipmentClass,
     PoolEquipmentModel,
     CURRENT_OUTPUT,
     DESC,
     DOMAIN,
     EVENT_AVAILABILITY,
+    EVENT_BODY,
     EVENT_CHLORINATOR,
+    EVENT_CIRCUIT,
+    EVENT_FEATURE,
+    EVENT_LIGHTGROUP,
     EVENT_PUMP,
     SALT_LEVEL,
     SALT_REQUIRED,
     SALT_TARGET,
     STATUS,
     TARGET_OUTPUT,
+    heater_is_firing,
+    pump_is_on,
 )
 
 
@@ -50,12 +82,15 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add sensors for past config_entry in HA."""
+    started = perf_counter()
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     new_devices = []
     config = coordinator.api.get_config()
 
     new_devices.append(PanelModeSensor(coordinator, config))
+    for key in (AGGREGATE_PUMP_POWER, AGGREGATE_CIRCUITS_ON, AGGREGATE_HEATERS_ACTIVE):
+        new_devices.append(ControllerAggregateSensor(coordinator, config, key))
     if "temps" in config:
         units = "F"
         if "units" in config["temps"]:
@@ -83,6 +118,97 @@ async def async_setup_entry(
                         BodyTempSensor(coordinator=coordinator, units=units, body=body)
                     )
 
+    # Runtime counters for the equipment that can be turned on
+    for circuit in config["circuits"]:
+        _body = None
+        equipment_class = PoolEquipmentClass.AUX_CIRCUIT
+        try:
+            if circuit["id"] == 1 or circuit["id"] == 6:
+                for body in config["temps"]["bodies"]:
+                    if body["circuit"] == circuit["id"]:
+                        _body = body
+                        equipment_class = PoolEquipmentClass.BODY
+            elif circuit["type"]["isLight"]:
+                equipment_class = PoolEquipmentClass.LIGHT
+        except KeyError:
+            pass
+        new_devices.append(
+            RuntimeSensor(
+                coordinator=coordinator,
+                equipment_class=equipment_class,
+                data=_body if _body is not None else circuit,
+                event=EVENT_CIRCUIT,
+                is_on=_circuit_is_on,
+                event_id=circuit["id"],
+            )
+        )
+    for feature in config["features"]:
+        new_devices.append(
+            RuntimeSensor(
+                coordinator=coordinator,
+                equipment_class=PoolEquipmentClass.FEATURE,
+                data=feature,
+                event=EVENT_FEATURE,
+                is_on=_circuit_is_on,
+            )
+        )
+    for group in config["lightGroups"]:
+        new_devices.append(
+            RuntimeSensor(
+                coordinator=coordinator,
+                equipment_class=PoolEquipmentClass.LIGHT_GROUP,
+                data=group,
+                event=EVENT_LIGHTGROUP,
+                is_on=_circuit_is_on,
+            )
+        )
+    for pump in config["pumps"]:
+        new_devices.append(
+            RuntimeSensor(
+                coordinator=coordinator,
+                equipment_class=PoolEquipmentClass.PUMP,
+                data=pump,
+                event=EVENT_PUMP,
+                is_on=pump_is_on,
+            )
+        )
+    if "bodies" in config["temps"]:
+        for body in config["temps"]["bodies"]:
+            if "heaterOptions" in body and body["heaterOptions"]["total"] > 0:
+                new_devices.append(
+                    RuntimeSensor(
+                        coordinator=coordinator,
+                        equipment_class=PoolEquipmentClass.BODY,
+                        data=body,
+                        event=EVENT_BODY,
+                        is_on=heater_is_firing,
+                        key="heater",
+                    )
+                )
+                new_devices.append(
+                    BodyTimeToSetpointSensor(coordinator=coordinator, body=body)
+                )
+
+    if config["schedules"]:
+        new_devices.append(NextScheduledEventSensor(coordinator, config))
+    scheduled = set()
+    for schedule in config["schedules"]:
+        # One sensor for each circuit no matter how many schedules run it.
+        key = schedule_key(schedule)
+        if key is None or key in scheduled:
+            continue
+        scheduled.add(key)
+        equipment_class, _body = schedule_equipment(config, schedule)
+        new_devices.append(
+            ScheduleNextRunSensor(
+                coordinator=coordinator,
+                equipment_class=equipment_class,
+                schedule=schedule,
+                body=_body,
+            )
+        )
+
+    metered_pumps = []
     for pump in config["pumps"]:
         # Pump sensors vary by type. This may need a re-visit for pump types that use a
         # number for their speed or High/Low.  Such are the dual speed, superflo, and relay pumps
@@ -90,6 +216,9 @@ async def async_setup_entry(
             pump_type = pump["type"]
             if "maxSpeed" in pump_type:
                 new_devices.append(PumpSpeedSensor(coordinator=coordinator, pump=pump))
+                new_devices.append(
+                    PumpEstimatedFlowSensor(coordinator=coordinator, pump=pump)
+                )
             if "maxFlow" in pump_type:
                 new_devices.append(PumpFlowSensor(coordinator=coordinator, pump=pump))
             if "relays" in pump_type:
@@ -97,6 +226,8 @@ async def async_setup_entry(
 
             if "maxSpeed" in pump_type or "maxFlow" in pump_type:
                 new_devices.append(PumpPowerSensor(coordinator=coordinator, pump=pump))
+                new_devices.append(PumpEnergySensor(coordinator=coordinator, pump=pump))
+                metered_pumps.append(pump)
             if STATUS in pump:
                 new_devices.append(
                     EquipmentStatusSensor(
@@ -107,6 +238,10 @@ async def async_setup_entry(
                         event=EVENT_PUMP,
                     )
                 )
+    if metered_pumps:
+        new_devices.append(
+            PumpTotalEnergySensor(coordinator=coordinator, pumps=metered_pumps)
+        )
     for chlorinator in config["chlorinators"]:
         if SALT_LEVEL in chlorinator:
             new_devices.append(
@@ -178,6 +313,20 @@ async def async_setup_entry(
                                 chemical=chemical,
                             )
                         )
+                        new_devices.append(
+                            ChemistryTankDaysRemaining(
+                                coordinator=coordinator,
+                                chem_controller=chem_controller,
+                                chemical=chemical,
+                            )
+                        )
+                        new_devices.append(
+                            ChemistryTankEmptyDate(
+                                coordinator=coordinator,
+                                chem_controller=chem_controller,
+                                chemical=chemical,
+                            )
+                        )
 
             if "orp" in chem_controller:
                 chemical = chem_controller["orp"]
@@ -216,6 +365,20 @@ async def async_setup_entry(
                                 chemical=chemical,
                             )
                         )
+                        new_devices.append(
+                            ChemistryTankDaysRemaining(
+                                coordinator=coordinator,
+                                chem_controller=chem_controller,
+                                chemical=chemical,
+                            )
+                        )
+                        new_devices.append(
+                            ChemistryTankEmptyDate(
+                                coordinator=coordinator,
+                                chem_controller=chem_controller,
+                                chemical=chemical,
+                            )
+                        )
             new_devices.append(
                 SaturationIndexSensor(
                     coordinator=coordinator,
@@ -237,9 +400,21 @@ async def async_setup_entry(
         new_devices.append(
             FilterCleanSensor(coordinator=coordinator, pool_filter=pool_filter)
         )
+        new_devices.append(
+            FilterPressureRiseSensor(coordinator=coordinator, pool_filter=pool_filter)
+        )
+        new_devices.append(
+            FilterCleaningDueSensor(coordinator=coordinator, pool_filter=pool_filter)
+        )
 
     if new_devices:
         async_add_entities(new_devices)
+    coordinator.metrics.record_setup(Platform.SENSOR, perf_counter() - started)
+
+
+def _circuit_is_on(circuit: Any) -> bool | None:
+    """Whether a circuit, feature or group is on, None when the event does not say"""
+    return circuit.get("isOn")
 
 
 class EquipmentStatusSensor(PoolEquipmentEntity, SensorEntity):
@@ -266,6 +441,7 @@ class EquipmentStatusSensor(PoolEquipmentEntity, SensorEntity):
         # Below makes sure we have a name that makes sense for the entity.
         self._attr_device_class = f"{self.equipment_name}_status"
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
 
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -0,0 +1,301 @@
+"""Services for njsPC-HA"""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    API_CIRCUIT_SETSTATE,
+    API_CIRCUITGROUP_SETSTATE,
+    API_FEATURE_SETSTATE,
+    API_LIGHTGROUP_SETSTATE,
+    API_PANEL_MODE,
+    DOMAIN,
+    SERVICE_APPLY_SCENE,
+    SERVICE_QUERY_TELEMETRY,
+    SERVICE_RESTORE_STATE,
+    SERVICE_SET_AUTO_MODE,
+    SERVICE_SET_SERVICE_MODE,
+    SERVICE_SET_STATES,
+    SERVICE_SNAPSHOT_STATE,
+    TELEMETRY_QUERY_LIMIT,
+)
+from .telemetry import TELEMETRY_TYPES
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_SETTING = "setting"
+ATTR_STATE = "state"
+ATTR_EQUIPMENT = "equipment"
+ATTR_TYPE = "type"
+ATTR_ID = "id"
+ATTR_NAME = "name"
+ATTR_FIELD = "field"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_LIMIT = "limit"
+
+DEFAULT_SNAPSHOT = "default"
+# How far back a telemetry query goes when no start is given.
+DEFAULT_QUERY_PERIOD = timedelta(hours=1)
+
+# Where each type of equipment is turned on and off.
+SET_STATE_URLS = {
+    "circuit": API_CIRCUIT_SETSTATE,
+    "feature": API_FEATURE_SETSTATE,
+    "circuitGroup": API_CIRCUITGROUP_SETSTATE,
+    "lightGroup": API_LIGHTGROUP_SETSTATE,
+}
+# Service fields for the set_states service and the type of equipment in each.
+SET_STATE_FIELDS = {
+    "circuits": "circuit",
+    "features": "feature",
+    "circuit_groups": "circuitGroup",
+    "light_groups": "lightGroup",
+}
+
+ENTRY_SCHEMA = {vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string}
+SERVICE_MODE_SCHEMA = vol.Schema(
+    {
+        **ENTRY_SCHEMA,
+        vol.Optional(ATTR_SETTING, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=59940)
+        ),
+    }
+)
+AUTO_MODE_SCHEMA = vol.Schema(ENTRY_SCHEMA)
+SET_STATES_SCHEMA = vol.Schema(
+    {
+        **ENTRY_SCHEMA,
+        vol.Required(ATTR_STATE): cv.boolean,
+        **{
+            vol.Optional(field, default=[]): vol.All(
+                cv.ensure_list, [vol.Coerce(int)]
+            )
+            for field in SET_STATE_FIELDS
+        },
+    }
+)
+APPLY_SCENE_SCHEMA = vol.Schema(
+    {
+        **ENTRY_SCHEMA,
+        vol.Required(ATTR_EQUIPMENT): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_TYPE): vol.In(SET_STATE_URLS),
+                        vol.Required(ATTR_ID): vol.Coerce(int),
+                        vol.Required(ATTR_STATE): cv.boolean,
+                    }
+                )
+            ],
+        ),
+    }
+)
+SNAPSHOT_SCHEMA = vol.Schema(
+    {**ENTRY_SCHEMA, vol.Optional(ATTR_NAME, default=DEFAULT_SNAPSHOT): cv.string}
+)
+QUERY_TELEMETRY_SCHEMA = vol.Schema(
+    {
+        **ENTRY_SCHEMA,
+        vol.Required(ATTR_TYPE): vol.In(TELEMETRY_TYPES),
+        vol.Optional(ATTR_ID): vol.Coerce(int),
+        vol.Optional(ATTR_FIELD): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_LIMIT, default=TELEMETRY_QUERY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=TELEMETRY_QUERY_LIMIT)
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services for all the config entries"""
+    if hass.services.has_service(DOMAIN, SERVICE_SET_SERVICE_MODE):
+        return
+
+    def _coordinators(call: ServiceCall) -> list[Any]:
+        """The coordinators a call is for"""
+        coordinators = hass.data.get(DOMAIN, {})
+        if ATTR_CONFIG_ENTRY_ID in call.data:
+            if call.data[ATTR_CONFIG_ENTRY_ID] not in coordinators:
+                raise HomeAssistantError(
+                    f"Unknown njsPC-HA config entry {call.data[ATTR_CONFIG_ENTRY_ID]}"
+                )
+            return [coordinators[call.data[ATTR_CONFIG_ENTRY_ID]]]
+        return list(coordinators.values())
+
+    def _apis(call: ServiceCall) -> list[Any]:
+        """The njsPC apis a call is for"""
+        return [coordinator.api for coordinator in _coordinators(call)]
+
+    def _equipment_apis(call: ServiceCall) -> list[Any]:
+        """The njsPC api a call with equipment ids is for"""
+        # Equipment ids are only unique within a controller.
+        if (
+            ATTR_CONFIG_ENTRY_ID not in call.data
+            and len(hass.data.get(DOMAIN, {})) > 1
+        ):
+            raise HomeAssistantError(
+                "config_entry_id is required when there is more than one njsPC controller"
+            )
+        return _apis(call)
+
+    async def _async_send(
+        call: ServiceCall, commands: list[tuple[str, Any]], apis: list[Any]
+    ) -> None:
+        """Send the commands to every njsPC the call is for"""
+        failed = 0
+        for api in apis:
+            results = await api.command_batch(commands)
+            failed += results.count(False)
+        if failed:
+            raise HomeAssistantError(f"{failed} njsPC commands failed")
+
+    async def async_set_service_mode(call: ServiceCall) -> None:
+        """Put the panel into service mode"""
+        await _async_send(
+            call,
+            [(API_PANEL_MODE, {"mode": "service", "timeout": call.data[ATTR_SETTING]})],
+            _apis(call),
+        )
+
+    async def async_set_auto_mode(call: ServiceCall) -> None:
+        """Put the panel back into auto mode"""
+        await _async_send(call, [(API_PANEL_MODE, {"mode": "auto"})], _apis(call))
+
+    async def async_set_states(call: ServiceCall) -> None:
+        """Turn a list of circuits, features and groups on or off"""
+        commands = [
+            (
+                SET_STATE_URLS[equipment_type],
+                {"id": equipment_id, "state": call.data[ATTR_STATE]},
+            )
+            for field, equipment_type in SET_STATE_FIELDS.items()
+            for equipment_id in call.data[field]
+        ]
+        await _async_send(call, commands, _equipment_apis(call))
+
+    async def async_apply_scene(call: ServiceCall) -> None:
+        """Set the state of several pieces of equipment at once"""
+        commands = [
+            (
+                SET_STATE_URLS[equipment[ATTR_TYPE]],
+                {"id": equipment[ATTR_ID], "state": equipment[ATTR_STATE]},
+            )
+            for equipment in call.data[ATTR_EQUIPMENT]
+        ]
+        await _async_send(call, commands, _equipment_apis(call))
+
+    async def async_snapshot_state(call: ServiceCall) -> None:
+        """Save the current settings under a name"""
+        for coordinator in _coordinators(call):
+            await coordinator.async_save_snapshot(call.data[ATTR_NAME])
+
+    async def async_restore_state(call: ServiceCall) -> None:
+        """Send only the commands needed to get back to a snapshot"""
+        coordinators = _coordinators(call)
+        # Check them all first so a missing snapshot does not leave some of the
+        # controllers restored and others not.
+        for coordinator in coordinators:
+            if call.data[ATTR_NAME] not in coordinator.snapshots:
+                raise HomeAssistantError(
+                    f"There is no snapshot named {call.data[ATTR_NAME]} for {coordinator.entry.title}"
+                )
+        failed = 0
+        for coordinator in coordinators:
+            commands = coordinator.state_mirror.diff(
+                coordinator.snapshots[call.data[ATTR_NAME]]
+            )
+            results = await coordinator.api.command_batch(commands)
+            failed += results.count(False)
+        if failed:
+            raise HomeAssistantError(f"{failed} njsPC commands failed")
+
+    async def async_query_telemetry(call: ServiceCall) -> ServiceResponse:
+        """Raw readings from the telemetry store for a time range"""
+        end = dt_util.as_utc(call.data.get(ATTR_END, dt_util.utcnow()))
+        start = dt_util.as_utc(call.data.get(ATTR_START, end - DEFAULT_QUERY_PERIOD))
+        coordinators = [
+            coordinator
+            for coordinator in _coordinators(call)
+            if coordinator.telemetry is not None
+        ]
+        if not coordinators:
+            raise HomeAssistantError("The telemetry store is not turned on")
+        series = []
+        for coordinator in coordinators:
+            # Include the readings still waiting to be written.
+            await coordinator.async_write_telemetry()
+            for found in await hass.async_add_executor_job(
+                coordinator.telemetry.query,
+                call.data[ATTR_TYPE],
+                call.data.get(ATTR_ID),
+                call.data.get(ATTR_FIELD),
+                start.timestamp(),
+                end.timestamp(),
+                call.data[ATTR_LIMIT],
+            ):
+                found[ATTR_CONFIG_ENTRY_ID] = coordinator.entry.entry_id
+                found["samples"] = [
+                    [dt_util.utc_from_timestamp(ts).isoformat(), value]
+                    for ts, value in found["samples"]
+                ]
+                series.append(found)
+        return {"series": series}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_SERVICE_MODE,
+        async_set_service_mode,
+        schema=SERVICE_MODE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_AUTO_MODE, async_set_auto_mode, schema=AUTO_MODE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_STATES, async_set_states, schema=SET_STATES_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_APPLY_SCENE, async_apply_scene, schema=APPLY_SCENE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SNAPSHOT_STATE, async_snapshot_state, schema=SNAPSHOT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RESTORE_STATE, async_restore_state, schema=SNAPSHOT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_TELEMETRY,
+        async_query_telemetry,
+        schema=QUERY_TELEMETRY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services once the last config entry is gone"""
+    for service in (
+        SERVICE_SET_SERVICE_MODE,
+        SERVICE_SET_AUTO_MODE,
+        SERVICE_SET_STATES,
+        SERVICE_APPLY_SCENE,
+        SERVICE_SNAPSHOT_STATE,
+        SERVICE_RESTORE_STATE,
+        SERVICE_QUERY_TELEMETRY,
+    ):
+        hass.services.async_remove(DOMAIN, service)
@@ -0,0 +1,172 @@
+"""Pool state snapshots for njsPC-HA"""
+from __future__ import annotations
+
+from typing import Any
+from collections.abc import Mapping
+
+from .const import (
+    API_CHLORINATOR_POOL_SETPOINT,
+    API_CHLORINATOR_SPA_SETPOINT,
+    API_CIRCUIT_SETSTATE,
+    API_CIRCUIT_SETTHEME,
+    API_FEATURE_SETSTATE,
+    API_LIGHTGROUP_SETSTATE,
+    API_SET_HEATMODE,
+    API_TEMPERATURE_SETPOINT,
+    EVENT_BODY,
+    EVENT_CHLORINATOR,
+    EVENT_CIRCUIT,
+    EVENT_FEATURE,
+    EVENT_LIGHTGROUP,
+    POOL_SETPOINT,
+    SPA_SETPOINT,
+)
+
+# Fields kept for each type of equipment.  Value maps are reduced to their val.
+SNAPSHOT_FIELDS = {
+    EVENT_CIRCUIT: ("isOn", "lightingTheme"),
+    EVENT_FEATURE: ("isOn",),
+    EVENT_LIGHTGROUP: ("isOn", "lightingTheme"),
+    EVENT_BODY: ("setPoint", "coolSetpoint", "heatMode"),
+    EVENT_CHLORINATOR: (POOL_SETPOINT, SPA_SETPOINT),
+}
+# Where each type of equipment is turned on and off.
+SET_STATE_URLS = {
+    EVENT_CIRCUIT: API_CIRCUIT_SETSTATE,
+    EVENT_FEATURE: API_FEATURE_SETSTATE,
+    EVENT_LIGHTGROUP: API_LIGHTGROUP_SETSTATE,
+}
+
+
+class PoolStateMirror:
+    """The settings a snapshot restores kept up to date from the events"""
+
+    def __init__(self, config: Any) -> None:
+        self.state: dict[str, dict[int, dict[str, Any]]] = {
+            event: {} for event in SNAPSHOT_FIELDS
+        }
+        for event, key in (
+            (EVENT_CIRCUIT, "circuits"),
+            (EVENT_FEATURE, "features"),
+            (EVENT_LIGHTGROUP, "lightGroups"),
+            (EVENT_CHLORINATOR, "chlorinators"),
+        ):
+            for equipment in config.get(key, []):
+                self.update(event, equipment)
+        for body in config.get("temps", {}).get("bodies", []):
+            self.update(EVENT_BODY, body)
+
+    def update(self, event: str, data: Mapping[str, Any]) -> None:
+        """Copy the fields of an event into the mirror"""
+        if event not in SNAPSHOT_FIELDS or "id" not in data:
+            return
+        equipment = self.state[event].setdefault(data["id"], {})
+        for field in SNAPSHOT_FIELDS[event]:
+            if field not in data:
+                continue
+            value = data[field]
+            if isinstance(value, Mapping):
+                value = value.get("val")
+            equipment[field] = value
+
+    def snapshot(self) -> dict[str, dict[int, dict[str, Any]]]:
+        """Copy of the current settings"""
+        return {
+            event: {
+                equipment_id: dict(fields) for equipment_id, fields in equipment.items()
+            }
+            for event, equipment in self.state.items()
+        }
+
+    @staticmethod
+    def load(
+        stored: Mapping[str, Mapping[str, Mapping[str, Any]]]
+    ) -> dict[str, dict[int, dict[str, Any]]]:
+        """A snapshot read back from storage where the ids became strings"""
+        return {
+            event: {
+                int(equipment_id): dict(fields)
+                for equipment_id, fields in equipment.items()
+            }
+            for event, equipment in stored.items()
+            if event in SNAPSHOT_FIELDS
+        }
+
+    def diff(
+        self, snapshot: Mapping[str, Mapping[int, Mapping[str, Any]]]
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Commands that take the current settings back to a snapshot"""
+        commands: list[tuple[str, dict[str, Any]]] = []
+        for event, equipment in snapshot.items():
+            for equipment_id, fields in equipment.items():
+                current = self.state.get(event, {}).get(equipment_id)
+                if current is None:
+                    # The equipment has been removed since the snapshot.
+                    continue
+                changed = {
+                    field: value
+                    for field, value in fields.items()
+                    if value is not None and current.get(field) != value
+                }
+                commands.extend(self._commands(event, equipment_id, changed, fields))
+        return commands
+
+    @staticmethod
+    def _commands(
+        event: str,
+        equipment_id: int,
+        changed: Mapping[str, Any],
+        fields: Mapping[str, Any],
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Commands for the changed fields of one piece of equipment"""
+        commands: list[tuple[str, dict[str, Any]]] = []
+        if "isOn" in changed:
+            commands.append(
+                (
+                    SET_STATE_URLS.get(event, API_CIRCUIT_SETSTATE),
+                    {"id": equipment_id, "state": changed["isOn"]},
+                )
+            )
+        if "lightingTheme" in changed and fields.get("isOn"):
+            # Setting a theme turns the light on so only do it for lights that
+            # were on.  njsPC sets the theme of light groups from the same
+            # circuit endpoint.
+            commands.append(
+                (
+                    API_CIRCUIT_SETTHEME,
+                    {"id": equipment_id, "theme": changed["lightingTheme"]},
+                )
+            )
+        if "setPoint" in changed:
+            commands.append(
+                (
+                    API_TEMPERATURE_SETPOINT,
+                    {"id": equipment_id, "heatSetpoint": changed["setPoint"]},
+                )
+            )
+        if "coolSetpoint" in changed:
+            commands.append(
+                (
+                    API_TEMPERATURE_SETPOINT,
+                    {"id": equipment_id, "coolSetpoint": changed["coolSetpoint"]},
+                )
+            )
+        if "heatMode" in changed:
+            commands.append(
+                (API_SET_HEATMODE, {"id": equipment_id, "mode": changed["heatMode"]})
+            )
+        if POOL_SETPOINT in changed:
+            commands.append(
+                (
+                    API_CHLORINATOR_POOL_SETPOINT,
+                    {"id": equipment_id, "setPoint": changed[POOL_SETPOINT]},
+                )
+            )
+        if SPA_SETPOINT in changed:
+            commands.append(
+                (
+                    API_CHLORINATOR_SPA_SETPOINT,
+                    {"id": equipment_id, "setPoint": changed[SPA_SETPOINT]},
+                )
+            )
+        return commands
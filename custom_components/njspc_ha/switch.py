@@ -1,21 +1,47 @@
 """Platform for switch integration."""
 from __future__ import annotations
 
+from time import perf_counter
+from typing import Any
+from collections.abc import Mapping
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.core import HomeAssistant
+from homeassistant.components.switch import SwitchEntity
 
-
+from .coordinator import NjsPCHAdata
+from .entity import PoolEquipmentEntity
 from .const import (
     PoolEquipmentClass,
+    API_CIRCUIT_SETSTATE,
+    API_CIRCUITGROUP_SETSTATE,
+    API_CONFIG_SCHEDULE,
+    API_FEATURE_SETSTATE,
+    API_LIGHTGROUP_SETSTATE,
+    API_SUPERCHLOR,
     DOMAIN,
+    EVENT_AVAILABILITY,
+    EVENT_CHLORINATOR,
+    EVENT_CIRCUIT,
+    EVENT_CIRCUITGROUP,
+    EVENT_FEATURE,
+    EVENT_LIGHTGROUP,
+    EVENT_SCHEDULE,
     SUPER_CHLOR,
 )
-from .features import CircuitSwitch
-from .chemistry import SuperChlorSwitch
-from .bodies import BodyCircuitSwitch
-from .schedules import ScheduleSwitch
+from .timeline import schedule_equipment
+
+DAY_ABBREVIATIONS = {
+    "sun": "U",
+    "sat": "S",
+    "fri": "F",
+    "thu": "H",
+    "wed": "W",
+    "tue": "T",
+    "mon": "M",
+}
 
 
 async def async_setup_entry(
@@ -24,6 +50,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add sensors for passed config_entry in HA."""
+    started = perf_counter()
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     new_devices = []
@@ -87,31 +114,7 @@ async def async_setup_entry(
             )
 
     for schedule in config["schedules"]:
-        equipment_class = PoolEquipmentClass.AUX_CIRCUIT
-        _body = None
-        match schedule["circuit"]["equipmentType"]:
-            case "circuit":
-                try:
-                    if schedule["circuit"]["id"] == 1 or schedule["circuit"]["id"] == 6:
-                        for body in config["temps"]["bodies"]:
-                            if (
-                                body["circuit"] == schedule["circuit"]["id"]
-                                and "name" in schedule["circuit"]
-                            ):
-                                _body = body
-                                equipment_class = PoolEquipmentClass.BODY
-                    elif schedule["circuit"]["type"]["isLight"]:
-                        equipment_class = PoolEquipmentClass.LIGHT
-                    else:
-                        equipment_class = PoolEquipmentClass.AUX_CIRCUIT
-                except KeyError:
-                    equipment_class = PoolEquipmentClass.AUX_CIRCUIT
-            case "circuitGroup":
-                equipment_class = PoolEquipmentClass.CIRCUIT_GROUP
-            case "feature":
-                equipment_class = PoolEquipmentClass.FEATURE
-            case "lightGroup":
-                equipment_class = PoolEquipmentClass.LIGHT_GROUP
+        equipment_class, _body = schedule_equipment(config, schedule)
         new_devices.append(
             ScheduleSwitch(
                 coordinator=coordinator,
@@ -124,3 +127,408 @@ async def async_setup_entry(
 
     if new_devices:
         async_add_entities(new_devices)
+    coordinator.metrics.record_setup(Platform.SWITCH, perf_counter() - started)
+
+
+class SuperChlorSwitch(PoolEquipmentEntity, SwitchEntity):
+    """Super Chlorinate switch for njsPC-HA"""
+
+    def __init__(self, coordinator, chlorinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, equipment_class=PoolEquipmentClass.CHLORINATOR, data=chlorinator)
+        self._value = None
+        if SUPER_CHLOR in chlorinator:
+            self._value = chlorinator[SUPER_CHLOR]
+        self._available = True
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_CHLORINATOR
+            and self.coordinator.data["id"] == self.equipment_id
+            and SUPER_CHLOR in self.coordinator.data
+        ):
+            self._value = self.coordinator.data[SUPER_CHLOR]
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the entity on."""
+        data = {"id": self.equipment_id, "superChlorinate": True}
+        await self.coordinator.api.command(url=API_SUPERCHLOR, data=data)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the entity on."""
+        data = {"id": self.equipment_id, "superChlorinate": False}
+        await self.coordinator.api.command(url=API_SUPERCHLOR, data=data)
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        return "Super Chlorinate"
+
+    @property
+    def unique_id(self) -> str:
+        """Unique identifier for the entity"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_superchlorinate"
+
+    @property
+    def is_on(self) -> bool:
+        return self._value
+
+    @property
+    def icon(self) -> str:
+        return "mdi:atom-variant"
+
+
+class BodyCircuitSwitch(PoolEquipmentEntity, SwitchEntity):
+    """Body Circuit switch for njsPC-HA"""
+
+    def __init__(
+        self,
+        coordinator: NjsPCHAdata,
+        circuit,
+        body,
+    ) -> None:
+        """Initialize the sensor."""
+        # Need to add delays to this at some point.  We will get
+        # delay messages when this happens
+        super().__init__(
+            coordinator=coordinator, equipment_class=PoolEquipmentClass.BODY, data=body
+        )
+        self.body_type = "pool"
+        if "type" in body:
+            self.body_type = body["type"]["name"]
+        self._event = "circuit"
+        self._command = None
+        self._available = True
+        self._value = False
+        self._attr_has_entity_name = False
+        self.circuit_id = circuit["id"]
+        self.circuit_name = circuit["name"]
+        if "isOn" in circuit:
+            self._value = circuit["isOn"]
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == self._event
+            and self.coordinator.data["id"] == self.circuit_id
+        ):
+            if "isOn" in self.coordinator.data:
+                self._value = self.coordinator.data["isOn"]
+            else:
+                self._value = False
+            if "name" in self.coordinator.data:
+                self.circuit_name = self.coordinator.data["name"]
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the entity on."""
+        data = {"id": self.circuit_id, "state": True}
+        await self.coordinator.api.command(url=API_CIRCUIT_SETSTATE, data=data)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the entity on."""
+        data = {"id": self.circuit_id, "state": False}
+        await self.coordinator.api.command(url=API_CIRCUIT_SETSTATE, data=data)
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        return self.circuit_name
+
+    @property
+    def unique_id(self) -> str:
+        """Set unique device_id"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}_state"
+
+    @property
+    def is_on(self) -> str:
+        return self._value
+
+    @property
+    def icon(self) -> str:
+        if self.body_type == "pool":
+            return "mdi:pool"
+        elif self.body_type == "spa":
+            return "mdi:hot-tub"
+        else:
+            return "mdi:toggle-switch-variant"
+
+
+class CircuitSwitch(PoolEquipmentEntity, SwitchEntity):
+    """Circuit switch for njsPC-HA"""
+
+    def __init__(
+        self,
+        coordinator: NjsPCHAdata,
+        equipment_class: PoolEquipmentClass,
+        circuit,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator=coordinator, equipment_class=equipment_class, data=circuit)
+        self._event = None
+        self._command = None
+        self._value = None
+        match equipment_class:
+            case PoolEquipmentClass.AUX_CIRCUIT:
+                self._event = EVENT_CIRCUIT
+                self._command = API_CIRCUIT_SETSTATE
+            case PoolEquipmentClass.CIRCUIT_GROUP:
+                self._event = EVENT_CIRCUITGROUP
+                self._command = API_CIRCUITGROUP_SETSTATE
+            case PoolEquipmentClass.FEATURE:
+                self._event = EVENT_FEATURE
+                self._command = API_FEATURE_SETSTATE
+            case PoolEquipmentClass.LIGHT_GROUP:
+                self._event = EVENT_LIGHTGROUP
+                self._command = API_LIGHTGROUP_SETSTATE
+        self._attr_has_entity_name = False
+        self._available = True
+        self._value = False
+        if "isOn" in circuit:
+            self._value = circuit["isOn"]
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == self._event
+            and self.coordinator.data["id"] == self.equipment_id
+        ):
+            if "isOn" in self.coordinator.data:
+                self._value = self.coordinator.data["isOn"]
+            else:
+                self._value = False
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the entity on."""
+        data = {"id": self.equipment_id, "state": True}
+        await self.coordinator.api.command(url=self._command, data=data)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the entity on."""
+        data = {"id": self.equipment_id, "state": False}
+        await self.coordinator.api.command(url=self._command, data=data)
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        return self.equipment_name
+
+    @property
+    def unique_id(self) -> str:
+        """Set unique device_id"""
+        return f"{self.coordinator.controller_id}_{self.equipment_class}_{self.equipment_id}"
+
+    @property
+    def is_on(self) -> str:
+        return self._value
+
+    @property
+    def icon(self) -> str:
+        return "mdi:toggle-switch-variant"
+
+
+class ScheduleSwitch(PoolEquipmentEntity, SwitchEntity):
+    """Schedule switch for njsPC-HA"""
+
+    def __init__(
+        self,
+        coordinator: NjsPCHAdata,
+        equipment_class: PoolEquipmentClass,
+        schedule,
+        clockMode: int = 12,
+        body=None,
+    ) -> None:
+        """Initialize the switch."""
+        data = schedule["circuit"]
+        if body is not None:
+            # change it over to body if provided
+            data = body
+        super().__init__(
+            coordinator=coordinator,
+            equipment_class=equipment_class,
+            data=data,
+        )
+
+        self._available = True
+        self._value = False
+        self._clock_mode = clockMode
+
+        self._attr_has_entity_name = False
+        self.schedule_id = schedule["id"]
+        self.schedule_name = schedule["circuit"]["name"]
+        if "disabled" in schedule:
+            self._value = schedule["disabled"]
+
+        self._state_attributes: dict[str, Any] = dict([])
+        if "scheduleDays" in schedule:
+            self._state_attributes["days"] = self.format_schedule_days(
+                schedule_days=schedule["scheduleDays"]
+            )
+        if "startTime" in schedule and "startTimeType" in schedule:
+            self._state_attributes["start_time"] = self.format_start_stop_times(
+                time=schedule["startTime"], time_type=schedule["startTimeType"]["val"]
+            )
+        if "endTime" in schedule and "endTimeType" in schedule:
+            self._state_attributes["end_time"] = self.format_start_stop_times(
+                time=schedule["endTime"], time_type=schedule["endTimeType"]["val"]
+            )
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if (
+            self.coordinator.data["event"] == EVENT_SCHEDULE
+            and self.coordinator.data["id"] == self.schedule_id
+        ):
+            if "disabled" in self.coordinator.data:
+                self._value = self.coordinator.data["disabled"]
+            else:
+                self._value = False
+            if (
+                "circuit" in self.coordinator.data
+                and "name" in self.coordinator.data["circuit"]
+            ):
+                self.schedule_name = self.coordinator.data["circuit"]["name"]
+
+            if (
+                "startTime" in self.coordinator.data
+                and "startTimeType" in self.coordinator.data
+            ):
+                self._state_attributes["start_time"] = self.format_start_stop_times(
+                    time=self.coordinator.data["startTime"],
+                    time_type=self.coordinator.data["startTimeType"]["val"],
+                )
+            if (
+                "endTime" in self.coordinator.data
+                and "endTimeType" in self.coordinator.data
+            ):
+                self._state_attributes["end_time"] = self.format_start_stop_times(
+                    time=self.coordinator.data["endTime"],
+                    time_type=self.coordinator.data["endTimeType"]["val"],
+                )
+            if "scheduleDays" in self.coordinator.data:
+                self._state_attributes["days"] = self.format_schedule_days(
+                    schedule_days=self.coordinator.data["scheduleDays"]
+                )
+            self.async_write_ha_state()
+        elif self.coordinator.data["event"] == EVENT_AVAILABILITY:
+            self._available = self.coordinator.data["available"]
+            self.async_write_ha_state()
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the entity on."""
+        data = {"id": self.schedule_id, "disabled": False}
+        await self.coordinator.api.command(url=API_CONFIG_SCHEDULE, data=data)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the entity on."""
+        data = {"id": self.schedule_id, "disabled": True}
+        await self.coordinator.api.command(url=API_CONFIG_SCHEDULE, data=data)
+
+    def format_start_stop_times(self, time: int, time_type: int) -> str:
+        """Format the minutes time to human readable"""
+        formatted = ""
+        if time_type == 1:
+            return "Sunrise"
+        elif time_type == 2:
+            return "Sunset"
+        elif time_type == 0:
+            hrs = time // 60
+            mins = time - (hrs * 60)
+            if self._clock_mode == 24:
+                formatted = f"{hrs:02}:{mins:02}"
+            else:
+                ampm = "am"
+                if hrs > 12:
+                    hrs = hrs - 12
+                    ampm = "pm"
+                formatted = f"{hrs}:{mins:02} {ampm}"
+        else:
+            formatted = "Unknown"
+        return formatted
+
+    def format_schedule_days(self, schedule_days) -> str:
+        """Format the scheduled days into a string"""
+        formatted = ""
+        if schedule_days["val"] == 127:
+            formatted = "Every Day"
+        elif schedule_days["val"] == 31:
+            formatted = "Weekdays"
+        elif schedule_days["val"] == 96:
+            formatted = "Weekends"
+        else:
+            day_list = []
+            idx = 0
+            for day in schedule_days["days"]:
+                if day["name"] == "sun":
+                    # we need to change the insert index if Sunday is in the list so that it stays at the beginning
+                    idx = 1
+                day_list.insert(idx, DAY_ABBREVIATIONS[day["name"]])
+            formatted = "-".join(day_list)
+        return formatted
+
+    @property
+    def should_poll(self) -> bool:
+        return False
+
+    @property
+    def available(self) -> bool:
+        return self._available
+
+    @property
+    def name(self) -> str:
+        return f"{self.schedule_name} Schedule"
+
+    @property
+    def unique_id(self) -> str:
+        """Set unique device_id"""
+        return f"{self.coordinator.controller_id}_schedule_{self.schedule_id}_disabled"
+
+    @property
+    def is_on(self) -> bool:
+        return not self._value
+
+    @property
+    def icon(self) -> str:
+        if self._value:
+            return "mdi:calendar-remove"
+        else:
+            return "mdi:calendar-clock"
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return entity specific state attributes."""
+
+        return self._state_attributes
@@ -0,0 +1,235 @@
+"""Local full resolution telemetry store for njsPC-HA"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+import sqlite3
+from threading import Lock
+from time import time
+from typing import Any
+
+from .const import EVENT_BODY, EVENT_CHEM_CONTROLLER, EVENT_PUMP, EVENT_TEMPS
+
+# Samples held in memory between writes.  The oldest are dropped when the
+# store cannot keep up.
+TELEMETRY_BUFFER_MAX = 20000
+
+# The numeric readings kept for each type of equipment as paths into the
+# event.  Temperatures are kept for the probes in the temps event.
+TELEMETRY_FIELDS: dict[str, tuple[tuple[str, ...], ...]] = {
+    EVENT_PUMP: (("rpm",), ("watts",), ("flow",)),
+    EVENT_CHEM_CONTROLLER: (
+        ("ph", "level"),
+        ("orp", "level"),
+        ("ph", "tank", "level"),
+        ("orp", "tank", "level"),
+        ("lsi",),
+        ("csi",),
+    ),
+}
+# Types of equipment a query can ask for.
+TELEMETRY_TYPES = (EVENT_PUMP, EVENT_CHEM_CONTROLLER, EVENT_TEMPS, EVENT_BODY)
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS series (
+        id INTEGER PRIMARY KEY,
+        type TEXT NOT NULL,
+        equipment INTEGER NOT NULL,
+        field TEXT NOT NULL,
+        UNIQUE (type, equipment, field)
+    )""",
+    """CREATE TABLE IF NOT EXISTS samples (
+        series INTEGER NOT NULL,
+        ts REAL NOT NULL,
+        value REAL NOT NULL,
+        PRIMARY KEY (series, ts)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts)",
+)
+
+
+def _is_number(value: Any) -> bool:
+    """Whether a value can be stored as a reading"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_temp_probe(key: str) -> bool:
+    """Whether a key of the temps event is a temperature probe"""
+    return (
+        key in ("air", "solar")
+        or key.startswith("solarSensor")
+        or key.startswith("waterSensor")
+    )
+
+
+def telemetry_samples(
+    event: str, data: Mapping[str, Any]
+) -> list[tuple[str, int, str, float]]:
+    """The (type, id, field, value) readings in a socket event"""
+    samples: list[tuple[str, int, str, float]] = []
+    if event == EVENT_TEMPS:
+        for key, value in data.items():
+            if _is_temp_probe(key) and _is_number(value):
+                samples.append((EVENT_TEMPS, 0, key, value))
+        for body in data.get("bodies", []):
+            if "id" in body and _is_number(body.get("temp")):
+                samples.append((EVENT_BODY, body["id"], "temp", body["temp"]))
+        return samples
+    if event not in TELEMETRY_FIELDS or "id" not in data:
+        return samples
+    for path in TELEMETRY_FIELDS[event]:
+        value: Any = data
+        for key in path:
+            if not isinstance(value, Mapping) or key not in value:
+                break
+            value = value[key]
+        else:
+            if _is_number(value):
+                samples.append((event, data["id"], ".".join(path), value))
+    return samples
+
+
+class TelemetryStore:
+    """SQLite file of the raw readings written in batches
+
+    Only add runs in the event loop.  Everything that touches the file runs in
+    the executor and holds the lock since a query can run alongside a write.
+    """
+
+    def __init__(self, path: str, retention_days: int) -> None:
+        self.path = path
+        self.retention_days = retention_days
+        self._buffer: deque[tuple[str, int, str, float, float]] = deque(
+            maxlen=TELEMETRY_BUFFER_MAX
+        )
+        self._conn: sqlite3.Connection | None = None
+        self._series: dict[tuple[str, int, str], int] = {}
+        self._lock = Lock()
+        self.written = 0
+        self.pruned = 0
+
+    def add(self, event: str, data: Mapping[str, Any]) -> None:
+        """Buffer the readings in a socket event"""
+        now = time()
+        for kind, equipment, field, value in telemetry_samples(event, data):
+            self._buffer.append((kind, equipment, field, now, value))
+
+    def take(self) -> list[tuple[str, int, str, float, float]]:
+        """Empty the buffer for a write"""
+        samples = list(self._buffer)
+        self._buffer.clear()
+        return samples
+
+    def open(self) -> None:
+        """Open the file and create the tables"""
+        with self._lock:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+            self._series = {
+                (kind, equipment, field): series
+                for series, kind, equipment, field in self._conn.execute(
+                    "SELECT id, type, equipment, field FROM series"
+                )
+            }
+
+    def close(self) -> None:
+        """Close the file"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def write(self, samples: Iterable[tuple[str, int, str, float, float]]) -> None:
+        """Write a batch of readings in one transaction"""
+        with self._lock:
+            if self._conn is None:
+                return
+            added: list[tuple[str, int, str]] = []
+            rows = []
+            try:
+                for kind, equipment, field, ts, value in samples:
+                    key = (kind, equipment, field)
+                    if key not in self._series:
+                        self._series[key] = self._conn.execute(
+                            "INSERT INTO series (type, equipment, field) VALUES (?, ?, ?)",
+                            key,
+                        ).lastrowid
+                        added.append(key)
+                    rows.append((self._series[key], ts, value))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO samples (series, ts, value) VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+            except sqlite3.Error:
+                # The new series were rolled back with the samples.
+                self._conn.rollback()
+                for key in added:
+                    self._series.pop(key, None)
+                raise
+            self.written += len(rows)
+
+    def prune(self) -> None:
+        """Delete the readings older than the retention"""
+        with self._lock:
+            if self._conn is None:
+                return
+            cutoff = time() - self.retention_days * 86400
+            self.pruned += self._conn.execute(
+                "DELETE FROM samples WHERE ts < ?", (cutoff,)
+            ).rowcount
+            self._conn.commit()
+
+    def query(
+        self,
+        kind: str,
+        equipment: int | None,
+        field: str | None,
+        start: float,
+        end: float,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Readings in a time range grouped by series"""
+        with self._lock:
+            if self._conn is None:
+                return []
+            series = {
+                series_id: key
+                for key, series_id in self._series.items()
+                if key[0] == kind
+                and (equipment is None or key[1] == equipment)
+                and (field is None or key[2] == field)
+            }
+            result = []
+            for series_id, (_, equipment_id, series_field) in sorted(
+                series.items(), key=lambda item: item[1]
+            ):
+                rows = self._conn.execute(
+                    "SELECT ts, value FROM samples WHERE series = ? AND ts >= ? "
+                    "AND ts <= ? ORDER BY ts LIMIT ?",
+                    (series_id, start, end, limit),
+                ).fetchall()
+                if rows:
+                    result.append(
+                        {
+                            "type": kind,
+                            "id": equipment_id,
+                            "field": series_field,
+                            "samples": rows,
+                        }
+                    )
+            return result
+
+    def as_dict(self) -> dict[str, Any]:
+        """Store counters for the diagnostics"""
+        return {
+            "retention_days": self.retention_days,
+            "series": len(self._series),
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "pruned": self.pruned,
+        }
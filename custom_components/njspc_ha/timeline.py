@@ -0,0 +1,417 @@
+"""Schedule timeline for njsPC-HA"""
+from __future__ import annotations
+
+from typing import Any
+from collections.abc import Callable, Mapping
+from datetime import date, datetime, timedelta
+
+from homeassistant.const import SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.sun import get_astral_event_date
+from homeassistant.util import dt as dt_util
+
+from .const import PoolEquipmentClass
+
+# Days ahead to look for the next run of a schedule.
+SCHEDULE_LOOKAHEAD_DAYS = 8
+# Minutes in a day and in a week for the weekly intervals.
+MINUTES_PER_DAY = 1440
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Start and end time types for a schedule.
+TIME_TYPE_MANUAL = 0
+TIME_TYPE_SUNRISE = 1
+TIME_TYPE_SUNSET = 2
+
+
+def schedule_key(schedule: Mapping[str, Any]) -> tuple[str, int] | None:
+    """Equipment type and id of the circuit a schedule runs"""
+    if "circuit" not in schedule or "id" not in schedule["circuit"]:
+        return None
+    return (schedule["circuit"].get("equipmentType", "circuit"), schedule["circuit"]["id"])
+
+
+def schedule_equipment(
+    config: Any, schedule: Any
+) -> tuple[PoolEquipmentClass, Any | None]:
+    """Equipment class and body (if any) of the circuit a schedule runs"""
+    equipment_class = PoolEquipmentClass.AUX_CIRCUIT
+    _body = None
+    match schedule["circuit"]["equipmentType"]:
+        case "circuit":
+            try:
+                if schedule["circuit"]["id"] == 1 or schedule["circuit"]["id"] == 6:
+                    for body in config["temps"]["bodies"]:
+                        if (
+                            body["circuit"] == schedule["circuit"]["id"]
+                            and "name" in schedule["circuit"]
+                        ):
+                            _body = body
+                            equipment_class = PoolEquipmentClass.BODY
+                elif schedule["circuit"]["type"]["isLight"]:
+                    equipment_class = PoolEquipmentClass.LIGHT
+                else:
+                    equipment_class = PoolEquipmentClass.AUX_CIRCUIT
+            except KeyError:
+                equipment_class = PoolEquipmentClass.AUX_CIRCUIT
+        case "circuitGroup":
+            equipment_class = PoolEquipmentClass.CIRCUIT_GROUP
+        case "feature":
+            equipment_class = PoolEquipmentClass.FEATURE
+        case "lightGroup":
+            equipment_class = PoolEquipmentClass.LIGHT_GROUP
+    return equipment_class, _body
+
+
+def pump_circuits(pumps: list[Any]) -> dict[int, set[int]]:
+    """Ids of the circuits each pump serves"""
+    circuits: dict[int, set[int]] = {}
+    for pump in pumps:
+        if "id" not in pump:
+            continue
+        for pump_circuit in pump.get("circuits", []):
+            circuit = pump_circuit.get("circuit")
+            # The state has the circuit expanded while the config has its id.
+            if isinstance(circuit, Mapping):
+                circuit = circuit.get("id")
+            if isinstance(circuit, int):
+                circuits.setdefault(pump["id"], set()).add(circuit)
+    return circuits
+
+
+def overlap_minutes(
+    first: list[tuple[int, int]], second: list[tuple[int, int]]
+) -> int:
+    """Minutes a week two sets of weekly intervals overlap"""
+    total = 0
+    for start, end in first:
+        for other_start, other_end in second:
+            total += max(0, min(end, other_end) - max(start, other_start))
+    return total
+
+
+class ScheduleIndex:
+    """Next run of every schedule along with a timer for the next boundary"""
+
+    # Each schedule gets its current or next run worked out once and the index
+    # keeps a single timer for the earliest start or end among them.  When the
+    # timer fires the runs are worked out again, which also picks up the new
+    # sunrise and sunset times for the day.
+    #
+    # It also keeps the weekly intervals of every schedule so overlapping
+    # schedules for the same circuit, or for circuits that share a pump, are
+    # found by only checking the schedule that changed against the others.
+    def __init__(
+        self, hass: HomeAssistant, schedules: list[Any], pumps: list[Any] | None = None
+    ) -> None:
+        self.hass = hass
+        self.schedules: dict[int, dict[str, Any]] = {}
+        self.runs: dict[int, tuple[datetime, datetime]] = {}
+        self.pump_circuits = pump_circuits(pumps or [])
+        self.intervals: dict[int, list[tuple[int, int]]] = {}
+        # (kind, circuit or pump id, schedule ids) -> minutes a week
+        self.conflicts: dict[tuple[str, int, frozenset[int]], int] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._timer_at: datetime | None = None
+        for schedule in schedules:
+            if "id" in schedule:
+                self.schedules[schedule["id"]] = dict(schedule)
+
+    @callback
+    def async_start(self) -> None:
+        """Work out the runs and conflicts and start the timer"""
+        today = dt_util.as_local(dt_util.utcnow()).date()
+        for schedule_id, schedule in self.schedules.items():
+            self.intervals[schedule_id] = self.weekly_intervals(schedule, today)
+        for schedule_id in self.schedules:
+            self._check_conflicts(schedule_id)
+        self._refresh(dt_util.utcnow())
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the timer"""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+            self._timer_at = None
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call back whenever the runs change"""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_update_schedule(self, data: Mapping[str, Any]) -> None:
+        """Merge a schedule event into the index"""
+        if "id" not in data:
+            return
+        schedule = self.schedules.setdefault(data["id"], {})
+        schedule.update(data)
+        if schedule.get("isActive") is False:
+            # The schedule has been deleted.
+            self.schedules.pop(data["id"])
+        now = dt_util.utcnow()
+        self.intervals.pop(data["id"], None)
+        if data["id"] in self.schedules:
+            self.intervals[data["id"]] = self.weekly_intervals(
+                self.schedules[data["id"]], dt_util.as_local(now).date()
+            )
+        self._check_conflicts(data["id"])
+        self.runs.pop(data["id"], None)
+        if data["id"] in self.schedules and (
+            run := self.next_run(self.schedules[data["id"]], now)
+        ) is not None:
+            self.runs[data["id"]] = run
+        self._schedule_timer(now)
+        self._notify()
+
+    @callback
+    def _refresh(self, now: datetime) -> None:
+        """Work out every run and restart the timer"""
+        self.runs = {}
+        for schedule_id, schedule in self.schedules.items():
+            if (run := self.next_run(schedule, now)) is not None:
+                self.runs[schedule_id] = run
+        self._schedule_timer(now)
+        self._notify()
+
+    @callback
+    def _schedule_timer(self, now: datetime) -> None:
+        """Point the timer at the next start or end"""
+        boundary = self.next_boundary(now)
+        when = boundary[0] if boundary is not None else None
+        if when == self._timer_at:
+            return
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._timer_at = when
+        if when is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self.hass, self._async_timer_fired, when
+            )
+
+    @callback
+    def _async_timer_fired(self, now: datetime) -> None:
+        """Move past the boundary that was just reached"""
+        self._unsub_timer = None
+        self._timer_at = None
+        self._refresh(now)
+
+    @callback
+    def _notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def _check_conflicts(self, schedule_id: int) -> None:
+        """Recheck one schedule against all the others"""
+        self.conflicts = {
+            conflict: minutes
+            for conflict, minutes in self.conflicts.items()
+            if schedule_id not in conflict[2]
+        }
+        intervals = self.intervals.get(schedule_id)
+        if not intervals:
+            return
+        key = schedule_key(self.schedules[schedule_id])
+        if key is None:
+            return
+        pumps = self.circuit_pumps(key)
+        for other_id, other_intervals in self.intervals.items():
+            if other_id == schedule_id or not other_intervals:
+                continue
+            other_key = schedule_key(self.schedules[other_id])
+            if other_key == key:
+                conflicts = [("circuit", key[1])]
+            else:
+                conflicts = [
+                    ("pump", pump_id) for pump_id in pumps & self.circuit_pumps(other_key)
+                ]
+            if not conflicts:
+                continue
+            minutes = overlap_minutes(intervals, other_intervals)
+            if minutes > 0:
+                for kind, equipment_id in conflicts:
+                    self.conflicts[
+                        (kind, equipment_id, frozenset((schedule_id, other_id)))
+                    ] = minutes
+
+    def circuit_pumps(self, key: tuple[str, int] | None) -> set[int]:
+        """Ids of the pumps that serve a circuit"""
+        if key is None:
+            return set()
+        return {
+            pump_id
+            for pump_id, circuits in self.pump_circuits.items()
+            if key[1] in circuits
+        }
+
+    def conflict_list(self) -> list[dict[str, Any]]:
+        """Overlapping schedules for the diagnostics and attributes"""
+        return [
+            {
+                "type": kind,
+                "id": equipment_id,
+                "schedules": sorted(schedule_ids),
+                "minutes_per_week": minutes,
+            }
+            for (kind, equipment_id, schedule_ids), minutes in sorted(
+                self.conflicts.items(), key=lambda item: (item[0][0], item[0][1], sorted(item[0][2]))
+            )
+        ]
+
+    def weekly_intervals(
+        self, schedule: Mapping[str, Any], today: date
+    ) -> list[tuple[int, int]]:
+        """Minutes of the week a repeating schedule runs"""
+        # Sunrise and sunset are taken for today which is close enough to
+        # find schedules that fight each other.
+        if (
+            schedule.get("disabled")
+            or "startTime" not in schedule
+            # Without an end the schedule only turns the circuit on.
+            or "endTime" not in schedule
+            or schedule.get("scheduleType", {}).get("name") == "runonce"
+        ):
+            return []
+        start = self.resolve_minutes(
+            today,
+            schedule["startTime"],
+            schedule.get("startTimeType", {}).get("val", TIME_TYPE_MANUAL),
+            schedule.get("startTimeOffset", 0),
+        )
+        end = self.resolve_minutes(
+            today,
+            schedule["endTime"],
+            schedule.get("endTimeType", {}).get("val", TIME_TYPE_MANUAL),
+            schedule.get("endTimeOffset", 0),
+        )
+        if start is None or end is None:
+            return []
+        if end <= start:
+            end += MINUTES_PER_DAY
+        intervals = []
+        days = schedule.get("scheduleDays", {}).get("val", 0)
+        for day in range(7):
+            if not days & (1 << day):
+                continue
+            day_start = day * MINUTES_PER_DAY + start
+            day_end = day * MINUTES_PER_DAY + end
+            if day_end > MINUTES_PER_WEEK:
+                # Sunday night runs into Monday morning.
+                intervals.append((day_start, MINUTES_PER_WEEK))
+                intervals.append((0, day_end - MINUTES_PER_WEEK))
+            else:
+                intervals.append((day_start, day_end))
+        return intervals
+
+    def resolve_minutes(
+        self, run_date: date, minutes: int, time_type: int, offset: int
+    ) -> int | None:
+        """Minutes past local midnight a schedule starts or ends"""
+        if time_type == TIME_TYPE_MANUAL:
+            return minutes
+        when = self.resolve_time(run_date, minutes, time_type, offset)
+        if when is None:
+            return None
+        local = dt_util.as_local(when)
+        return local.hour * 60 + local.minute
+
+    def next_run(
+        self, schedule: Mapping[str, Any], now: datetime
+    ) -> tuple[datetime, datetime] | None:
+        """Start and end of the run in progress or the next one"""
+        if schedule.get("disabled") or "startTime" not in schedule:
+            return None
+        today = dt_util.as_local(now).date()
+        if "scheduleType" in schedule and schedule["scheduleType"].get("name") == "runonce":
+            start_date = dt_util.parse_datetime(schedule.get("startDate", "") or "")
+            if start_date is None:
+                return None
+            dates = [dt_util.as_local(start_date).date()]
+        else:
+            days = schedule.get("scheduleDays", {}).get("val", 0)
+            # Start the day before in case a run is still going past midnight.
+            dates = [
+                today + timedelta(days=offset)
+                for offset in range(-1, SCHEDULE_LOOKAHEAD_DAYS)
+                if days & (1 << (today + timedelta(days=offset)).weekday())
+            ]
+        for run_date in dates:
+            start = self.resolve_time(
+                run_date,
+                schedule["startTime"],
+                schedule.get("startTimeType", {}).get("val", TIME_TYPE_MANUAL),
+                schedule.get("startTimeOffset", 0),
+            )
+            if start is None:
+                continue
+            if "endTime" not in schedule:
+                # The schedule only turns the circuit on so the run is a point.
+                if start > now:
+                    return start, start
+                continue
+            end = self.resolve_time(
+                run_date,
+                schedule["endTime"],
+                schedule.get("endTimeType", {}).get("val", TIME_TYPE_MANUAL),
+                schedule.get("endTimeOffset", 0),
+            )
+            if end is None:
+                continue
+            if end <= start:
+                end += timedelta(days=1)
+            if end > now:
+                return start, end
+        return None
+
+    def resolve_time(
+        self, run_date: date, minutes: int, time_type: int, offset: int
+    ) -> datetime | None:
+        """Time a schedule starts or ends on a day in UTC"""
+        if time_type == TIME_TYPE_SUNRISE:
+            event = get_astral_event_date(self.hass, SUN_EVENT_SUNRISE, run_date)
+        elif time_type == TIME_TYPE_SUNSET:
+            event = get_astral_event_date(self.hass, SUN_EVENT_SUNSET, run_date)
+        else:
+            event = dt_util.start_of_local_day(run_date) + timedelta(minutes=minutes)
+            offset = 0
+        if event is None:
+            # The sun does not rise or set at this latitude today.
+            return None
+        return dt_util.as_utc(event) + timedelta(minutes=offset or 0)
+
+    def next_boundary(self, now: datetime) -> tuple[datetime, int, bool] | None:
+        """Time, schedule id and whether it turns on for the next start or end"""
+        boundary = None
+        for schedule_id, (start, end) in self.runs.items():
+            when, turns_on = (start, True) if start > now else (end, False)
+            if boundary is None or when < boundary[0]:
+                boundary = (when, schedule_id, turns_on)
+        return boundary
+
+    def circuit_runs(
+        self, key: tuple[str, int], now: datetime
+    ) -> tuple[datetime | None, datetime | None, bool]:
+        """Next on, next off and whether a schedule is running the circuit"""
+        next_on = None
+        next_off = None
+        running = False
+        for schedule_id, (start, end) in self.runs.items():
+            if schedule_key(self.schedules[schedule_id]) != key:
+                continue
+            if start <= now:
+                running = True
+            elif next_on is None or start < next_on:
+                next_on = start
+            if end > start and (next_off is None or end < next_off):
+                next_off = end
+        return next_on, next_off, running